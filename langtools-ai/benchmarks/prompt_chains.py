@@ -0,0 +1,83 @@
+"""
+Micro-benchmark of per-request chain construction CPU time.
+
+Compares building the structured-output chains from scratch on every request (the
+previous behaviour, reproduced by clearing the chain cache) with reusing the cached
+chains and only serializing the parameters JSON.
+
+Run with: uv run python benchmarks/prompt_chains.py
+"""
+
+import time
+from collections.abc import Callable
+
+from langchain_openai import ChatOpenAI
+from pydantic import SecretStr
+
+from langtools.ai import prompts
+from langtools.ai.models import (
+    AiDictionaryEntry,
+    AiMeaning,
+    BaseDictionaryParams,
+    TranslationParams,
+)
+
+ITERATIONS = 200
+
+model = ChatOpenAI(model="gpt-4.1-mini", api_key=SecretStr("benchmark"))
+base_params = BaseDictionaryParams(translating_term="сырой", user_learning_languages="en:1,ru:2")
+translation_params = TranslationParams(
+    entry=AiDictionaryEntry(
+        headword="сырой",
+        source_language="ru",
+        meanings=[
+            AiMeaning(
+                headword="сырой",
+                local_id=f"сырой-{index}",
+                canonical_form="сырой",
+                alternate_spellings=[],
+                definition="Не подвергшийся тепловой обработке",
+                part_of_speech="прилагательное",
+                morphology="мужской род, единственное число",
+                register="нейтральный",
+                frequency="частый",
+                etymology="праслав. *syrъ",
+                difficulty_level="начальный",
+                learning_priority="высокий",
+                pronunciation="sɨˈroj",
+                example_sentences=["Сырое мясо.", "Сырая погода."],
+            )
+            for index in range(1, 6)
+        ],
+    ),
+    translation_language="en",
+)
+
+
+def prepare_request() -> None:
+    """Everything the workflow does before sending both LLM requests."""
+    prompts.create_base_dictionary_chain(model)
+    prompts.base_dictionary_inputs(base_params)
+    prompts.create_meaning_translations_chain(model)
+    prompts.meaning_translations_inputs(translation_params)
+
+
+def uncached_request() -> None:
+    prompts._structured_chains.clear()  # pyright: ignore[reportPrivateUsage]
+    prepare_request()
+
+
+def measure(label: str, request: Callable[[], None]) -> float:
+    request()
+    started = time.process_time()
+    for _ in range(ITERATIONS):
+        request()
+    per_request = (time.process_time() - started) / ITERATIONS * 1000
+    print(f"{label:<10} {per_request:8.3f} ms CPU per request")
+    return per_request
+
+
+if __name__ == "__main__":
+    uncached = measure("uncached", uncached_request)
+    cached = measure("cached", prepare_request)
+    print(f"saved      {uncached - cached:8.3f} ms CPU per request ({uncached / cached:.0f}x)")
@@ -4,32 +4,91 @@ AI functions for language learning tools using LangChain.
 This package provides AI/LLM functions with workflow support for dictionary generation.
 """
 
+from .budgets import TokenBudgetMetrics, configure_token_budget_sizing, get_token_budget_metrics
+from .cache import (
+    MemoryResponseCache,
+    PostgresResponseCache,
+    ResponseCache,
+    ResponseCacheMetrics,
+    SQLiteResponseCache,
+    aclose_response_cache,
+    configure_response_cache,
+    get_response_cache_metrics,
+    response_cache_from_url,
+)
+from .client import (
+    LLMClientSettings,
+    aclose_llm_clients,
+    configure_fake_llm,
+    configure_llm_client_defaults,
+    get_llm_client,
+    primary_served_model,
+)
+from .fake import FakeChatModel, FakeLLMError, FakeLLMSettings, fake_llm_settings_from_env
 from .functions import (
     LLMAPIError,
     ValidationError,
     generate_base_dictionary_entry,
+    generate_base_dictionary_entry_stream,
     generate_dictionary_entry,
     generate_dictionary_workflow,
+    generate_dictionary_workflow_batch,
+    generate_dictionary_workflow_stream,
     generate_meaning_translations,
+    generate_meaning_translations_stream,
 )
 from .models import (
     AiDictionaryEntry,
     BaseDictionaryParams,
+    CachedDictionaryEntry,
+    DictionaryBatchHooks,
+    DictionaryBatchItemResult,
+    DictionaryBatchParams,
     DictionaryEntryParams,
+    DictionaryStreamEvent,
     DictionaryWorkflowHooks,
+    DictionaryWorkflowMetadata,
     DictionaryWorkflowResult,
+    HedgingPolicy,
+    RoutingPolicy,
+    ServedModel,
+    StageUsage,
     AiMeaning,
     AiMeaningTranslation,
     MeaningTranslationList,
     ModelType,
+    PreviousTranslations,
     TranslationParams,
 )
+from .hedging import StageHedgingMetrics, get_hedging_metrics
+from .normalization import NormalizedTerm, normalize_term
+from .prompts import BASE_DICTIONARY_PROMPT_VERSION
+from .resilience import LLMResilienceMetrics, LLMUnavailableError, get_llm_resilience_metrics
+from .routing import StageRoutingMetrics, get_routing_metrics
+from .singleflight import SingleFlightMetrics, get_single_flight_metrics
+from .usage import LLMUsageMetrics, UsageTracker, get_llm_usage_metrics
 
 __all__ = [
     # Main workflow functions
     "generate_dictionary_workflow",
+    "generate_dictionary_workflow_batch",
+    "generate_dictionary_workflow_stream",
     "generate_base_dictionary_entry",
+    "generate_base_dictionary_entry_stream",
     "generate_meaning_translations",
+    "generate_meaning_translations_stream",
+    # Shared LLM clients
+    "get_llm_client",
+    "aclose_llm_clients",
+    "LLMClientSettings",
+    "configure_llm_client_defaults",
+    "primary_served_model",
+    # Offline fake LLM
+    "configure_fake_llm",
+    "fake_llm_settings_from_env",
+    "FakeChatModel",
+    "FakeLLMSettings",
+    "FakeLLMError",
     # Legacy function
     "generate_dictionary_entry",
     # Models
@@ -37,13 +96,60 @@ __all__ = [
     "DictionaryEntryParams",
     "BaseDictionaryParams",
     "TranslationParams",
+    "PreviousTranslations",
     "DictionaryWorkflowHooks",
     "DictionaryWorkflowResult",
+    "DictionaryWorkflowMetadata",
+    "StageUsage",
+    "ServedModel",
+    "HedgingPolicy",
+    "RoutingPolicy",
+    "DictionaryBatchParams",
+    "DictionaryBatchHooks",
+    "DictionaryBatchItemResult",
+    "DictionaryStreamEvent",
+    "CachedDictionaryEntry",
     "AiMeaning",
     "AiMeaningTranslation",
     "MeaningTranslationList",
     "ModelType",
+    # Normalization
+    "normalize_term",
+    "NormalizedTerm",
+    # Single-flight coalescing
+    "get_single_flight_metrics",
+    "SingleFlightMetrics",
+    # Usage accounting
+    "get_llm_usage_metrics",
+    "LLMUsageMetrics",
+    "UsageTracker",
+    # Retries, circuit breakers and failover
+    "get_llm_resilience_metrics",
+    "LLMResilienceMetrics",
+    # Hedged requests
+    "get_hedging_metrics",
+    "StageHedgingMetrics",
+    # Model routing by term complexity
+    "get_routing_metrics",
+    "StageRoutingMetrics",
+    # Token budget sizing
+    "configure_token_budget_sizing",
+    "get_token_budget_metrics",
+    "TokenBudgetMetrics",
+    # LLM response cache
+    "configure_response_cache",
+    "response_cache_from_url",
+    "aclose_response_cache",
+    "get_response_cache_metrics",
+    "ResponseCache",
+    "MemoryResponseCache",
+    "SQLiteResponseCache",
+    "PostgresResponseCache",
+    "ResponseCacheMetrics",
+    # Prompt versions
+    "BASE_DICTIONARY_PROMPT_VERSION",
     # Exceptions
     "ValidationError",
     "LLMAPIError",
+    "LLMUnavailableError",
 ]
@@ -0,0 +1,211 @@
+"""
+Sizing of max_tokens and thinking budgets from the output of earlier LLM calls.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from .models import ModelType, StageUsage, UsageStage
+
+logger = logging.getLogger(__name__)
+
+# Recent calls kept per stage, model, thinking mode, language and term class
+BUDGET_WINDOW = 200
+# Calls observed before budgets are sized instead of left at the model defaults
+MIN_BUDGET_SAMPLES = 20
+# Percentile of recent output per unit that a budget has to cover
+BUDGET_PERCENTILE = 0.95
+# Margin on top of that percentile before rounding up
+BUDGET_HEADROOM = 1.5
+# Smallest budget handed out; Anthropic rejects thinking budgets below it
+MIN_BUDGET_TOKENS = 1024
+
+TermClass = Literal["word", "phrase", "sentence"]
+
+
+class OutputProfile(BaseModel):
+    """What an LLM call produces, keying the output statistics used to size its budget."""
+
+    model_config = ConfigDict(frozen=True)
+
+    language: Optional[str] = Field(description="Language of the output, if known before the call")
+    term_class: TermClass
+    units: int = Field(ge=1, description="Output items the call produces, e.g. meanings")
+
+
+class TokenBudget(BaseModel):
+    """Output limits of one call."""
+
+    max_tokens: int
+    thinking_budget_tokens: Optional[int] = Field(
+        description="Thinking budget, for calls to models that think"
+    )
+
+
+class TokenBudgetMetrics(BaseModel):
+    """Recent output of one stage, model, thinking mode, language and term class."""
+
+    stage: UsageStage
+    model: str
+    thinking: bool = Field(description="Whether the calls ran with a thinking budget")
+    language: Optional[str]
+    term_class: TermClass
+    samples: int = Field(description="Recent calls the estimate is based on")
+    output_tokens_per_unit: float = Field(
+        description="Percentile of output tokens per unit, including reasoning without thinking"
+    )
+    thinking_tokens_per_unit: float = Field(description="Percentile of thinking tokens per unit")
+    fallbacks: int = Field(
+        description="Calls cut short by a sized budget and retried at the model defaults"
+    )
+
+
+_StatsKey = tuple[UsageStage, str, bool, Optional[str], TermClass]
+
+
+class _OutputStats:
+    """Recent output and thinking tokens per unit of one stats key."""
+
+    def __init__(self) -> None:
+        self.output: deque[float] = deque(maxlen=BUDGET_WINDOW)
+        self.thinking: deque[float] = deque(maxlen=BUDGET_WINDOW)
+        self.fallbacks = 0
+
+    def percentile(self, samples: deque[float]) -> float:
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(BUDGET_PERCENTILE * len(ordered)))]
+
+
+_lock = threading.Lock()
+_stats: dict[_StatsKey, _OutputStats] = {}
+_enabled = False
+
+
+def term_class(term: str) -> TermClass:
+    """Classify a term by its number of words, which drives how much is written about it."""
+    words = len(term.split())
+    return "word" if words <= 1 else "phrase" if words <= 4 else "sentence"
+
+
+def _round_up(tokens: float, limit: int) -> int:
+    """Round up to a power of two, so few distinct client settings variants are created."""
+    budget = MIN_BUDGET_TOKENS
+    while budget < tokens:
+        budget *= 2
+    return min(budget, limit)
+
+
+def size_token_budget(
+    stage: UsageStage,
+    model: ModelType,
+    profile: OutputProfile,
+    thinks: bool,
+    default_max_tokens: int,
+    default_thinking_budget_tokens: int,
+) -> Optional[TokenBudget]:
+    """
+    Estimate the output limits of a call from recent calls with the same profile.
+
+    The budget covers the percentile of recent output tokens per unit times the
+    call's units, with headroom, rounded up to a power of two and capped at the model
+    defaults. Where the provider does not report thinking separately, the thinking
+    budget is sized like the whole output, which then includes the thinking.
+
+    Args:
+        stage: Workflow stage of the call
+        model: Model the call runs on
+        profile: Output language, term class and units of the call
+        thinks: Whether the call runs with extended thinking
+        default_max_tokens: max_tokens of the model when not sized
+        default_thinking_budget_tokens: Thinking budget of the model when not sized
+
+    Returns:
+        TokenBudget, or None until enough calls were observed or when sizing is disabled
+    """
+    key = (stage, model.value, thinks, profile.language, profile.term_class)
+    with _lock:
+        stats = _stats.get(key)
+        if not _enabled or stats is None or len(stats.output) < MIN_BUDGET_SAMPLES:
+            return None
+        output = stats.percentile(stats.output) * profile.units * BUDGET_HEADROOM
+        thinking = stats.percentile(stats.thinking) * profile.units * BUDGET_HEADROOM
+
+    if not thinks:
+        return TokenBudget(
+            max_tokens=_round_up(output, default_max_tokens), thinking_budget_tokens=None
+        )
+    thinking_budget = _round_up(thinking or output, default_thinking_budget_tokens)
+    # Thinking counts towards max_tokens, which has to leave room for the answer
+    max_tokens = _round_up(thinking_budget + output, default_max_tokens)
+    if max_tokens <= thinking_budget:
+        return None
+    return TokenBudget(max_tokens=max_tokens, thinking_budget_tokens=thinking_budget)
+
+
+def _stats_for(key: _StatsKey) -> _OutputStats:
+    stats = _stats.get(key)
+    if stats is None:
+        stats = _OutputStats()
+        _stats[key] = stats
+    return stats
+
+
+def record_output_usage(
+    model: ModelType, thinks: bool, profile: OutputProfile, usage: StageUsage
+) -> None:
+    """
+    Feed the output of a finished call back into the estimates of its profile.
+
+    Without a thinking budget max_tokens has to fit the whole output, so reasoning
+    tokens of models that reason anyway (OpenAI reasoning models such as gpt-5-mini)
+    are recorded as part of the output. With one, the answer and thinking are
+    recorded apart, since each gets its own limit.
+    """
+    key = (usage.stage, model.value, thinks, profile.language, profile.term_class)
+    answer = usage.output_tokens - usage.thinking_tokens if thinks else usage.output_tokens
+    with _lock:
+        stats = _stats_for(key)
+        stats.output.append(answer / profile.units)
+        stats.thinking.append(usage.thinking_tokens / profile.units)
+
+
+def record_budget_fallback(
+    stage: UsageStage, model: ModelType, thinks: bool, profile: OutputProfile
+) -> None:
+    """Count a call whose sized budget cut its output short, so it ran at the defaults."""
+    with _lock:
+        _stats_for(
+            (stage, model.value, thinks, profile.language, profile.term_class)
+        ).fallbacks += 1
+
+
+def configure_token_budget_sizing(enabled: bool) -> None:
+    """Size budgets from earlier calls, or leave every call at the model defaults (default)."""
+    global _enabled
+    _enabled = enabled
+    logger.info(f"Token budget sizing {'enabled' if enabled else 'disabled'}")
+
+
+def get_token_budget_metrics() -> List[TokenBudgetMetrics]:
+    """Return output statistics per stage, model, thinking mode, language and term class."""
+    with _lock:
+        return [
+            TokenBudgetMetrics(
+                stage=stage,
+                model=model,
+                thinking=thinking,
+                language=language,
+                term_class=term_class_,
+                samples=len(stats.output),
+                output_tokens_per_unit=stats.percentile(stats.output) if stats.output else 0,
+                thinking_tokens_per_unit=stats.percentile(stats.thinking) if stats.thinking else 0,
+                fallbacks=stats.fallbacks,
+            )
+            for (stage, model, thinking, language, term_class_), stats in _stats.items()
+        ]
@@ -0,0 +1,473 @@
+"""
+Content-addressed cache of LLM responses with in-memory, SQLite and Postgres backends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, cast
+
+from pydantic import BaseModel, Field
+
+from .models import ServedModel, UsageStage
+from .prompts import prompt_template_version
+
+if TYPE_CHECKING:
+    import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Responses are kept for 30 days unless configured otherwise
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600.0
+DEFAULT_MAX_ENTRIES = 10_000
+# Stores between size evictions of the SQL backends, which may overshoot by as many
+EVICTION_INTERVAL = 100
+
+_ENV_PREFIX = "LANGTOOLS_LLM_CACHE"
+
+
+class ResponseCacheMetrics(BaseModel):
+    """Lookups and evictions of the LLM response cache in the current process."""
+
+    backend: str
+    hits: int = Field(description="Lookups answered from the cache")
+    misses: int = Field(description="Lookups that had to call the model")
+    stores: int = Field(description="Responses written to the cache")
+    expirations: int = Field(description="Entries dropped because their TTL passed")
+    evictions: int = Field(description="Entries dropped to stay within max_entries")
+    errors: int = Field(description="Backend failures, treated as misses or skipped stores")
+
+
+class ResponseCache(ABC):
+    """
+    Cache of LLM responses by content hash, with TTL and size-based eviction.
+
+    Backend failures are logged and counted, never raised: a failed lookup is a
+    miss and a failed store is skipped, so the cache cannot fail a generation.
+    """
+
+    backend = "abstract"
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._expirations = 0
+        self._evictions = 0
+        self._errors = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the response stored under `key`, unless it is missing or expired."""
+        try:
+            value, expired = await self._get(key, time.time())
+        except Exception:
+            logger.exception(f"LLM response cache ({self.backend}) lookup failed")
+            value, expired = None, 0
+            with self._lock:
+                self._errors += 1
+        with self._lock:
+            self._expirations += expired
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """Store a response under `key`, evicting the least recently used beyond the limit."""
+        now = time.time()
+        expires_at = None if self.ttl_seconds is None else now + self.ttl_seconds
+        with self._lock:
+            evict = (self._stores + 1) % EVICTION_INTERVAL == 0
+        try:
+            evicted, expired = await self._set(key, value, now, expires_at, evict)
+        except Exception:
+            logger.exception(f"LLM response cache ({self.backend}) store failed")
+            with self._lock:
+                self._errors += 1
+            return
+        with self._lock:
+            self._stores += 1
+            self._evictions += evicted
+            self._expirations += expired
+
+    def metrics(self) -> ResponseCacheMetrics:
+        with self._lock:
+            return ResponseCacheMetrics(
+                backend=self.backend,
+                hits=self._hits,
+                misses=self._misses,
+                stores=self._stores,
+                expirations=self._expirations,
+                evictions=self._evictions,
+                errors=self._errors,
+            )
+
+    async def aclose(self) -> None:
+        """Release connections held by the backend."""
+
+    @abstractmethod
+    async def _get(self, key: str, now: float) -> tuple[Optional[str], int]:
+        """Return the live value of `key` and the number of expired entries dropped."""
+
+    @abstractmethod
+    async def _set(
+        self, key: str, value: str, now: float, expires_at: Optional[float], evict: bool
+    ) -> tuple[int, int]:
+        """Store `value`; with `evict`, trim to max_entries. Returns (evicted, expired)."""
+
+
+class MemoryResponseCache(ResponseCache):
+    """Least recently used responses of this process."""
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        super().__init__(ttl_seconds, max_entries)
+        self._entries: OrderedDict[str, tuple[str, Optional[float]]] = OrderedDict()
+
+    async def _get(self, key: str, now: float) -> tuple[Optional[str], int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, 0
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                return None, 1
+            self._entries.move_to_end(key)
+            return value, 0
+
+    async def _set(
+        self,
+        key: str,
+        value: str,
+        now: float,  # noqa: ARG002
+        expires_at: Optional[float],
+        evict: bool,  # noqa: ARG002
+    ) -> tuple[int, int]:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            evicted = 0
+            # Memory is trimmed on every store, so max_entries is never exceeded
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+                evicted += 1
+            return evicted, 0
+
+
+class SQLiteResponseCache(ResponseCache):
+    """Responses in a SQLite file, shared by processes on one machine."""
+
+    backend = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        super().__init__(ttl_seconds, max_entries)
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            _ = connection.execute("PRAGMA journal_mode=WAL")
+            _ = connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_response_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            _ = connection.execute(
+                """
+                CREATE INDEX IF NOT EXISTS llm_response_cache_accessed_at
+                ON llm_response_cache (accessed_at)
+                """
+            )
+            self._connection = connection
+        return self._connection
+
+    def _get_sync(self, key: str, now: float) -> tuple[Optional[str], int]:
+        with self._db_lock, self._connect() as connection:
+            row = cast(
+                Optional[tuple[str, Optional[float]]],
+                connection.execute(
+                    "SELECT value, expires_at FROM llm_response_cache WHERE key = ?", (key,)
+                ).fetchone(),
+            )
+            if row is None:
+                return None, 0
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                _ = connection.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+                return None, 1
+            _ = connection.execute(
+                "UPDATE llm_response_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return value, 0
+
+    def _set_sync(
+        self, key: str, value: str, now: float, expires_at: Optional[float], evict: bool
+    ) -> tuple[int, int]:
+        with self._db_lock, self._connect() as connection:
+            _ = connection.execute(
+                "INSERT OR REPLACE INTO llm_response_cache VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now),
+            )
+            if not evict:
+                return 0, 0
+            expired = connection.execute(
+                "DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,)
+            ).rowcount
+            evicted = connection.execute(
+                """
+                DELETE FROM llm_response_cache WHERE key IN (
+                    SELECT key FROM llm_response_cache ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+            return evicted, expired
+
+    async def _get(self, key: str, now: float) -> tuple[Optional[str], int]:
+        return await asyncio.to_thread(self._get_sync, key, now)
+
+    async def _set(
+        self, key: str, value: str, now: float, expires_at: Optional[float], evict: bool
+    ) -> tuple[int, int]:
+        return await asyncio.to_thread(self._set_sync, key, value, now, expires_at, evict)
+
+    async def aclose(self) -> None:
+        with self._db_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class PostgresResponseCache(ResponseCache):
+    """
+    Responses in a Postgres table, shared by every process using the database.
+
+    The schema is owned by the database's migrations (langtools-main creates it), not
+    created here::
+
+        CREATE TABLE llm_response_cache (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at DOUBLE PRECISION,
+            accessed_at DOUBLE PRECISION NOT NULL
+        );
+        CREATE INDEX ix_llm_response_cache_accessed_at ON llm_response_cache (accessed_at);
+    """
+
+    backend = "postgres"
+
+    def __init__(
+        self,
+        dsn: str,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        super().__init__(ttl_seconds, max_entries)
+        # asyncpg takes plain libpq URLs, without SQLAlchemy's driver suffix
+        self.dsn = dsn.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        async with self._pool_lock:
+            if self._pool is None:
+                # Optional dependency: `pip install langtools-ai[postgres]`
+                import asyncpg
+
+                self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=4)
+            return self._pool
+
+    async def _get(self, key: str, now: float) -> tuple[Optional[str], int]:
+        pool = await self._get_pool()
+        # Touching the row and reading it in one statement keeps lookups to a round trip
+        row = await pool.fetchrow(
+            """
+            UPDATE llm_response_cache SET accessed_at = $2
+            WHERE key = $1 AND (expires_at IS NULL OR expires_at > $2)
+            RETURNING value
+            """,
+            key,
+            now,
+        )
+        if row is not None:
+            return cast(str, row["value"]), 0
+        status = await pool.execute(
+            "DELETE FROM llm_response_cache WHERE key = $1 AND expires_at <= $2", key, now
+        )
+        return None, _affected_rows(status)
+
+    async def _set(
+        self, key: str, value: str, now: float, expires_at: Optional[float], evict: bool
+    ) -> tuple[int, int]:
+        pool = await self._get_pool()
+        _ = await pool.execute(
+            """
+            INSERT INTO llm_response_cache VALUES ($1, $2, $3, $4)
+            ON CONFLICT (key) DO UPDATE SET
+                value = excluded.value,
+                expires_at = excluded.expires_at,
+                accessed_at = excluded.accessed_at
+            """,
+            key,
+            value,
+            expires_at,
+            now,
+        )
+        if not evict:
+            return 0, 0
+        expired = await pool.execute("DELETE FROM llm_response_cache WHERE expires_at <= $1", now)
+        evicted = await pool.execute(
+            """
+            DELETE FROM llm_response_cache WHERE key IN (
+                SELECT key FROM llm_response_cache ORDER BY accessed_at DESC OFFSET $1
+            )
+            """,
+            self.max_entries,
+        )
+        return _affected_rows(evicted), _affected_rows(expired)
+
+    async def aclose(self) -> None:
+        async with self._pool_lock:
+            if self._pool is not None:
+                await self._pool.close()
+                self._pool = None
+
+
+def _affected_rows(status: str) -> int:
+    """Row count of an asyncpg command status such as "DELETE 3"."""
+    return int(status.rsplit(" ", 1)[-1])
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_json(schema: type[BaseModel]) -> str:
+    return json.dumps(schema.model_json_schema(), sort_keys=True)
+
+
+def response_cache_key(
+    stage: UsageStage, model: ServedModel, inputs: dict[str, str], schema: type[BaseModel]
+) -> str:
+    """
+    Hash of everything that determines a response: the model and thinking mode serving
+    it (the fake model included), prompt template, rendered inputs and output schema,
+    so editing any of them stops reusing older responses.
+    """
+    content = json.dumps(
+        {
+            "stage": stage,
+            "model": model.label,
+            "prompt": prompt_template_version(stage),
+            "inputs": inputs,
+            "schema": _schema_json(schema),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def response_cache_from_url(
+    url: str,
+    ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> ResponseCache:
+    """
+    Create a cache from a URL: "memory", "sqlite:///path/to/cache.db" or a Postgres URL.
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    if url == "memory":
+        return MemoryResponseCache(ttl_seconds, max_entries)
+    if url.startswith("sqlite:///"):
+        return SQLiteResponseCache(url.removeprefix("sqlite:///"), ttl_seconds, max_entries)
+    if url.startswith(("postgresql://", "postgresql+asyncpg://", "postgres://")):
+        return PostgresResponseCache(url, ttl_seconds, max_entries)
+    raise ValueError(f"Unsupported LLM response cache URL: {url}")
+
+
+def response_cache_from_env() -> Optional[ResponseCache]:
+    """
+    Read the response cache from the environment.
+
+    Returns a cache when LANGTOOLS_LLM_CACHE holds a URL accepted by
+    `response_cache_from_url`, sized by LANGTOOLS_LLM_CACHE_TTL_SECONDS ("none" keeps
+    entries until evicted) and LANGTOOLS_LLM_CACHE_MAX_ENTRIES.
+    """
+    url = os.getenv(_ENV_PREFIX)
+    if not url:
+        return None
+    ttl = os.getenv(f"{_ENV_PREFIX}_TTL_SECONDS", str(DEFAULT_TTL_SECONDS))
+    return response_cache_from_url(
+        url,
+        None if ttl.lower() == "none" else float(ttl),
+        int(os.getenv(f"{_ENV_PREFIX}_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))),
+    )
+
+
+_response_cache: Optional[ResponseCache] = response_cache_from_env()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, if one is configured."""
+    return _response_cache
+
+
+def configure_response_cache(cache: Optional[ResponseCache]) -> None:
+    """
+    Cache the responses of the base and translation calls, or stop doing so with None.
+
+    Defaults to the LANGTOOLS_LLM_CACHE environment variables. A replaced cache is not
+    closed; call `aclose_response_cache` first to release its connections.
+    """
+    global _response_cache
+    _response_cache = cache
+    if cache is not None:
+        logger.info(f"Caching LLM responses in {cache.backend}")
+
+
+async def aclose_response_cache() -> None:
+    """Close the connections of the process-wide response cache on shutdown."""
+    if _response_cache is not None:
+        await _response_cache.aclose()
+
+
+def get_response_cache_metrics() -> Optional[ResponseCacheMetrics]:
+    """Return hits, misses and evictions of the response cache, if one is configured."""
+    return _response_cache.metrics() if _response_cache is not None else None
@@ -4,34 +4,153 @@ LLM client management for AI functions.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import List
+import threading
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import aclosing
+from typing import List, Optional, TypeVar, cast
 
+import httpx
 from langchain_anthropic import ChatAnthropic
 from langchain_community.callbacks.manager import get_openai_callback
+from langchain_core.callbacks import UsageMetadataCallbackHandler
 from langchain_core.language_models import BaseChatModel
 from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, ConfigDict, Field
 
 from langtools.ai.debug import configure_debug_logging
 
-from .models import AiDictionaryEntry, AiMeaningTranslation, MeaningTranslationList, ModelType
+from .budgets import OutputProfile, record_output_usage
+from .fake import FakeChatModel, FakeLLMSettings, fake_llm_settings_from_env
+from .resilience import (
+    LLMUnavailableError,
+    backoff_delay,
+    get_circuit_breaker,
+    is_transient_error,
+    record_retry,
+)
+from .models import (
+    AiDictionaryEntry,
+    AiMeaningTranslation,
+    MeaningTranslationList,
+    ModelType,
+    ServedModel,
+    StageUsage,
+    UsageStage,
+)
+from .usage import UsageTracker, record_usage, stage_usage
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 configure_debug_logging()
 
+# Extended thinking budget of Sonnet 4 unless a settings variant sizes it
+DEFAULT_THINKING_BUDGET_TOKENS = 32000
+
+
+class OutputTruncatedError(ValueError):
+    """Raised when a call's output stopped at the max_tokens of its settings variant."""
+
+
+class LLMClientSettings(BaseModel):
+    """Settings variant of a model; unset fields keep the per-model defaults."""
+
+    model_config = ConfigDict(frozen=True)
+
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    thinking_budget_tokens: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Thinking budget of models that think; 0 disables thinking (default if unset)",
+    )
+    # Deadline of a single attempt; streams only until their first output
+    timeout: float = 180
+    max_attempts: int = Field(default=3, ge=1)
+    deadline: float = Field(
+        default=180,
+        gt=0,
+        description="Deadline of a call across all of its attempts and backoff delays",
+    )
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 8
+    failover_model: Optional[ModelType] = Field(
+        default=None, description="Model serving calls this model is unavailable for"
+    )
+
 
 class LLMClient:
     """Client for managing LLM interactions with different providers."""
 
-    def __init__(self, model_type: ModelType) -> None:
-        """Initialize client with specified model type."""
+    def __init__(
+        self,
+        model_type: ModelType,
+        settings: Optional[LLMClientSettings] = None,
+        http_async_client: Optional[httpx.AsyncClient] = None,
+        fake_settings: Optional[FakeLLMSettings] = None,
+    ) -> None:
+        """
+        Initialize client with specified model type and optional settings variant.
+
+        With `fake_settings` every model type is served by the offline fake chat model.
+        """
         self.model_type = model_type
+        self.settings = settings or LLMClientSettings()
+        self.http_async_client = http_async_client
+        self.fake_settings = fake_settings
         self.model = self._create_model(model_type)
 
+    @property
+    def supports_streaming_tool_calls(self) -> bool:
+        """Whether tool-call arguments stream in, so structured output can be parsed early."""
+        # With streaming disabled LangChain answers `astream` with one complete message
+        return self.model.disable_streaming is False
+
+    @property
+    def provider(self) -> str:
+        """Provider whose circuit breaker guards this client's calls."""
+        if isinstance(self.model, FakeChatModel):
+            return "fake"
+        return "anthropic" if isinstance(self.model, ChatAnthropic) else "openai"
+
+    @property
+    def served_model(self) -> ServedModel:
+        """Model and thinking mode that answer this client's calls."""
+        if isinstance(self.model, FakeChatModel):
+            return ServedModel(model=ModelType.FAKE)
+        return ServedModel(
+            model=self.model_type,
+            thinking=thinks(self.model_type, self.settings.thinking_budget_tokens),
+        )
+
+    def failover_client(self) -> Optional[LLMClient]:
+        """
+        Return the shared client of the failover model, if one is configured.
+
+        Output limits sized or routed for this client's model do not fit another, so the
+        failover model runs at the default max_tokens and thinking budget.
+        """
+        if self.settings.failover_model is None:
+            return None
+        defaults = default_llm_client_settings()
+        settings = self.settings.model_copy(
+            update={
+                "max_tokens": defaults.max_tokens,
+                "thinking_budget_tokens": defaults.thinking_budget_tokens,
+                "failover_model": None,
+            }
+        )
+        return get_llm_client(self.settings.failover_model, settings)
+
     def _create_model(self, model_type: ModelType) -> BaseChatModel:
         """Create appropriate LangChain model based on type."""
+        if self.fake_settings is not None or model_type == ModelType.FAKE:
+            return FakeChatModel(settings=self.fake_settings or FakeLLMSettings())
         if model_type in [
             ModelType.GPT4,
             ModelType.GPT3_5,
@@ -39,30 +158,39 @@ class LLMClient:
             ModelType.GTP5_MINI,
             ModelType.GTP4_O_MINI,
         ]:
-            # Use fewer tokens for GPT models to avoid context length issues
+            default_temperature = 1 if model_type == ModelType.GTP5_MINI else 0.3
             return ChatOpenAI(
                 model=model_type.value,
-                temperature=1 if model_type == ModelType.GTP5_MINI else 0.3,
-                max_tokens=32768  # type: ignore[call-arg]
-                if model_type == ModelType.GTP4_1_MINI
-                else 16384
-                if model_type == ModelType.GTP4_O_MINI
-                else 64000,
-                timeout=180,  # type: ignore[call-arg]
+                temperature=default_temperature
+                if self.settings.temperature is None
+                else self.settings.temperature,
+                max_tokens=self.settings.max_tokens or default_max_tokens(model_type),  # type: ignore[call-arg]
+                timeout=self.settings.timeout,  # type: ignore[call-arg]
+                http_async_client=self.http_async_client,
+                # Attempts are retried with backoff by `_call_with_retries` instead
+                max_retries=0,
+                # Report token usage, including cached prompt tokens, when streaming too
+                stream_usage=True,
             )
         if model_type in [ModelType.CLAUDE_SONNET_3_5, ModelType.CLAUDE_SONNET_4]:
             # Enable thinking only for Sonnet 4.0
             thinking_config = None
-            if model_type == ModelType.CLAUDE_SONNET_4:
+            budget_tokens = self.settings.thinking_budget_tokens
+            if thinks(model_type, budget_tokens):
                 thinking_config = {
                     "type": "enabled",
-                    "budget_tokens": 32000,
+                    # Anthropic rejects budgets below 1024 tokens
+                    "budget_tokens": DEFAULT_THINKING_BUDGET_TOKENS
+                    if budget_tokens is None
+                    else max(1024, budget_tokens),
                 }
 
+            # The Anthropic SDK client keeps its own pooled httpx client per base URL
             return ChatAnthropic(
                 model=model_type.value,  # type: ignore[call-arg]
-                max_tokens=64000,  # type: ignore[call-arg]
-                timeout=180,  # type: ignore[call-arg]
+                max_tokens=self.settings.max_tokens or default_max_tokens(model_type),  # type: ignore[call-arg]
+                timeout=self.settings.timeout,  # type: ignore[call-arg]
+                max_retries=0,
                 thinking=thinking_config,
             )
 
@@ -87,35 +215,298 @@ class LLMClient:
             return result
 
     async def generate_with_parser_base(
-        self, chain: Runnable[dict[str, str], AiDictionaryEntry]
+        self,
+        chain: Runnable[dict[str, str], AiDictionaryEntry],
+        inputs: dict[str, str],
+        usage: Optional[UsageTracker] = None,
+        profile: Optional[OutputProfile] = None,
     ) -> AiDictionaryEntry:
-        """Execute base dictionary chain with cost logging."""
-        logger.info("🚀 Executing base dictionary LLM chain...")
+        """
+        Execute base dictionary chain with token, cost and latency accounting.
 
-        if self.model_type in [ModelType.GPT4, ModelType.GPT3_5]:
-            with get_openai_callback() as cb:
-                result = await chain.ainvoke({})
-                # Log cost information for monitoring
-                logger.info(f"💰 Base dictionary API cost: ${cb.total_cost:.4f}")
-                return result
-        else:
-            result = await chain.ainvoke({})
-            logger.info("✅ Base dictionary chain execution completed successfully")
-            return result
+        With `profile` the output is fed back into the token budget estimates.
+
+        Raises:
+            OutputTruncatedError: If the output used up the settings' max_tokens
+        """
+        logger.info("🚀 Executing base dictionary LLM chain...")
+        handler = UsageMetadataCallbackHandler()
+        started = time.perf_counter()
+        result = await self._call_with_retries(
+            lambda: chain.ainvoke(inputs, {"callbacks": [handler]})
+        )
+        self._raise_if_truncated(self._account_usage("base", handler, started, usage, profile))
+        return result
 
     async def generate_with_parser_translations(
-        self, chain: Runnable[dict[str, str], MeaningTranslationList]
+        self,
+        chain: Runnable[dict[str, str], MeaningTranslationList],
+        inputs: dict[str, str],
+        usage: Optional[UsageTracker] = None,
+        profile: Optional[OutputProfile] = None,
     ) -> List[AiMeaningTranslation]:
-        """Execute translation chain with cost logging."""
+        """
+        Execute translation chain with token, cost and latency accounting.
+
+        With `profile` the output is fed back into the token budget estimates.
+
+        Raises:
+            OutputTruncatedError: If the output used up the settings' max_tokens
+        """
         logger.info("🚀 Executing translation LLM chain...")
+        handler = UsageMetadataCallbackHandler()
+        started = time.perf_counter()
+        result = await self._call_with_retries(
+            lambda: chain.ainvoke(inputs, {"callbacks": [handler]})
+        )
+        call_usage = self._account_usage("translations", handler, started, usage, profile)
+        self._raise_if_truncated(call_usage)
+        return result.translations
 
-        if self.model_type in [ModelType.GPT4, ModelType.GPT3_5]:
-            with get_openai_callback() as cb:
-                result = await chain.ainvoke({})
-                # Log cost information for monitoring
-                logger.info(f"💰 Translation API cost: ${cb.total_cost:.4f}")
-                return result.translations
-        else:
-            result = await chain.ainvoke({})
-            logger.info("✅ Translation chain execution completed successfully")
-            return result.translations
+    async def stream_with_parser(
+        self,
+        chain: Runnable[dict[str, str], dict[str, object]],
+        inputs: dict[str, str],
+        stage: UsageStage,
+        usage: Optional[UsageTracker] = None,
+        profile: Optional[OutputProfile] = None,
+    ) -> AsyncGenerator[dict[str, object], None]:
+        """
+        Stream partial structured output of a chain with token, cost and latency accounting.
+
+        Attempts are retried until the first output arrives; a transient failure after
+        that raises LLMUnavailableError, since outputs were already consumed.
+        """
+        logger.info(f"🚀 Streaming {stage} LLM chain...")
+        # An explicit callback, unlike a context-wide one, only sees this chain's calls
+        handler = UsageMetadataCallbackHandler()
+        started = time.perf_counter()
+
+        async def first_output() -> tuple[
+            Optional[dict[str, object]], AsyncGenerator[dict[str, object], None]
+        ]:
+            stream = cast(
+                AsyncGenerator[dict[str, object], None],
+                chain.astream(inputs, {"callbacks": [handler]}),
+            )
+            try:
+                return await anext(stream, None), stream
+            except BaseException:
+                # A failed or timed out attempt would otherwise hold its HTTP response open
+                await stream.aclose()
+                raise
+
+        output, stream = await self._call_with_retries(first_output, record_success=False)
+        breaker = get_circuit_breaker(self.provider)
+        async with aclosing(stream):
+            try:
+                if output is not None:
+                    yield output
+                    async for output in stream:
+                        yield output
+            except Exception as e:
+                if not is_transient_error(e):
+                    raise
+                breaker.record_failure()
+                raise LLMUnavailableError(f"{self.provider} failed mid-stream: {e}") from e
+        breaker.record_success()
+        self._account_usage(stage, handler, started, usage, profile)
+
+    async def _call_with_retries(
+        self, call: Callable[[], Awaitable[T]], record_success: bool = True
+    ) -> T:
+        """
+        Run `call` with a per-attempt deadline, retrying transient failures.
+
+        Attempts go through the provider's circuit breaker and are retried with
+        full-jitter exponential backoff, all within the call's overall deadline, so a
+        hung provider holds a call no longer than `settings.deadline`. Errors that are
+        not transient propagate as-is.
+
+        Raises:
+            LLMUnavailableError: If the circuit is open, every attempt failed transiently
+                or the deadline left no time for another attempt
+        """
+        breaker = get_circuit_breaker(self.provider)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.settings.deadline
+        for attempt in range(1, self.settings.max_attempts + 1):
+            breaker.before_call()
+            try:
+                timeout = min(self.settings.timeout, deadline - loop.time())
+                result = await asyncio.wait_for(call(), timeout)
+            except Exception as e:
+                if not is_transient_error(e):
+                    # The provider answered, so it is not degraded
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt == self.settings.max_attempts:
+                    error_msg = f"{self.provider} failed after {attempt} attempts: {e!r}"
+                    raise LLMUnavailableError(error_msg) from e
+                delay = backoff_delay(
+                    attempt, self.settings.retry_base_delay, self.settings.retry_max_delay
+                )
+                if deadline - loop.time() <= delay:
+                    error_msg = (
+                        f"{self.provider} failed after {attempt} attempts "
+                        + f"within the {self.settings.deadline:g}s deadline: {e!r}"
+                    )
+                    raise LLMUnavailableError(error_msg) from e
+                record_retry()
+                logger.warning(
+                    f"⚠️ {self.model_type.value} attempt {attempt} failed ({e!r}), "
+                    + f"retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            else:
+                if record_success:
+                    breaker.record_success()
+                return result
+        raise AssertionError("unreachable: max_attempts is at least 1")
+
+    def _account_usage(
+        self,
+        stage: UsageStage,
+        handler: UsageMetadataCallbackHandler,
+        started: float,
+        usage: Optional[UsageTracker],
+        profile: Optional[OutputProfile],
+    ) -> StageUsage:
+        """Record and log the usage of a finished chain call."""
+        # Calls served by the fake model are reported as such and cost nothing
+        call_usage = stage_usage(
+            stage, self.served_model.model, handler.usage_metadata, time.perf_counter() - started
+        )
+        record_usage(call_usage, usage)
+        if profile is not None:
+            thinking = thinks(self.model_type, self.settings.thinking_budget_tokens)
+            record_output_usage(self.model_type, thinking, profile, call_usage)
+        tokens = f"input={call_usage.input_tokens}, output={call_usage.output_tokens}"
+        details = (
+            f"cache read={call_usage.cache_read_tokens}, "
+            + f"cache write={call_usage.cache_creation_tokens}, "
+            + f"thinking={call_usage.thinking_tokens}"
+        )
+        cost = f"{call_usage.wall_time_seconds:.2f}s, ${call_usage.estimated_cost_usd:.4f}"
+        logger.info(f"📊 {stage} usage ({call_usage.model}): {tokens} ({details}), {cost}")
+        return call_usage
+
+    def _raise_if_truncated(self, call_usage: StageUsage) -> None:
+        """Raise OutputTruncatedError if a call stopped at the settings' max_tokens."""
+        max_tokens = self.settings.max_tokens
+        if max_tokens is not None and call_usage.output_tokens >= max_tokens:
+            error_msg = f"{call_usage.stage} output stopped at max_tokens={max_tokens}"
+            raise OutputTruncatedError(error_msg)
+
+
+def default_max_tokens(model_type: ModelType) -> int:
+    """max_tokens of a model unless a settings variant sets it."""
+    # Use fewer tokens for GPT models to avoid context length issues
+    if model_type == ModelType.GTP4_1_MINI:
+        return 32768
+    if model_type == ModelType.GTP4_O_MINI:
+        return 16384
+    return 64000
+
+
+def thinks(model_type: ModelType, thinking_budget_tokens: Optional[int]) -> bool:
+    """Whether calls to a model with the given thinking budget setting use extended thinking."""
+    return model_type == ModelType.CLAUDE_SONNET_4 and thinking_budget_tokens != 0
+
+
+# Process-level registry: one client per model and settings variant, with a shared
+# keep-alive connection pool for OpenAI models. Creation happens without awaiting,
+# so concurrent coroutines never build duplicates; the lock covers threaded callers.
+_registry_lock = threading.Lock()
+_clients: dict[tuple[ModelType, LLMClientSettings], LLMClient] = {}
+_openai_http_client: Optional[httpx.AsyncClient] = None
+_fake_settings: Optional[FakeLLMSettings] = fake_llm_settings_from_env()
+_default_settings = LLMClientSettings()
+
+
+def _get_openai_http_client() -> httpx.AsyncClient:
+    global _openai_http_client
+    if _openai_http_client is None or _openai_http_client.is_closed:
+        _openai_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=20, keepalive_expiry=60
+            ),
+            timeout=httpx.Timeout(180, connect=10),
+        )
+    return _openai_http_client
+
+
+def get_llm_client(
+    model_type: ModelType, settings: Optional[LLMClientSettings] = None
+) -> LLMClient:
+    """
+    Return the shared client for a model and settings variant, creating it once.
+
+    Args:
+        model_type: LLM model to use
+        settings: Optional overrides of the model defaults
+
+    Returns:
+        LLMClient reused by every caller asking for the same model and settings
+    """
+    key = (model_type, settings or _default_settings)
+    with _registry_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = LLMClient(
+                *key, http_async_client=_get_openai_http_client(), fake_settings=_fake_settings
+            )
+            _clients[key] = client
+            logger.info(f"Created shared LLM client for {model_type.value}")
+        return client
+
+
+def primary_served_model(model_type: ModelType) -> ServedModel:
+    """
+    Return the model and thinking mode that answer calls to `model_type` by default,
+    without routing, hedging or failover: what its stored output is labelled with.
+    """
+    return get_llm_client(model_type).served_model
+
+
+def default_llm_client_settings() -> LLMClientSettings:
+    """Return the settings `get_llm_client` uses when called without a settings variant."""
+    return _default_settings
+
+
+def configure_llm_client_defaults(settings: LLMClientSettings) -> None:
+    """
+    Set the settings used when `get_llm_client` is called without a settings variant.
+
+    Shared clients created before are dropped so the next call picks them up.
+    """
+    global _default_settings
+    with _registry_lock:
+        _default_settings = settings
+        _clients.clear()
+
+
+def configure_fake_llm(settings: Optional[FakeLLMSettings]) -> None:
+    """
+    Serve every model with the offline fake chat model, or stop doing so with None.
+
+    Defaults to the LANGTOOLS_FAKE_LLM environment variables; shared clients created
+    before the switch are dropped so the next call picks it up.
+    """
+    global _fake_settings
+    with _registry_lock:
+        _fake_settings = settings
+        _clients.clear()
+    if settings is not None:
+        logger.warning(f"Serving all LLM calls with the offline fake model: {settings!r}")
+
+
+async def aclose_llm_clients() -> None:
+    """Drop shared clients and close their pooled HTTP connections on shutdown."""
+    global _openai_http_client
+    with _registry_lock:
+        _clients.clear()
+        http_client, _openai_http_client = _openai_http_client, None
+    if http_client is not None:
+        await http_client.aclose()
@@ -0,0 +1,347 @@
+"""
+Deterministic offline chat model for load and regression testing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Sequence
+from pathlib import Path
+from typing import List, Literal, Optional, cast
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages.ai import UsageMetadata
+from langchain_core.messages.tool import tool_call_chunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from .models import AiDictionaryEntry, AiMeaning, AiMeaningTranslation, MeaningTranslationList
+from .normalization import normalize_term
+
+logger = logging.getLogger(__name__)
+
+FAKE_MODEL_NAME = "fake"
+
+# Environment variables are named LANGTOOLS_FAKE_LLM_<FIELD>, e.g. LANGTOOLS_FAKE_LLM_SEED
+_ENV_PREFIX = "LANGTOOLS_FAKE_LLM"
+
+
+class FakeLLMSettings(BaseModel):
+    """Latency, failures and payload source of the offline fake chat model."""
+
+    model_config = ConfigDict(frozen=True)
+
+    latency_distribution: Literal["constant", "uniform", "lognormal"] = Field(
+        default="lognormal", description="Distribution latencies are drawn from"
+    )
+    latency_seconds: float = Field(default=1.0, ge=0, description="Median latency of a call")
+    latency_spread: float = Field(
+        default=0.5,
+        ge=0,
+        description="Sigma of the lognormal distribution, or +/- fraction of the median",
+    )
+    failure_rate: float = Field(
+        default=0, ge=0, le=1, description="Share of calls failing with FakeLLMError"
+    )
+    meanings: int = Field(default=3, ge=1, le=10, description="Meanings per generated entry")
+    fixtures_path: Optional[str] = Field(
+        default=None,
+        description="JSON list of recorded AiDictionaryEntry payloads served for their terms",
+    )
+    stream_chunk_chars: int = Field(
+        default=64, ge=1, description="Characters of tool call arguments per streamed chunk"
+    )
+    seed: int = Field(default=0, description="Seed of the latency and failure sequence")
+
+
+class FakeLLMError(Exception):
+    """Raised for calls the fake chat model fails on purpose."""
+
+
+def fake_llm_settings_from_env() -> Optional[FakeLLMSettings]:
+    """
+    Read fake LLM settings from the environment.
+
+    Returns settings when LANGTOOLS_FAKE_LLM is "true", with each field overridable
+    through LANGTOOLS_FAKE_LLM_<FIELD>, e.g. LANGTOOLS_FAKE_LLM_FAILURE_RATE=0.05.
+    """
+    if os.getenv(_ENV_PREFIX, "false").lower() != "true":
+        return None
+    overrides = {
+        field: os.environ[f"{_ENV_PREFIX}_{field.upper()}"]
+        for field in FakeLLMSettings.model_fields
+        if f"{_ENV_PREFIX}_{field.upper()}" in os.environ
+    }
+    return FakeLLMSettings.model_validate(overrides)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model answering the dictionary prompts offline with schema-valid tool calls.
+
+    Payloads depend only on the prompt parameters: recorded entries from
+    `fixtures_path` are served for their terms, anything else is generated. Latencies
+    and failures are drawn from a sequence seeded by `settings.seed`. Tool call
+    arguments are streamed in chunks, so partial structured output works as with
+    the real providers.
+    """
+
+    settings: FakeLLMSettings = Field(default_factory=FakeLLMSettings)
+
+    _rng: random.Random = PrivateAttr()
+    _fixtures: dict[str, AiDictionaryEntry] = PrivateAttr()
+
+    def model_post_init(self, context: object, /) -> None:
+        super().model_post_init(context)
+        self._rng = random.Random(self.settings.seed)
+        self._fixtures = _load_fixtures(self.settings.fixtures_path)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-dictionary"
+
+    def bind_tools(
+        self,
+        tools: Sequence[dict[str, object] | type | Callable[..., object] | BaseTool],
+        *,
+        tool_choice: Optional[str] = None,  # noqa: ARG002
+        **kwargs: object,
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        """Bind tool definitions; the first tool is always the one called."""
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,  # noqa: ARG002
+        run_manager: Optional[CallbackManagerForLLMRun] = None,  # noqa: ARG002
+        **kwargs: object,
+    ) -> ChatResult:
+        latency, failed = self._sample_call()
+        time.sleep(latency)
+        return self._result(messages, kwargs, failed)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,  # noqa: ARG002
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,  # noqa: ARG002
+        **kwargs: object,
+    ) -> ChatResult:
+        latency, failed = self._sample_call()
+        await asyncio.sleep(latency)
+        return self._result(messages, kwargs, failed)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,  # noqa: ARG002
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,  # noqa: ARG002
+        **kwargs: object,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        latency, failed = self._sample_call()
+        name, arguments = self._respond(messages, kwargs)
+        size = self.settings.stream_chunk_chars
+        pieces = [arguments[start : start + size] for start in range(0, len(arguments), size)]
+        call_id = f"call_{uuid.uuid4().hex[:12]}"
+
+        # Latency is spread over the chunks; a failing call breaks before the last one
+        for index, piece in enumerate(pieces):
+            await asyncio.sleep(latency / len(pieces))
+            if failed and index == min(1, len(pieces) - 1):
+                raise FakeLLMError("Simulated LLM provider failure mid-stream")
+            last = index == len(pieces) - 1
+            chunk = AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    tool_call_chunk(
+                        name=name if index == 0 else None,
+                        args=piece,
+                        id=call_id if index == 0 else None,
+                        index=0,
+                    )
+                ],
+                usage_metadata=_usage_metadata(messages, arguments) if last else None,
+                response_metadata={"model_name": FAKE_MODEL_NAME} if last else {},
+            )
+            yield ChatGenerationChunk(message=chunk)
+
+    def _sample_call(self) -> tuple[float, bool]:
+        """Draw the latency of the next call and whether it fails."""
+        settings = self.settings
+        if settings.latency_distribution == "constant":
+            latency = settings.latency_seconds
+        elif settings.latency_distribution == "uniform":
+            spread = settings.latency_seconds * settings.latency_spread
+            latency = max(0, self._rng.uniform(-spread, spread) + settings.latency_seconds)
+        else:
+            latency = settings.latency_seconds * self._rng.lognormvariate(
+                0, settings.latency_spread
+            )
+        return latency, self._rng.random() < settings.failure_rate
+
+    def _result(
+        self, messages: list[BaseMessage], kwargs: dict[str, object], failed: bool
+    ) -> ChatResult:
+        if failed:
+            raise FakeLLMError("Simulated LLM provider failure")
+        name, arguments = self._respond(messages, kwargs)
+        message = AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": name,
+                    "args": cast(dict[str, object], json.loads(arguments)),
+                    "id": f"call_{uuid.uuid4().hex[:12]}",
+                    "type": "tool_call",
+                }
+            ],
+            usage_metadata=_usage_metadata(messages, arguments),
+            response_metadata={"model_name": FAKE_MODEL_NAME},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _respond(self, messages: list[BaseMessage], kwargs: dict[str, object]) -> tuple[str, str]:
+        """Return the called tool and its JSON arguments for the prompt parameters."""
+        name = _tool_name(kwargs.get("tools"))
+        parameters = _prompt_parameters(messages[-1])
+        if name == AiDictionaryEntry.__name__:
+            payload: BaseModel = self._entry(
+                str(parameters["translatingTerm"]), str(parameters["userLearningLanguages"])
+            )
+        elif name == MeaningTranslationList.__name__:
+            payload = _translations(
+                cast(dict[str, list[dict[str, object]]], parameters["dictionaryEntry"]),
+                str(parameters["translationLanguage"]),
+            )
+        else:
+            raise ValueError(f"Fake chat model cannot answer tool {name!r}")
+        return name, payload.model_dump_json(exclude_none=True)
+
+    def _entry(self, term: str, user_learning_languages: str) -> AiDictionaryEntry:
+        """Serve the recorded entry for a term, or generate one."""
+        normalized = normalize_term(term)
+        fixture = self._fixtures.get(normalized.key)
+        if fixture is not None:
+            return fixture
+
+        headword = normalized.surface
+        meanings = [
+            AiMeaning(
+                headword=headword,
+                local_id=f"{headword}-{index}",
+                canonical_form=headword,
+                alternate_spellings=[],
+                definition=f"Generated meaning {index} of «{headword}».",
+                part_of_speech="noun",
+                pronunciation=f"/{normalized.key}/",
+                morphology="singular",
+                register="neutral",
+                frequency="common",
+                etymology=f"Generated etymology of «{headword}».",
+                difficulty_level="intermediate",
+                learning_priority="medium",
+                example_sentences=[
+                    f"Example {example} of «{headword}» in meaning {index}."
+                    for example in range(1, 4)
+                ],
+                collocations=[f"{headword} {index}"],
+            )
+            for index in range(1, self.settings.meanings + 1)
+        ]
+        return AiDictionaryEntry(
+            headword=headword,
+            source_language=_source_language(user_learning_languages),
+            meanings=meanings,
+        )
+
+
+def _translations(
+    entry: dict[str, list[dict[str, object]]], language: str
+) -> MeaningTranslationList:
+    """Generate one translation per meaning of the compact entry sent to the model."""
+    translations: List[AiMeaningTranslation] = []
+    for meaning in entry["meanings"]:
+        headword = str(meaning["headword"])
+        examples = cast(list[str], meaning.get("example_sentences") or ["", ""])
+        translations.append(
+            AiMeaningTranslation(
+                meaning_local_id=str(meaning["local_id"]),
+                headword=f"{headword} ({language})",
+                canonical_form=f"{meaning.get('canonical_form', headword)} ({language})",
+                translation_language=language,
+                translation=f"{headword} ({language})",
+                definition=f"[{language}] {meaning.get('definition', '')}",
+                part_of_speech=str(meaning.get("part_of_speech", "")),
+                pronunciation=f"/{normalize_term(headword).key}/",
+                pronunciation_tips=f"Pronounce «{headword}» as written.",
+                morphology="singular",
+                register="neutral",
+                frequency="common",
+                etymology=f"Generated etymology of «{headword}».",
+                difficulty_level="intermediate",
+                learning_priority="medium",
+                example_sentences_translations=[f"[{language}] {text}" for text in examples],
+            )
+        )
+    return MeaningTranslationList(translations=translations)
+
+
+def _tool_name(tools: object) -> str:
+    if not isinstance(tools, list) or not tools:
+        raise ValueError("Fake chat model only answers structured output tool calls")
+    tool = cast(dict[str, dict[str, str]], tools[0])
+    return tool["function"]["name"]
+
+
+def _prompt_parameters(message: BaseMessage) -> dict[str, object]:
+    """Parse the parameter definitions JSON of the user message by parameter name."""
+    definitions = cast(list[dict[str, object]], json.loads(message.text()))
+    return {str(definition["name"]): definition.get("value") for definition in definitions}
+
+
+def _source_language(user_learning_languages: str) -> str:
+    """Pick the highest priority language of a `lang:priority,...` list."""
+    best_language, best_priority = "en", float("-inf")
+    for item in user_learning_languages.split(","):
+        language, _, priority = item.strip().partition(":")
+        try:
+            value = float(priority)
+        except ValueError:
+            continue
+        if language and value > best_priority:
+            best_language, best_priority = language, value
+    return best_language
+
+
+def _usage_metadata(messages: list[BaseMessage], arguments: str) -> UsageMetadata:
+    """Approximate token counts at four characters per token."""
+    input_tokens = sum(len(message.text()) for message in messages) // 4
+    output_tokens = len(arguments) // 4
+    return UsageMetadata(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=input_tokens + output_tokens,
+    )
+
+
+def _load_fixtures(path: Optional[str]) -> dict[str, AiDictionaryEntry]:
+    if path is None:
+        return {}
+    entries = [
+        AiDictionaryEntry.model_validate(entry)
+        for entry in cast(list[object], json.loads(Path(path).read_text(encoding="utf-8")))
+    ]
+    logger.info(f"Loaded {len(entries)} fake LLM fixtures from {path}")
+    return {normalize_term(entry.headword).key: entry for entry in entries}
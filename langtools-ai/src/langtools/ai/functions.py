@@ -2,28 +2,74 @@
 Core AI functions for language learning tools with LangGraph workflow.
 """
 
+import asyncio
 import logging
 import re
-from typing import List, NoReturn, Optional
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from typing import List, NoReturn, Optional, TypeVar, cast
 
-from .client import LLMClient
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+
+from .budgets import OutputProfile, record_budget_fallback, size_token_budget, term_class
+from .cache import get_response_cache, response_cache_key
+from .client import (
+    DEFAULT_THINKING_BUDGET_TOKENS,
+    LLMClient,
+    LLMClientSettings,
+    default_llm_client_settings,
+    default_max_tokens,
+    get_llm_client,
+    primary_served_model,
+    thinks,
+)
 from .models import (
     AiDictionaryEntry,
     BaseDictionaryParams,
+    CachedDictionaryEntry,
+    DictionaryBatchHooks,
+    DictionaryBatchItemResult,
+    DictionaryBatchParams,
     DictionaryEntryParams,
+    DictionaryStreamEvent,
     DictionaryWorkflowHooks,
+    DictionaryWorkflowMetadata,
     DictionaryWorkflowResult,
+    AiMeaning,
     AiMeaningTranslation,
+    MeaningTranslationList,
+    HedgingPolicy,
     ModelType,
+    PreviousTranslations,
+    RoutingPolicy,
+    ServedModel,
     TranslationParams,
+    UsageStage,
 )
+from .normalization import NormalizedTerm, normalize_term
 from .prompts import (
+    base_dictionary_inputs,
     create_base_dictionary_chain,
+    create_base_dictionary_stream_chain,
     create_meaning_translations_chain,
+    create_meaning_translations_stream_chain,
+    meaning_translations_inputs,
 )
+from .hedging import hedged_call
+from .resilience import LLMUnavailableError, record_failover
+from .routing import record_escalation, route_call
+from .singleflight import single_flight
+from .usage import UsageTracker, total_cost
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+# Upper bound on concurrent LLM calls when translating meanings in groups
+MAX_CONCURRENT_TRANSLATION_CALLS = 4
+
 
 class ValidationError(Exception):
     """Raised when input validation fails."""
@@ -34,14 +80,18 @@ class LLMAPIError(Exception):
 
 
 async def generate_base_dictionary_entry(
-    params: BaseDictionaryParams, model: ModelType
+    params: BaseDictionaryParams, model: ModelType, usage: Optional[UsageTracker] = None
 ) -> AiDictionaryEntry:
     """
     Generate base dictionary entry in original language only (step 1 of workflow).
 
+    With `params.routing` set, a simple term is tried on the policy's fast route first
+    and regenerated by `model` if that entry is invalid or has too few meanings.
+
     Args:
         params: Parameters for base dictionary generation
-        model: LLM model to use
+        model: LLM model to use, or to escalate to under a routing policy
+        usage: Optional tracker to record token usage, cost and latency into
 
     Returns:
         AiDictionaryEntry with comprehensive information in original language
@@ -50,51 +100,89 @@ async def generate_base_dictionary_entry(
         ValidationError: If inputs are invalid
         LLMAPIError: If API call fails
     """
-    # Input validation
-    if not params.translating_term.strip():
-        raise ValidationError("Translating term cannot be empty")
+    entry, _ = await _generate_base_dictionary_entry(params, model, usage)
+    return entry
 
-    if len(params.translating_term) > 100:
-        raise ValidationError("Translating term too long (max 100 characters)")
 
-    # Validate user_learning_languages format (e.g., "en:1,ru:2")
-    if params.user_learning_languages and not re.match(
-        r"^[a-z]{2}:\d+(,[a-z]{2}:\d+)*$", params.user_learning_languages
-    ):
-        raise ValidationError("Invalid user_learning_languages format. Expected: 'en:1,ru:2'")
+async def _generate_base_dictionary_entry(
+    params: BaseDictionaryParams, model: ModelType, usage: Optional[UsageTracker]
+) -> tuple[AiDictionaryEntry, ServedModel]:
+    """Generate the base entry together with the model that served it."""
+    term = _validate_base_params(params)
 
     try:
-        # Create LangChain client and chain
-        client = LLMClient(model)
         logger.info("=" * 80)
-        logger.info(f"Created LangChain client with model: {model.value}")
-        chain = create_base_dictionary_chain(model=client.model, params=params)
+        logger.info(f"Using LangChain client with model: {model.value}")
+        inputs = base_dictionary_inputs(
+            params.model_copy(update={"translating_term": term.surface})
+        )
 
-        # Execute chain and get result
-        result = await client.generate_with_parser_base(chain)
+        # The meaning count is only known afterwards, so the entry is one output unit
+        profile = OutputProfile(language=None, term_class=term_class(term.surface), units=1)
 
-        # Perform additional validation on the meanings
-        if not result.meanings:
-            _raise_no_meanings_error()
+        async def generate(client: LLMClient) -> AiDictionaryEntry:
+            chain = create_base_dictionary_chain(client.model)
+            return await client.generate_with_parser_base(chain, inputs, usage, profile)
+
+        # Execute chain on the routed shared client, hedged when the params ask for it
+        min_meanings = params.routing.min_meanings if params.routing else 1
+
+        async def generate_entry() -> tuple[AiDictionaryEntry, ServedModel]:
+            entry, served = await _call_routed(
+                "base",
+                term.surface,
+                model,
+                params.routing,
+                params.hedging,
+                generate,
+                lambda entry: (
+                    None
+                    if len(entry.meanings) >= min_meanings
+                    else f"{len(entry.meanings)} meanings"
+                ),
+                profile,
+                params.has_sibling_entry,
+            )
+            # Perform additional validation on the meanings, before the entry is cached
+            if not entry.meanings:
+                _raise_no_meanings_error()
+            return entry, served
+
+        result, served = await _cached_response(
+            "base",
+            model,
+            inputs,
+            AiDictionaryEntry,
+            generate_entry,
+            params.refresh_response_cache,
+        )
 
-        return _validate_and_fix_meaning_ids(result)
+        return _validate_and_fix_meaning_ids(result), served
 
     except (ValidationError, LLMAPIError):
         raise
-    except (AttributeError, TypeError, ValueError) as e:
+    except (AttributeError, TypeError, ValueError, LLMUnavailableError) as e:
         # Wrap LangChain exceptions in our custom exceptions
         _handle_llm_exception(e)
 
 
 async def generate_meaning_translations(
-    params: TranslationParams, model: ModelType
+    params: TranslationParams, model: ModelType, usage: Optional[UsageTracker] = None
 ) -> List[AiMeaningTranslation]:
     """
     Generate translations for all meanings in a dictionary entry (step 2 of workflow).
 
+    With `params.meanings_per_call` set, meanings are translated concurrently in groups
+    of that size and merged back in meaning order, in the same shape as a single call.
+
+    With `params.previous_translations` set, translations of meanings whose local id
+    and definition are unchanged are reused and only new or changed meanings are sent
+    to the model.
+
     Args:
         params: Parameters including base entry and target language
         model: LLM model to use
+        usage: Optional tracker to record token usage, cost and latency into
 
     Returns:
         List of MeaningTranslation objects for each meaning
@@ -103,44 +191,233 @@ async def generate_meaning_translations(
         ValidationError: If inputs are invalid
         LLMAPIError: If API call fails
     """
-    # Input validation
-    if not params.entry.meanings:
-        raise ValidationError("Dictionary entry must have at least one meaning")
+    translations, _ = await _generate_meaning_translations(params, model, usage)
+    return translations
 
-    # Validate translation_language (BCP 47 format)
-    if not re.match(r"^[a-z]{2}(-[A-Z]{2})?$", params.translation_language):
-        raise ValidationError(
-            "Invalid translation_language format. Expected BCP 47 (e.g., 'en', 'en-US')"
-        )
+
+async def _generate_meaning_translations(
+    params: TranslationParams, model: ModelType, usage: Optional[UsageTracker]
+) -> tuple[List[AiMeaningTranslation], ServedModel]:
+    """
+    Generate translations together with the model that served them.
+
+    Reused earlier translations count as the primary model's, since only those are
+    looked up; any generated ones are attributed to the model that served them.
+    """
+    _validate_translation_params(params)
+
+    # Reuse earlier translations of unchanged meanings and translate only the rest
+    reused, missing_params = _split_previous_translations(params)
+    if missing_params is None:
+        return reused, primary_served_model(model)
 
     try:
-        # Create LangChain client and chain
-        client = LLMClient(model)
         logger.info(f"Generating translations to {params.translation_language}")
-        chain = create_meaning_translations_chain(model=client.model, params=params)
 
-        # Execute chain and get result
-        result = await client.generate_with_parser_translations(chain)
+        # Each call's output grows with its meanings; with groups, the largest group's
+        expected = len(missing_params.entry.meanings)
+        profile = OutputProfile(
+            language=params.translation_language,
+            term_class=term_class(params.entry.headword),
+            units=min(expected, missing_params.meanings_per_call or expected),
+        )
+
+        # Execute chain and get result, fanning out per group of meanings when requested
+        async def translate(client: LLMClient) -> List[AiMeaningTranslation]:
+            chain = create_meaning_translations_chain(client.model)
+            if missing_params.meanings_per_call is None:
+                return await client.generate_with_parser_translations(
+                    chain, meaning_translations_inputs(missing_params), usage, profile
+                )
+            return await _generate_meaning_translations_in_groups(
+                client, chain, missing_params, missing_params.meanings_per_call, usage, profile
+            )
+
+        async def generate_translations() -> tuple[MeaningTranslationList, ServedModel]:
+            translations, served = await _call_routed(
+                "translations",
+                params.entry.headword,
+                model,
+                missing_params.routing,
+                missing_params.hedging,
+                translate,
+                lambda translations: (
+                    None
+                    if len(translations) == expected
+                    else f"{len(translations)} of {expected} translations"
+                ),
+                profile,
+            )
+            return MeaningTranslationList(translations=translations), served
+
+        # Grouped calls see a slice of the entry each, so the grouping is part of the key
+        inputs = {
+            **meaning_translations_inputs(missing_params),
+            "meanings_per_call": str(missing_params.meanings_per_call),
+        }
+        cached, served = await _cached_response(
+            "translations",
+            model,
+            inputs,
+            MeaningTranslationList,
+            generate_translations,
+            missing_params.refresh_response_cache,
+        )
+        result = cached.translations
 
         # Validate that we have translations for all meanings
-        if len(result) != len(params.entry.meanings):
-            logger.warning(f"Expected {len(params.entry.meanings)} translations, got {len(result)}")
+        if len(result) != expected:
+            logger.warning(f"Expected {expected} translations, got {len(result)}")
 
-        return result
+        return (_in_meaning_order(params.entry, reused + result) if reused else result), served
 
     except (ValidationError, LLMAPIError):
         raise
-    except (AttributeError, TypeError, ValueError) as e:
+    except (AttributeError, TypeError, ValueError, LLMUnavailableError) as e:
         # Wrap LangChain exceptions in our custom exceptions
         _handle_llm_exception(e)
 
 
+async def _generate_meaning_translations_in_groups(
+    client: LLMClient,
+    chain: Runnable[dict[str, str], MeaningTranslationList],
+    params: TranslationParams,
+    group_size: int,
+    usage: Optional[UsageTracker],
+    profile: OutputProfile,
+) -> List[AiMeaningTranslation]:
+    """Translate groups of meanings concurrently and merge them in meaning order."""
+    meanings = params.entry.meanings
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSLATION_CALLS)
+
+    async def translate_group(start: int) -> List[AiMeaningTranslation]:
+        group_entry = params.entry.model_copy(
+            update={"meanings": meanings[start : start + group_size]}
+        )
+        group_params = params.model_copy(update={"entry": group_entry})
+        group_profile = profile.model_copy(update={"units": len(group_entry.meanings)})
+        async with semaphore:
+            return await client.generate_with_parser_translations(
+                chain, meaning_translations_inputs(group_params), usage, group_profile
+            )
+
+    starts = range(0, len(meanings), group_size)
+    logger.info(f"Translating {len(meanings)} meanings in {len(starts)} concurrent calls")
+    groups = await _gather_or_cancel([translate_group(start) for start in starts])
+    return _in_meaning_order(params.entry, [t for group in groups for t in group])
+
+
+def _in_meaning_order(
+    entry: AiDictionaryEntry, translations: List[AiMeaningTranslation]
+) -> List[AiMeaningTranslation]:
+    """Sort translations by the position of their meaning in `entry`."""
+    order = {meaning.local_id: index for index, meaning in enumerate(entry.meanings)}
+    return sorted(translations, key=lambda t: order.get(t.meaning_local_id, len(order)))
+
+
+def _split_previous_translations(
+    params: TranslationParams,
+) -> tuple[List[AiMeaningTranslation], Optional[TranslationParams]]:
+    """
+    Split `params` into reusable earlier translations and the meanings left to translate.
+
+    A translation is reused when its meaning has the same local id and definition in
+    the earlier entry. Returns the reused translations and params narrowed to the
+    remaining meanings, or None when every meaning is covered.
+    """
+    previous = params.previous_translations
+    if previous is None:
+        return [], params
+
+    definitions = {meaning.local_id: meaning.definition for meaning in previous.entry.meanings}
+    earlier = {translation.meaning_local_id: translation for translation in previous.translations}
+    reused: List[AiMeaningTranslation] = []
+    missing: List[AiMeaning] = []
+    for meaning in params.entry.meanings:
+        translation = earlier.get(meaning.local_id)
+        if translation is not None and definitions.get(meaning.local_id) == meaning.definition:
+            reused.append(translation)
+        else:
+            missing.append(meaning)
+
+    logger.info(
+        f"Reusing {len(reused)} {params.translation_language} translations, "
+        + f"translating {len(missing)} new or changed meanings"
+    )
+    if not missing:
+        return reused, None
+    missing_entry = params.entry.model_copy(update={"meanings": missing})
+    return reused, params.model_copy(update={"entry": missing_entry, "previous_translations": None})
+
+
+async def _check_sibling_entry(
+    hooks: Optional[DictionaryWorkflowHooks], params: BaseDictionaryParams
+) -> BaseDictionaryParams:
+    """Ask the hooks whether the term has an entry for a sibling language, for routing."""
+    if params.routing is None or hooks is None or hooks.has_sibling_entry is None:
+        return params
+    return params.model_copy(update={"has_sibling_entry": await hooks.has_sibling_entry(params)})
+
+
+async def _resolve_cached_translations(
+    hooks: Optional[DictionaryWorkflowHooks], params: TranslationParams
+) -> tuple[Optional[List[AiMeaningTranslation]], TranslationParams]:
+    """
+    Look up translations for `params` through the workflow hooks.
+
+    Returns cached translations when they cover every meaning of the entry. Otherwise
+    returns params carrying whatever earlier translations can be reused: an incomplete
+    cached list, or the latest translations of the term made from an earlier entry.
+    """
+    if hooks is None:
+        return None, params
+
+    previous = None
+    cached = await hooks.retrieve_translations(params) if hooks.retrieve_translations else None
+    if cached:
+        if _translates_every_meaning(params.entry, cached):
+            logger.info(
+                f"Retrieved cached {len(cached)} {params.translation_language} translations"
+            )
+            return cached, params
+        previous = PreviousTranslations(entry=params.entry, translations=cached)
+    elif hooks.retrieve_previous_translations:
+        previous = await hooks.retrieve_previous_translations(params)
+
+    if previous is None:
+        return None, params
+    return None, params.model_copy(update={"previous_translations": previous})
+
+
+def _translates_every_meaning(
+    entry: AiDictionaryEntry, translations: List[AiMeaningTranslation]
+) -> bool:
+    """Whether `translations` cover every meaning of `entry`, so none need generating."""
+    translated = {translation.meaning_local_id for translation in translations}
+    return all(meaning.local_id in translated for meaning in entry.meanings)
+
+
 async def generate_dictionary_workflow(
     params: DictionaryEntryParams, model: ModelType, hooks: Optional[DictionaryWorkflowHooks] = None
 ) -> DictionaryWorkflowResult:
     """
     Complete dictionary generation workflow with base entry and translations.
 
+    The base entry is resolved once and then translated into `translation_language`
+    and every language in `translation_languages` concurrently.
+
+    With `params.pipeline_translations` set, the result is collected from
+    `generate_dictionary_workflow_stream` instead, which starts translating meanings
+    while the base entry is still being generated.
+
+    With `params.hedging` set, a base or translation call slower than usual for its
+    stage is raced against a duplicate call (see `hedging.hedged_call`). With
+    `meanings_per_translation_call` the fan-out of one language is hedged as a unit.
+    With `params.routing` set, calls about simple terms go to a fast model first and
+    are escalated to `model` when their output falls short (see `routing.route_call`).
+    With a response cache configured (see `cache.configure_response_cache`), identical
+    calls reuse earlier responses unless `params.refresh_response_cache` is set.
+
     Args:
         params: Complete parameters for dictionary generation
         model: LLM model to use
@@ -154,51 +431,594 @@ async def generate_dictionary_workflow(
     """
     logger.info("=" * 80)
     logger.info(f"Starting dictionary workflow for: {params.translating_term}")
+    started = time.perf_counter()
+    usage = UsageTracker()
+
+    if params.pipeline_translations:
+        async for event in generate_dictionary_workflow_stream(params, model, hooks):
+            if event.result:
+                return event.result
+        raise LLMAPIError("Dictionary workflow stream ended without a result")
 
     # Step 1: Generate base dictionary entry
     base_params = BaseDictionaryParams(
         translating_term=params.translating_term,
         user_learning_languages=params.user_learning_languages,
+        hedging=params.hedging,
+        refresh_response_cache=params.refresh_response_cache,
+        routing=params.routing,
     )
 
     logger.info("Step 1: Generating base dictionary entry...")
 
     # Check if we have a hook to retrieve cached base entry
     base_entry = None
+    base_served: Optional[ServedModel] = None
     if hooks and hooks.retrieve_base_entry:
         logger.info("Checking for cached base entry...")
         base_entry = await hooks.retrieve_base_entry(base_params)
         if base_entry:
             logger.info(f"Retrieved cached base entry with {len(base_entry.meanings)} meanings")
 
-    # Generate if not cached
+    # Generate if not cached, sharing the call with identical in-flight requests
     if not base_entry:
-        base_entry = await generate_base_dictionary_entry(base_params, model)
+        base_params = await _check_sibling_entry(hooks, base_params)
+        # Calls differing in any option, e.g. refresh_response_cache, are not shared
+        base_key = (
+            "base",
+            model.value,
+            normalize_term(base_params.translating_term).key,
+            base_params.model_dump_json(exclude={"translating_term"}),
+        )
+        base_entry, base_served = await single_flight(
+            base_key, lambda: _generate_base_dictionary_entry(base_params, model, usage)
+        )
         logger.info(f"Generated base entry with {len(base_entry.meanings)} meanings")
 
-    # Step 2: Generate translations
-    translation_params = TranslationParams(
-        entry=base_entry,
-        translation_language=params.translation_language,
-    )
+    # Step 2: Generate translations for every requested language concurrently
+    languages = list(dict.fromkeys([params.translation_language, *params.translation_languages]))
+    logger.info(f"Step 2: Generating translations to {', '.join(languages)}...")
 
-    logger.info("Step 2: Generating translations...")
+    async def translate(
+        translation_language: str,
+    ) -> tuple[List[AiMeaningTranslation], Optional[ServedModel]]:
+        translation_params = TranslationParams(
+            entry=base_entry,
+            translation_language=translation_language,
+            meanings_per_call=params.meanings_per_translation_call,
+            hedging=params.hedging,
+            refresh_response_cache=params.refresh_response_cache,
+            routing=params.routing,
+        )
+
+        # Check if we have a hook to retrieve cached or earlier translations
+        translations, translation_params = await _resolve_cached_translations(
+            hooks, translation_params
+        )
 
-    # Check if we have a hook to retrieve cached translations
-    translations = None
-    if hooks and hooks.retrieve_translations:
-        logger.info("Checking for cached translations...")
-        translations = await hooks.retrieve_translations(translation_params)
         if translations:
-            logger.info(f"Retrieved cached {len(translations)} translations")
+            return translations, None
 
-    # Generate if not cached
-    if not translations:
-        translations = await generate_meaning_translations(translation_params, model)
-        logger.info(f"Generated {len(translations)} translations")
+        # Generate if not cached, sharing the call with identical in-flight requests
+        translations_key = ("translations", model.value, translation_params.model_dump_json())
+        translations, served = await single_flight(
+            translations_key,
+            lambda: _generate_meaning_translations(translation_params, model, usage),
+        )
+        logger.info(f"Generated {len(translations)} {translation_language} translations")
+        return translations, served
+
+    results = await _gather_or_cancel([translate(language) for language in languages])
+    translations_by_language = {
+        language: translations for language, (translations, _) in zip(languages, results)
+    }
+    translations_served_by = {
+        language: served for language, (_, served) in zip(languages, results) if served
+    }
 
     logger.info("Dictionary workflow completed successfully")
-    return DictionaryWorkflowResult(entry=base_entry, translations=translations)
+    return DictionaryWorkflowResult(
+        entry=base_entry,
+        translations=translations_by_language[params.translation_language],
+        translations_by_language=translations_by_language,
+        metadata=_workflow_metadata(usage, started, base_served, translations_served_by),
+    )
+
+
+async def generate_dictionary_workflow_batch(
+    params: DictionaryBatchParams, model: ModelType, hooks: Optional[DictionaryBatchHooks] = None
+) -> AsyncIterator[DictionaryBatchItemResult]:
+    """
+    Dictionary workflow for a list of terms, yielding each term's result as it completes.
+
+    Terms are deduped by their normalized key and the cache is checked once for all of
+    them. Fully cached terms are yielded first; the rest run through
+    `generate_dictionary_workflow` with at most `params.max_concurrency` at a time,
+    reusing any cached base entry or translations. A failing term yields an error
+    result instead of stopping the batch.
+
+    Args:
+        params: Terms and shared parameters for dictionary generation
+        model: LLM model to use
+        hooks: Optional hooks to retrieve cached entries in bulk
+
+    Yields:
+        DictionaryBatchItemResult for every unique term, in completion order
+    """
+    unique_terms: dict[str, str] = {}
+    for term in params.translating_terms:
+        unique_terms.setdefault(normalize_term(term).key, term)
+    terms = list(unique_terms.values())
+    languages = list(dict.fromkeys([params.translation_language, *params.translation_languages]))
+    logger.info(f"Starting batch dictionary workflow for {len(terms)} unique terms")
+
+    cached_entries: dict[str, CachedDictionaryEntry] = {}
+    if hooks and hooks.retrieve_cached_entries:
+        cached_entries = await hooks.retrieve_cached_entries(terms)
+
+    misses: List[str] = []
+    for term in terms:
+        cached = cached_entries.get(term)
+        # Incomplete translations are completed by the workflow like in the single-term path
+        if cached and all(
+            _translates_every_meaning(cached.entry, cached.translations_by_language.get(lang, []))
+            for lang in languages
+        ):
+            translations_by_language = {
+                language: cached.translations_by_language[language] for language in languages
+            }
+            result = DictionaryWorkflowResult(
+                entry=cached.entry,
+                translations=translations_by_language[params.translation_language],
+                translations_by_language=translations_by_language,
+            )
+            yield DictionaryBatchItemResult(term=term, result=result, cached=True)
+        else:
+            misses.append(term)
+
+    logger.info(f"Batch cache hits: {len(terms) - len(misses)}, generating: {len(misses)}")
+    semaphore = asyncio.Semaphore(params.max_concurrency)
+
+    async def generate(term: str) -> DictionaryBatchItemResult:
+        term_params = DictionaryEntryParams(
+            translating_term=term,
+            user_learning_languages=params.user_learning_languages,
+            translation_language=params.translation_language,
+            translation_languages=params.translation_languages,
+            meanings_per_translation_call=params.meanings_per_translation_call,
+            hedging=params.hedging,
+            refresh_response_cache=params.refresh_response_cache,
+            routing=params.routing,
+        )
+        async with semaphore:
+            try:
+                result = await generate_dictionary_workflow(
+                    term_params, model, _cached_entry_hooks(cached_entries.get(term))
+                )
+            except Exception as e:
+                logger.exception(f"Batch dictionary workflow failed for: {term}")
+                return DictionaryBatchItemResult(term=term, error=str(e))
+        return DictionaryBatchItemResult(term=term, result=result)
+
+    tasks = [asyncio.ensure_future(generate(term)) for term in misses]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            yield await completed
+    finally:
+        # Stop pending generations if the consumer stops iterating early
+        for task in tasks:
+            task.cancel()
+
+
+def _cached_entry_hooks(
+    cached: Optional[CachedDictionaryEntry],
+) -> Optional[DictionaryWorkflowHooks]:
+    """Serve a partially cached term from the bulk lookup instead of querying again."""
+    if cached is None:
+        return None
+
+    async def retrieve_base_entry(_: BaseDictionaryParams) -> Optional[AiDictionaryEntry]:
+        return cached.entry
+
+    async def retrieve_translations(
+        translation_params: TranslationParams,
+    ) -> Optional[List[AiMeaningTranslation]]:
+        return cached.translations_by_language.get(translation_params.translation_language)
+
+    return DictionaryWorkflowHooks(
+        retrieve_base_entry=retrieve_base_entry, retrieve_translations=retrieve_translations
+    )
+
+
+async def generate_base_dictionary_entry_stream(
+    params: BaseDictionaryParams, model: ModelType, usage: Optional[UsageTracker] = None
+) -> AsyncIterator[DictionaryStreamEvent]:
+    """
+    Stream the base dictionary entry, yielding each meaning as soon as it is complete.
+
+    Meanings are yielded with the same `local_id` they have in the final entry, which
+    is yielded last as an "entry" event.
+
+    Args:
+        params: Parameters for base dictionary generation
+        model: LLM model to use
+        usage: Optional tracker to record token usage, cost and latency into
+
+    Yields:
+        "meaning" events followed by one "entry" event
+
+    Raises:
+        ValidationError: If inputs are invalid
+        LLMAPIError: If API call fails
+    """
+    async for event, _ in _stream_base_dictionary_entry(params, model, usage):
+        yield event
+
+
+async def _stream_base_dictionary_entry(
+    params: BaseDictionaryParams, model: ModelType, usage: Optional[UsageTracker]
+) -> AsyncIterator[tuple[DictionaryStreamEvent, dict[str, object]]]:
+    """Stream base entry events together with the partial output parsed so far."""
+    term = _validate_base_params(params)
+
+    try:
+        profile = OutputProfile(language=None, term_class=term_class(term.surface), units=1)
+        # Streams are not sized: output cut short could not be regenerated once yielded
+        client = get_llm_client(model, _client_settings("base", model, profile, sized=False))
+        logger.info(f"Streaming base dictionary entry with model: {model.value}")
+        inputs = base_dictionary_inputs(
+            params.model_copy(update={"translating_term": term.surface})
+        )
+
+        # The client streamed from, after any failover
+        served = client.served_model
+
+        def stream(client: LLMClient) -> AsyncIterator[dict[str, object]]:
+            nonlocal served
+            served = client.served_model
+            return client.stream_with_parser(
+                create_base_dictionary_stream_chain(client.model), inputs, "base", usage, profile
+            )
+
+        index = 0
+        output: dict[str, object] = {}
+        outputs = _stream_with_failover(client, stream)
+        async for items, output in _stream_completed_items(outputs, "meanings"):
+            for item in items:
+                index += 1
+                meaning = AiMeaning.model_validate(item)
+                meaning.local_id = f"{meaning.canonical_form}-{index}"
+                yield DictionaryStreamEvent(event="meaning", meaning=meaning), output
+
+        result = AiDictionaryEntry.model_validate(output)
+        if not result.meanings:
+            _raise_no_meanings_error()
+
+        entry = _validate_and_fix_meaning_ids(result)
+        yield DictionaryStreamEvent(event="entry", entry=entry, served_by=served), output
+
+    except (ValidationError, LLMAPIError):
+        raise
+    except (AttributeError, TypeError, ValueError, LLMUnavailableError) as e:
+        _handle_llm_exception(e)
+
+
+async def generate_meaning_translations_stream(
+    params: TranslationParams, model: ModelType, usage: Optional[UsageTracker] = None
+) -> AsyncIterator[DictionaryStreamEvent]:
+    """
+    Stream meaning translations, yielding each one as soon as it is complete.
+
+    All meanings are translated in one call; `params.meanings_per_call` is ignored
+    since the first translations arrive before the call finishes anyway. Translations
+    reused from `params.previous_translations` are yielded first.
+
+    Args:
+        params: Parameters including base entry and target language
+        model: LLM model to use
+        usage: Optional tracker to record token usage, cost and latency into
+
+    Yields:
+        "translation" events in the order the model produces them
+
+    Raises:
+        ValidationError: If inputs are invalid
+        LLMAPIError: If API call fails
+    """
+    _validate_translation_params(params)
+
+    reused, missing_params = _split_previous_translations(params)
+    for translation in reused:
+        yield DictionaryStreamEvent(
+            event="translation",
+            translation_language=params.translation_language,
+            translation=translation,
+        )
+    if missing_params is None:
+        return
+    params = missing_params
+
+    try:
+        profile = OutputProfile(
+            language=params.translation_language,
+            term_class=term_class(params.entry.headword),
+            units=len(params.entry.meanings),
+        )
+        client = get_llm_client(
+            model, _client_settings("translations", model, profile, sized=False)
+        )
+        logger.info(f"Streaming translations to {params.translation_language}")
+
+        count = 0
+        inputs = meaning_translations_inputs(params)
+        # The client streamed from, after any failover
+        served = client.served_model
+
+        def stream(client: LLMClient) -> AsyncIterator[dict[str, object]]:
+            nonlocal served
+            served = client.served_model
+            return client.stream_with_parser(
+                create_meaning_translations_stream_chain(client.model),
+                inputs,
+                "translations",
+                usage,
+                profile,
+            )
+
+        outputs = _stream_with_failover(client, stream)
+        async for items, _ in _stream_completed_items(outputs, "translations"):
+            for item in items:
+                count += 1
+                yield DictionaryStreamEvent(
+                    event="translation",
+                    translation_language=params.translation_language,
+                    translation=AiMeaningTranslation.model_validate(item),
+                    served_by=served,
+                )
+
+        if count != len(params.entry.meanings):
+            logger.warning(f"Expected {len(params.entry.meanings)} translations, got {count}")
+
+    except (ValidationError, LLMAPIError):
+        raise
+    except (AttributeError, TypeError, ValueError, LLMUnavailableError) as e:
+        _handle_llm_exception(e)
+
+
+async def generate_dictionary_workflow_stream(
+    params: DictionaryEntryParams, model: ModelType, hooks: Optional[DictionaryWorkflowHooks] = None
+) -> AsyncIterator[DictionaryStreamEvent]:
+    """
+    Streaming variant of `generate_dictionary_workflow`.
+
+    Yields every base meaning as soon as it is parsed, the complete entry, translations
+    for all requested languages as they arrive, and finally the same
+    DictionaryWorkflowResult the non-streaming workflow returns. Cached data from
+    `hooks` is yielded immediately.
+
+    A generated base entry is pipelined: each meaning is translated as soon as it is
+    complete, while the rest of the entry is still streaming, so latency approaches
+    the longer of the two steps rather than their sum. Models that do not stream
+    tool calls fall back to generating the entry first and translating it after.
+    Pipelined meanings are always translated afresh; earlier translations from
+    `hooks.retrieve_previous_translations` are only reused on the other paths.
+    Identical requests are not coalesced, since each caller consumes its own stream.
+    Streamed calls are neither hedged nor routed, since their output is yielded before
+    it could be checked; `params.hedging` and `params.routing` only apply off the
+    pipelined path and to the translation calls it makes.
+
+    Args:
+        params: Complete parameters for dictionary generation
+        model: LLM model to use
+        hooks: Optional hooks to retrieve cached base entry and translations
+
+    Yields:
+        "meaning", "entry", "translation" and finally one "result" event
+
+    Raises:
+        ValidationError: If inputs are invalid
+        LLMAPIError: If API call fails
+    """
+    started = time.perf_counter()
+    usage = UsageTracker()
+    logger.info(f"Starting streaming dictionary workflow for: {params.translating_term}")
+
+    base_params = BaseDictionaryParams(
+        translating_term=params.translating_term,
+        user_learning_languages=params.user_learning_languages,
+        hedging=params.hedging,
+        refresh_response_cache=params.refresh_response_cache,
+        routing=params.routing,
+    )
+    languages = list(dict.fromkeys([params.translation_language, *params.translation_languages]))
+    streaming = get_llm_client(model).supports_streaming_tool_calls
+
+    async def translate(
+        entry: AiDictionaryEntry, translation_language: str
+    ) -> AsyncIterator[DictionaryStreamEvent]:
+        translation_params = TranslationParams(
+            entry=entry,
+            translation_language=translation_language,
+            meanings_per_call=params.meanings_per_translation_call,
+            hedging=params.hedging,
+            refresh_response_cache=params.refresh_response_cache,
+            routing=params.routing,
+        )
+
+        translations, translation_params = await _resolve_cached_translations(
+            hooks, translation_params
+        )
+
+        served = None
+        if not translations:
+            if streaming:
+                async for event in generate_meaning_translations_stream(
+                    translation_params, model, usage
+                ):
+                    yield event
+                return
+            translations, served = await _generate_meaning_translations(
+                translation_params, model, usage
+            )
+
+        for translation in translations:
+            yield DictionaryStreamEvent(
+                event="translation",
+                translation_language=translation_language,
+                translation=translation,
+                served_by=served,
+            )
+
+    base_entry = None
+    if hooks and hooks.retrieve_base_entry:
+        base_entry = await hooks.retrieve_base_entry(base_params)
+
+    if base_entry:
+        logger.info(f"Retrieved cached base entry with {len(base_entry.meanings)} meanings")
+        events = _chain_streams(
+            _entry_events(base_entry),
+            _merge_streams([translate(base_entry, language) for language in languages]),
+        )
+    elif streaming:
+        events = _pipeline_dictionary_workflow(base_params, languages, model, usage)
+    else:
+        logger.info(f"{model.value} does not stream tool calls, translating after the entry")
+        base_params = await _check_sibling_entry(hooks, base_params)
+        base_entry, served = await _generate_base_dictionary_entry(base_params, model, usage)
+        events = _chain_streams(
+            _entry_events(base_entry, served),
+            _merge_streams([translate(base_entry, language) for language in languages]),
+        )
+
+    translations_by_language: dict[str, List[AiMeaningTranslation]] = {
+        language: [] for language in languages
+    }
+    base_served: Optional[ServedModel] = None
+    translations_served_by: dict[str, ServedModel] = {}
+    primary = primary_served_model(model)
+    first_meaning = True
+    async for event in events:
+        if event.meaning and first_meaning:
+            first_meaning = False
+            logger.info(f"Time to first meaning: {time.perf_counter() - started:.2f}s")
+        if event.entry:
+            base_entry = event.entry
+            base_served = event.served_by
+        if event.translation_language and event.translation:
+            language = event.translation_language
+            translations_by_language[language].append(event.translation)
+            # Pipelined calls may be served differently; any non-primary one marks the language
+            if event.served_by and translations_served_by.get(language, primary) == primary:
+                translations_served_by[language] = event.served_by
+        yield event
+
+    if base_entry is None:
+        raise LLMAPIError("Dictionary workflow stream ended without a base entry")
+
+    # Pipelined translations arrive in completion order; report them in meaning order
+    for language, translations in translations_by_language.items():
+        translations_by_language[language] = _in_meaning_order(base_entry, translations)
+
+    logger.info(f"Streaming dictionary workflow completed in {time.perf_counter() - started:.2f}s")
+    result = DictionaryWorkflowResult(
+        entry=base_entry,
+        translations=translations_by_language[params.translation_language],
+        translations_by_language=translations_by_language,
+        metadata=_workflow_metadata(usage, started, base_served, translations_served_by),
+    )
+    yield DictionaryStreamEvent(event="result", result=result)
+
+
+async def _pipeline_dictionary_workflow(
+    params: BaseDictionaryParams,
+    languages: Sequence[str],
+    model: ModelType,
+    usage: UsageTracker,
+) -> AsyncIterator[DictionaryStreamEvent]:
+    """Stream the base entry and translate each meaning as soon as it is complete."""
+    queue: asyncio.Queue[tuple[Optional[DictionaryStreamEvent], Optional[Exception]]] = (
+        asyncio.Queue()
+    )
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSLATION_CALLS * len(languages))
+    tasks: List[asyncio.Task[None]] = []
+
+    async def translate(entry: AiDictionaryEntry, translation_language: str) -> None:
+        translation_params = TranslationParams(
+            entry=entry,
+            translation_language=translation_language,
+            hedging=params.hedging,
+            refresh_response_cache=params.refresh_response_cache,
+            routing=params.routing,
+        )
+        async with semaphore:
+            translations, served = await _generate_meaning_translations(
+                translation_params, model, usage
+            )
+        for translation in translations:
+            queue.put_nowait(
+                (
+                    DictionaryStreamEvent(
+                        event="translation",
+                        translation_language=translation_language,
+                        translation=translation,
+                        served_by=served,
+                    ),
+                    None,
+                )
+            )
+
+    async def generate() -> None:
+        async for event, output in _stream_base_dictionary_entry(params, model, usage):
+            if event.meaning:
+                # Translate the meaning alone, with the entry fields parsed so far
+                meaning_entry = AiDictionaryEntry(
+                    headword=str(output.get("headword") or event.meaning.headword),
+                    source_language=str(output.get("source_language") or ""),
+                    meanings=[event.meaning],
+                )
+                tasks.extend(
+                    asyncio.ensure_future(translate(meaning_entry, language))
+                    for language in languages
+                )
+            queue.put_nowait((event, None))
+        await asyncio.gather(*tasks)
+
+    async def run() -> None:
+        try:
+            await generate()
+        except Exception as e:
+            queue.put_nowait((None, e))
+        else:
+            queue.put_nowait((None, None))
+
+    runner = asyncio.ensure_future(run())
+    try:
+        while True:
+            event, error = await queue.get()
+            if error is not None:
+                raise error
+            if event is None:
+                return
+            yield event
+    finally:
+        for task in [runner, *tasks]:
+            task.cancel()
+
+
+async def _entry_events(
+    entry: AiDictionaryEntry, served_by: Optional[ServedModel] = None
+) -> AsyncIterator[DictionaryStreamEvent]:
+    """Yield the events of an already complete base entry."""
+    for meaning in entry.meanings:
+        yield DictionaryStreamEvent(event="meaning", meaning=meaning)
+    yield DictionaryStreamEvent(event="entry", entry=entry, served_by=served_by)
+
+
+async def _chain_streams(*streams: AsyncIterator[T]) -> AsyncIterator[T]:
+    """Yield the items of each stream in turn."""
+    for stream in streams:
+        async for item in stream:
+            yield item
 
 
 # Legacy function for backward compatibility - wraps new workflow
@@ -228,11 +1048,123 @@ async def generate_dictionary_entry(
     base_params = BaseDictionaryParams(
         translating_term=params.translating_term,
         user_learning_languages=params.user_learning_languages,
+        hedging=params.hedging,
+        refresh_response_cache=params.refresh_response_cache,
+        routing=params.routing,
     )
 
     return await generate_base_dictionary_entry(base_params, model)
 
 
+def _workflow_metadata(
+    usage: UsageTracker,
+    started: float,
+    base_served: Optional[ServedModel],
+    translations_served_by: dict[str, ServedModel],
+) -> DictionaryWorkflowMetadata:
+    """Summarize the usage recorded for a workflow run and the models that served it."""
+    return DictionaryWorkflowMetadata(
+        usage=usage.usage,
+        estimated_cost_usd=total_cost(usage.usage),
+        wall_time_seconds=time.perf_counter() - started,
+        base_served_by=base_served,
+        translations_served_by=translations_served_by,
+    )
+
+
+async def _gather_or_cancel(calls: Sequence[Awaitable[T]]) -> List[T]:
+    """Await calls concurrently, cancelling the rest as soon as one of them fails."""
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def _stream_completed_items(
+    outputs: AsyncIterator[dict[str, object]], list_key: str
+) -> AsyncIterator[tuple[List[object], dict[str, object]]]:
+    """
+    Stream partial structured output, yielding newly completed `list_key` items.
+
+    A list item is complete once the model has started the next one; the remaining
+    items are yielded when the stream ends. Each yield carries the latest output, so
+    the last one is the complete output.
+    """
+    output: dict[str, object] = {}
+    completed = 0
+    async for output in outputs:
+        items = output.get(list_key)
+        if isinstance(items, list) and len(items) - 1 > completed:
+            items = cast(List[object], items)
+            yield items[completed:-1], output
+            completed = len(items) - 1
+
+    items = output.get(list_key)
+    yield (cast(List[object], items)[completed:] if isinstance(items, list) else []), output
+
+
+async def _merge_streams(streams: Sequence[AsyncIterator[T]]) -> AsyncIterator[T]:
+    """Interleave items from streams as they arrive, cancelling the rest if one fails."""
+    queue: asyncio.Queue[tuple[Optional[T], Optional[Exception]]] = asyncio.Queue()
+
+    async def drain(stream: AsyncIterator[T]) -> None:
+        try:
+            async for item in stream:
+                queue.put_nowait((item, None))
+        except Exception as e:
+            queue.put_nowait((None, e))
+        else:
+            queue.put_nowait((None, None))
+
+    tasks = [asyncio.ensure_future(drain(stream)) for stream in streams]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is None:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _validate_base_params(params: BaseDictionaryParams) -> NormalizedTerm:
+    """Validate base entry inputs and return the normalized term."""
+    # Input validation on the normalized term, so equivalent inputs behave the same
+    term = normalize_term(params.translating_term)
+    if not term.key:
+        raise ValidationError("Translating term cannot be empty")
+
+    if len(term.surface) > 100:
+        raise ValidationError("Translating term too long (max 100 characters)")
+
+    # Validate user_learning_languages format (e.g., "en:1,ru:2")
+    if params.user_learning_languages and not re.match(
+        r"^[a-z]{2}:\d+(,[a-z]{2}:\d+)*$", params.user_learning_languages
+    ):
+        raise ValidationError("Invalid user_learning_languages format. Expected: 'en:1,ru:2'")
+    return term
+
+
+def _validate_translation_params(params: TranslationParams) -> None:
+    """Validate translation inputs."""
+    if not params.entry.meanings:
+        raise ValidationError("Dictionary entry must have at least one meaning")
+
+    # Validate translation_language (BCP 47 format)
+    if not re.match(r"^[a-z]{2}(-[A-Z]{2})?$", params.translation_language):
+        raise ValidationError(
+            "Invalid translation_language format. Expected BCP 47 (e.g., 'en', 'en-US')"
+        )
+
+
 def _raise_no_meanings_error() -> None:
     """Raise validation error for empty meanings."""
     raise ValidationError("Generated dictionary entry has no meanings")
@@ -248,9 +1180,227 @@ def _validate_and_fix_meaning_ids(result: AiDictionaryEntry) -> AiDictionaryEntr
     return result
 
 
+async def _cached_response(
+    stage: UsageStage,
+    model: ModelType,
+    inputs: dict[str, str],
+    schema: type[ResponseT],
+    generate: Callable[[], Awaitable[tuple[ResponseT, ServedModel]]],
+    refresh: bool = False,
+) -> tuple[ResponseT, ServedModel]:
+    """
+    Return the cached response for the call's content hash, or `generate` and store it.
+
+    Responses are keyed by the model and thinking mode of the requested model's default
+    client, or the fake model serving it, and only responses that client served are
+    stored: output of a fast route, hedge model or failover model is never reused as
+    the requested model's. With `refresh`, or when a cached response no longer parses,
+    the response is regenerated and replaces the cached one. Streams are not cached: a
+    hit would have nothing to stream.
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return await generate()
+    primary = primary_served_model(model)
+    key = response_cache_key(stage, primary, inputs, schema)
+    cached = None if refresh else await cache.get(key)
+    if cached is not None:
+        try:
+            result = schema.model_validate_json(cached)
+        except ValueError as e:
+            logger.warning(f"Discarding unparsable cached {stage} response: {e}")
+        else:
+            logger.info(f"💾 {stage} response served from the LLM response cache")
+            return result, primary
+    result, served = await generate()
+    if served == primary:
+        await cache.set(key, result.model_dump_json())
+    return result, served
+
+
+async def _call_with_failover(
+    client: LLMClient, call: Callable[[LLMClient], Awaitable[T]]
+) -> tuple[T, ServedModel]:
+    """
+    Run `call` on `client`, or on its failover client if the model is unavailable.
+
+    Returns the result with the model of the client that produced it.
+    """
+    try:
+        return await call(client), client.served_model
+    except LLMUnavailableError as e:
+        failover = client.failover_client()
+        if failover is None:
+            raise
+        _log_failover(client, failover, e)
+        return await call(failover), failover.served_model
+
+
+async def _call_routed(
+    stage: UsageStage,
+    term: str,
+    model: ModelType,
+    routing: Optional[RoutingPolicy],
+    hedging: Optional[HedgingPolicy],
+    call: Callable[[LLMClient], Awaitable[T]],
+    shortfall: Callable[[T], Optional[str]],
+    profile: OutputProfile,
+    has_sibling_entry: bool = False,
+) -> tuple[T, ServedModel]:
+    """
+    Run `call` on the route a routing policy picks for `term`, or on `model` without one.
+
+    Output of the fast route that fails validation, or for which `shortfall` names a
+    problem, is regenerated by `model` and the term is remembered as escalated.
+    Returns the result with the model that served it.
+    """
+    if routing is None:
+        return await _call_hedged(stage, model, hedging, call, profile)
+    normalized = normalize_term(term)
+    route = route_call(stage, normalized, model, routing, has_sibling_entry)
+    logger.info(f"🧭 {stage} routed to {route.model.value} ({route.kind}: {route.reason})")
+    if route.kind == "heavy":
+        return await _call_hedged(stage, model, hedging, call, profile)
+
+    try:
+        result, served = await _call_hedged(
+            stage, route.model, hedging, call, profile, route.thinking_budget_tokens
+        )
+    except ValueError as e:
+        # Output parsers raise ValueError subclasses for output not matching the schema
+        problem = f"invalid output ({e})"
+    else:
+        problem = shortfall(result)
+        if problem is None:
+            return result, served
+    record_escalation(stage, normalized)
+    logger.warning(f"⤴️ Escalating {stage} of {normalized.surface!r} to {model.value}: {problem}")
+    return await _call_hedged(stage, model, hedging, call, profile)
+
+
+async def _call_hedged(
+    stage: UsageStage,
+    model: ModelType,
+    hedging: Optional[HedgingPolicy],
+    call: Callable[[LLMClient], Awaitable[T]],
+    profile: OutputProfile,
+    thinking_budget_tokens: Optional[int] = None,
+) -> tuple[T, ServedModel]:
+    """
+    Run `call` with failover, hedged with a duplicate call when a policy is given.
+
+    Returns the result with the model of whichever call produced it.
+    """
+
+    def sized_call(model: ModelType) -> Awaitable[tuple[T, ServedModel]]:
+        return _call_sized(stage, model, call, profile, thinking_budget_tokens)
+
+    if hedging is None:
+        return await sized_call(model)
+    hedge_model = hedging.hedge_model or model
+    return await hedged_call(
+        stage, model.value, hedging, lambda: sized_call(model), lambda: sized_call(hedge_model)
+    )
+
+
+async def _call_sized(
+    stage: UsageStage,
+    model: ModelType,
+    call: Callable[[LLMClient], Awaitable[T]],
+    profile: OutputProfile,
+    thinking_budget_tokens: Optional[int],
+) -> tuple[T, ServedModel]:
+    """
+    Run `call` with failover on a client whose output limits are sized for `profile`.
+
+    Output the sized limits cut short, stopping at max_tokens or failing to parse, is
+    regenerated once at the model's default limits.
+    """
+    settings = _client_settings(stage, model, profile, thinking_budget_tokens)
+    default_settings = _client_settings(stage, model, profile, thinking_budget_tokens, sized=False)
+    if settings == default_settings:
+        return await _call_with_failover(get_llm_client(model, settings), call)
+    try:
+        return await _call_with_failover(get_llm_client(model, settings), call)
+    except ValueError as e:
+        # Output parsers raise ValueError subclasses for output not matching the schema
+        budget_tokens = (settings or default_llm_client_settings()).thinking_budget_tokens
+        record_budget_fallback(stage, model, thinks(model, budget_tokens), profile)
+        logger.warning(
+            f"✂️ {stage} output of {model.value} cut short by its sized budget ({e}), "
+            + "retrying at the default limits"
+        )
+    return await _call_with_failover(get_llm_client(model, default_settings), call)
+
+
+def _client_settings(
+    stage: UsageStage,
+    model: ModelType,
+    profile: OutputProfile,
+    thinking_budget_tokens: Optional[int] = None,
+    sized: bool = True,
+) -> Optional[LLMClientSettings]:
+    """
+    Settings variant of a call: its route's thinking budget and, unless `sized` is
+    off, output limits sized from earlier calls with the same profile, or None for
+    the shared default client.
+    """
+    defaults = default_llm_client_settings()
+    if thinking_budget_tokens is None:
+        thinking_budget_tokens = defaults.thinking_budget_tokens
+    budget = (
+        size_token_budget(
+            stage,
+            model,
+            profile,
+            thinks(model, thinking_budget_tokens),
+            defaults.max_tokens or default_max_tokens(model),
+            thinking_budget_tokens or DEFAULT_THINKING_BUDGET_TOKENS,
+        )
+        if sized
+        else None
+    )
+    if budget is not None:
+        return defaults.model_copy(
+            update={
+                "max_tokens": budget.max_tokens,
+                "thinking_budget_tokens": budget.thinking_budget_tokens or thinking_budget_tokens,
+            }
+        )
+    if thinking_budget_tokens != defaults.thinking_budget_tokens:
+        return defaults.model_copy(update={"thinking_budget_tokens": thinking_budget_tokens})
+    return None
+
+
+async def _stream_with_failover(
+    client: LLMClient, stream: Callable[[LLMClient], AsyncIterator[T]]
+) -> AsyncIterator[T]:
+    """Stream from `client`, failing over only while nothing has been yielded yet."""
+    started = False
+    try:
+        async for item in stream(client):
+            started = True
+            yield item
+    except LLMUnavailableError as e:
+        failover = client.failover_client()
+        if started or failover is None:
+            raise
+        _log_failover(client, failover, e)
+        async for item in stream(failover):
+            yield item
+
+
+def _log_failover(client: LLMClient, failover: LLMClient, error: LLMUnavailableError) -> None:
+    record_failover()
+    logger.warning(
+        f"{client.model_type.value} unavailable ({error}), "
+        + f"failing over to {failover.model_type.value}"
+    )
+
+
 def _handle_llm_exception(e: Exception) -> NoReturn:
     """Handle and wrap LLM exceptions."""
-    if "API" in str(e) or "timeout" in str(e).lower():
+    if isinstance(e, LLMUnavailableError) or "API" in str(e) or "timeout" in str(e).lower():
         api_error_msg = f"LLM API call failed: {e}"
         raise LLMAPIError(api_error_msg) from e
 
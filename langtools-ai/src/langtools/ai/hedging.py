@@ -0,0 +1,157 @@
+"""
+Hedged LLM calls: duplicate a slow call and keep whichever finishes first.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import List, TypeVar
+
+from pydantic import BaseModel, Field
+
+from .models import HedgingPolicy, UsageStage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Recent call latencies kept per stage and model to estimate the hedge delay
+LATENCY_WINDOW = 200
+# Calls observed before the percentile replaces the policy's initial delay
+MIN_LATENCY_SAMPLES = 20
+# Unused hedge budget saved up for bursts of slow calls
+MAX_SAVED_HEDGES = 5.0
+
+
+class StageHedgingMetrics(BaseModel):
+    """Hedging of one stage and model in the current process."""
+
+    stage: UsageStage
+    model: str
+    calls: int = Field(description="Calls made under a hedging policy")
+    hedges: int = Field(description="Duplicate calls fired after the hedge delay")
+    hedge_wins: int = Field(description="Hedges that finished before the original call")
+    budget_exhausted: int = Field(description="Slow calls not hedged for lack of budget")
+    hedge_delay_seconds: float = Field(description="Hedge delay of the latest call")
+
+
+class _StageState:
+    """Latency window, hedge budget and counters of one stage and model."""
+
+    def __init__(self) -> None:
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.budget = 0.0
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+        self.last_delay = 0.0
+
+    def delay(self, policy: HedgingPolicy) -> float:
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return policy.initial_delay_seconds
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(policy.latency_percentile * len(ordered)))
+        return max(policy.min_delay_seconds, ordered[index])
+
+
+_lock = threading.Lock()
+_states: dict[tuple[UsageStage, str], _StageState] = {}
+
+
+def _state(stage: UsageStage, model: str) -> _StageState:
+    with _lock:
+        state = _states.get((stage, model))
+        if state is None:
+            state = _StageState()
+            _states[(stage, model)] = state
+        return state
+
+
+async def hedged_call(
+    stage: UsageStage,
+    model: str,
+    policy: HedgingPolicy,
+    call: Callable[[], Awaitable[T]],
+    hedge: Callable[[], Awaitable[T]],
+) -> T:
+    """
+    Run `call`, racing it against `hedge` once it is slower than usual.
+
+    The hedge fires when `call` has not finished within the policy's latency
+    percentile of recent calls for the stage and model. The first successful result
+    wins and the other call is cancelled; if both fail, the original error is raised.
+    Every call adds `policy.max_hedge_ratio[stage]` to the stage's hedge budget and
+    each hedge spends one, so hedges stay below that share of calls.
+
+    Args:
+        stage: Workflow stage the call belongs to
+        model: Model of `call`, keying latency statistics
+        policy: Hedge delay percentile, budget and alternate model
+        call: Factory of the original call
+        hedge: Factory of the duplicate call
+
+    Returns:
+        Result of whichever call succeeded first
+    """
+    state = _state(stage, model)
+    with _lock:
+        state.calls += 1
+        state.budget = min(MAX_SAVED_HEDGES, state.budget + policy.max_hedge_ratio.get(stage, 0))
+        delay = state.last_delay = state.delay(policy)
+
+    started = time.perf_counter()
+    original = asyncio.ensure_future(call())
+    tasks = [original]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            with _lock:
+                hedge_allowed = state.budget >= 1
+                if hedge_allowed:
+                    state.budget -= 1
+                    state.hedges += 1
+                else:
+                    state.budget_exhausted += 1
+            if hedge_allowed:
+                logger.info(f"⏱️ {stage} call slower than {delay:.2f}s, firing hedge")
+                tasks.append(asyncio.ensure_future(hedge()))
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                with _lock:
+                    state.latencies.append(time.perf_counter() - started)
+                    if task is not original:
+                        state.hedge_wins += 1
+                return task.result()
+        return original.result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def get_hedging_metrics() -> List[StageHedgingMetrics]:
+    """Return hedging counters and current hedge delays per stage and model."""
+    with _lock:
+        return [
+            StageHedgingMetrics(
+                stage=stage,
+                model=model,
+                calls=state.calls,
+                hedges=state.hedges,
+                hedge_wins=state.hedge_wins,
+                budget_exhausted=state.budget_exhausted,
+                hedge_delay_seconds=state.last_delay,
+            )
+            for (stage, model), state in _states.items()
+        ]
@@ -5,7 +5,7 @@ Data models and types for AI functions.
 from __future__ import annotations
 
 from enum import Enum
-from typing import Awaitable, Callable, List, Optional
+from typing import Awaitable, Callable, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -20,6 +20,8 @@ class ModelType(Enum):
     GTP5_MINI = "gpt-5-mini"
     CLAUDE_SONNET_3_5 = "claude-3-5-haiku-latest"
     CLAUDE_SONNET_4 = "claude-sonnet-4-0"
+    # Offline fake chat model for load and regression testing (see `langtools.ai.fake`)
+    FAKE = "fake"
 
 
 class DictionaryEntryParams(BaseModel):
@@ -40,6 +42,29 @@ class DictionaryEntryParams(BaseModel):
     translation_language: str = Field(
         description="Target language for translations in BCP 47 format"
     )
+    translation_languages: List[str] = Field(
+        default_factory=list,
+        description="Further target languages translated concurrently in the same run",
+    )
+    meanings_per_translation_call: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Translate meanings concurrently in groups of this size (one call if unset)",
+    )
+    pipeline_translations: bool = Field(
+        default=False,
+        description="Translate each meaning as soon as it is generated instead of after the entry",
+    )
+    hedging: Optional[HedgingPolicy] = Field(
+        default=None, description="Hedge slow LLM calls; streamed calls are not hedged"
+    )
+    routing: Optional[RoutingPolicy] = Field(
+        default=None, description="Route simple terms to a fast model, escalating on bad output"
+    )
+    refresh_response_cache: bool = Field(
+        default=False,
+        description="Call the model instead of reusing cached responses, caching the new ones",
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -121,6 +146,23 @@ class BaseDictionaryParams(BaseModel):
             "can have the same priority."
         )
     )
+    hedging: Optional[HedgingPolicy] = Field(
+        default=None, description="Hedge slow LLM calls; streamed calls are not hedged"
+    )
+    routing: Optional[RoutingPolicy] = Field(
+        default=None, description="Route simple terms to a fast model, escalating on bad output"
+    )
+    refresh_response_cache: bool = Field(
+        default=False,
+        description="Call the model instead of reusing cached responses, caching the new ones",
+    )
+    has_sibling_entry: bool = Field(
+        default=False,
+        description=(
+            "Whether an entry for the term was generated before for another language, model "
+            "or prompt version, a sign that the fast model suffices"
+        ),
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -139,6 +181,25 @@ class TranslationParams(BaseModel):
     translation_language: str = Field(
         description="Target language for translations in BCP 47 format"
     )
+    meanings_per_call: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Translate meanings concurrently in groups of this size (one call if unset)",
+    )
+    previous_translations: Optional[PreviousTranslations] = Field(
+        default=None,
+        description="Earlier translations reused for meanings with unchanged id and definition",
+    )
+    hedging: Optional[HedgingPolicy] = Field(
+        default=None, description="Hedge slow LLM calls; streamed calls are not hedged"
+    )
+    routing: Optional[RoutingPolicy] = Field(
+        default=None, description="Route simple terms to a fast model, escalating on bad output"
+    )
+    refresh_response_cache: bool = Field(
+        default=False,
+        description="Call the model instead of reusing cached responses, caching the new ones",
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -149,17 +210,146 @@ class TranslationParams(BaseModel):
     }
 
 
+class PreviousTranslations(BaseModel):
+    """Earlier translations together with the base entry they were made from."""
+
+    entry: AiDictionaryEntry = Field(description="Base entry the translations were made from")
+    translations: List[AiMeaningTranslation] = Field(description="Earlier meaning translations")
+
+
 class MeaningTranslationList(BaseModel):
     """Wrapper for list of meaning translations to work with LangChain structured output."""
 
     translations: List[AiMeaningTranslation] = Field(description="List of meaning translations")
 
 
+UsageStage = Literal["base", "translations"]
+
+
+class HedgingPolicy(BaseModel):
+    """Duplicate LLM calls that are slower than usual and keep the first result."""
+
+    latency_percentile: float = Field(
+        default=0.95,
+        gt=0,
+        lt=1,
+        description="Recent call latency percentile after which a duplicate call is fired",
+    )
+    initial_delay_seconds: float = Field(
+        default=60, ge=0, description="Hedge delay until enough call latencies were observed"
+    )
+    min_delay_seconds: float = Field(default=1, ge=0, description="Lower bound of the hedge delay")
+    hedge_model: Optional[ModelType] = Field(
+        default=None, description="Model of the duplicate call (the same model if unset)"
+    )
+    max_hedge_ratio: dict[UsageStage, float] = Field(
+        default_factory=lambda: {"base": 0.1, "translations": 0.1},
+        description="Maximum share of a stage's calls that may be hedged; 0 disables the stage",
+    )
+
+
+class RoutingPolicy(BaseModel):
+    """
+    Serve simple terms from a fast model and escalate to the requested model.
+
+    A term takes the fast route when it is short, or when an entry for it already
+    exists for a sibling language, unless the fast route failed it before. Output of
+    the fast route that fails validation or has too few meanings is regenerated by
+    the requested model with its own thinking budget.
+    """
+
+    fast_model: Optional[ModelType] = Field(
+        default=None, description="Model of the fast route (the requested model if unset)"
+    )
+    fast_thinking_budget_tokens: int = Field(
+        default=0, ge=0, description="Thinking budget of the fast route; 0 disables thinking"
+    )
+    max_fast_term_chars: int = Field(
+        default=24, ge=0, description="Longest term, in characters, taking the fast route"
+    )
+    max_fast_term_words: int = Field(
+        default=2, ge=0, description="Most words of a term taking the fast route"
+    )
+    min_meanings: int = Field(
+        default=1, ge=1, description="Fewest meanings of a fast entry before it is escalated"
+    )
+    max_fast_failures: int = Field(
+        default=1,
+        ge=1,
+        description="Escalations of a term after which it skips the fast route",
+    )
+
+
+class StageUsage(BaseModel):
+    """Token usage, wall time and estimated cost of the LLM calls of one stage and model."""
+
+    stage: UsageStage = Field(description="Workflow stage the calls belong to")
+    model: str = Field(description="Model the calls were made with")
+    calls: int = Field(default=0, description="Number of LLM calls")
+    input_tokens: int = Field(default=0, description="Input tokens, including cached ones")
+    output_tokens: int = Field(default=0, description="Output tokens, including thinking")
+    thinking_tokens: int = Field(
+        default=0, description="Reasoning tokens, where the provider reports them separately"
+    )
+    cache_read_tokens: int = Field(default=0, description="Input tokens read from prompt cache")
+    cache_creation_tokens: int = Field(
+        default=0, description="Input tokens written to prompt cache"
+    )
+    wall_time_seconds: float = Field(default=0, description="Summed duration of the calls")
+    estimated_cost_usd: float = Field(default=0, description="Estimated cost by list prices")
+
+
+class ServedModel(BaseModel):
+    """Model and thinking mode that actually produced generated output."""
+
+    model: ModelType = Field(description="Model that answered; FAKE for the offline fake model")
+    thinking: bool = Field(default=False, description="Whether the call used extended thinking")
+
+    @property
+    def label(self) -> str:
+        """
+        Name to store the output under: the model's name, marked when a model that
+        thinks by default (Claude Sonnet 4, see `client.thinks`) answered without it.
+        """
+        if self.model == ModelType.CLAUDE_SONNET_4 and not self.thinking:
+            return f"{self.model.value}:no-thinking"
+        return self.model.value
+
+
+class DictionaryWorkflowMetadata(BaseModel):
+    """Accounting of the LLM calls made for a workflow result."""
+
+    usage: List[StageUsage] = Field(
+        default_factory=list,
+        description="Usage per stage and model; empty when everything came from cache",
+    )
+    estimated_cost_usd: float = Field(default=0, description="Estimated cost of all calls")
+    wall_time_seconds: float = Field(default=0, description="Duration of the whole workflow")
+    base_served_by: Optional[ServedModel] = Field(
+        default=None,
+        description="Model that generated the base entry; unset when it came from cache",
+    )
+    translations_served_by: dict[str, ServedModel] = Field(
+        default_factory=dict,
+        description="Model that generated each language's translations, for generated ones",
+    )
+
+
 class DictionaryWorkflowResult(BaseModel):
     """Complete result from dictionary workflow with base entry and translations."""
 
     entry: AiDictionaryEntry = Field(description="Base dictionary entry")
-    translations: List[AiMeaningTranslation] = Field(description="Translations for all meanings")
+    translations: List[AiMeaningTranslation] = Field(
+        description="Translations for all meanings into `translation_language`"
+    )
+    translations_by_language: dict[str, List[AiMeaningTranslation]] = Field(
+        default_factory=dict,
+        description="Translations for all meanings keyed by every requested language",
+    )
+    metadata: DictionaryWorkflowMetadata = Field(
+        default_factory=DictionaryWorkflowMetadata,
+        description="Token, cost and latency accounting of the LLM calls made",
+    )
 
 
 class DictionaryWorkflowHooks(BaseModel):
@@ -171,11 +361,121 @@ class DictionaryWorkflowHooks(BaseModel):
     retrieve_translations: Optional[
         Callable[[TranslationParams], Awaitable[Optional[List[AiMeaningTranslation]]]]
     ] = Field(default=None, description="Hook to retrieve cached translations")
+    retrieve_previous_translations: Optional[
+        Callable[[TranslationParams], Awaitable[Optional[PreviousTranslations]]]
+    ] = Field(
+        default=None,
+        description="Hook to retrieve earlier translations of the term to update incrementally",
+    )
+    has_sibling_entry: Optional[Callable[[BaseDictionaryParams], Awaitable[bool]]] = Field(
+        default=None,
+        description="Hook telling whether an entry for the term exists for another language",
+    )
 
     class Config:
         arbitrary_types_allowed = True
 
 
+class DictionaryBatchParams(BaseModel):
+    """Input parameters for generating dictionary entries for a list of terms."""
+
+    translating_terms: List[str] = Field(
+        description="Words or phrases to define and translate; equivalent spellings are deduped",
+        min_length=1,
+    )
+    user_learning_languages: str = Field(
+        description="User's language preferences in format 'en:1,ru:2'"
+    )
+    translation_language: str = Field(
+        description="Target language for translations in BCP 47 format"
+    )
+    translation_languages: List[str] = Field(
+        default_factory=list,
+        description="Further target languages translated concurrently in the same run",
+    )
+    meanings_per_translation_call: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Translate meanings concurrently in groups of this size (one call if unset)",
+    )
+    max_concurrency: int = Field(
+        default=4, ge=1, description="Maximum number of terms generated at the same time"
+    )
+    hedging: Optional[HedgingPolicy] = Field(
+        default=None, description="Hedge slow LLM calls; streamed calls are not hedged"
+    )
+    routing: Optional[RoutingPolicy] = Field(
+        default=None, description="Route simple terms to a fast model, escalating on bad output"
+    )
+    refresh_response_cache: bool = Field(
+        default=False,
+        description="Call the model instead of reusing cached responses, caching the new ones",
+    )
+
+
+class CachedDictionaryEntry(BaseModel):
+    """Previously generated base entry with its stored translations."""
+
+    entry: AiDictionaryEntry = Field(description="Cached base dictionary entry")
+    translations_by_language: dict[str, List[AiMeaningTranslation]] = Field(
+        default_factory=dict, description="Cached translations keyed by language"
+    )
+
+
+class DictionaryBatchHooks(BaseModel):
+    """Optional hooks for the batch workflow to retrieve cached data in bulk."""
+
+    retrieve_cached_entries: Optional[
+        Callable[[List[str]], Awaitable[dict[str, CachedDictionaryEntry]]]
+    ] = Field(
+        default=None,
+        description="Hook to retrieve cached entries for all terms at once, keyed by term",
+    )
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class DictionaryBatchItemResult(BaseModel):
+    """Outcome of the batch workflow for a single term."""
+
+    term: str = Field(description="Term as requested")
+    result: Optional[DictionaryWorkflowResult] = Field(
+        default=None, description="Workflow result, unless generation failed"
+    )
+    cached: bool = Field(
+        default=False, description="Whether the result was served from cache without LLM calls"
+    )
+    error: Optional[str] = Field(default=None, description="Error message if generation failed")
+
+
+class DictionaryStreamEvent(BaseModel):
+    """Incremental event from the streaming dictionary workflow."""
+
+    event: Literal["meaning", "entry", "translation", "result"] = Field(
+        description="Kind of event; only the matching payload field is set"
+    )
+    meaning: Optional[AiMeaning] = Field(
+        default=None, description="Base entry meaning, emitted as soon as it is complete"
+    )
+    entry: Optional[AiDictionaryEntry] = Field(
+        default=None, description="Complete base dictionary entry"
+    )
+    translation_language: Optional[str] = Field(
+        default=None, description="Target language of `translation`"
+    )
+    translation: Optional[AiMeaningTranslation] = Field(
+        default=None, description="Meaning translation, emitted as soon as it is complete"
+    )
+    served_by: Optional[ServedModel] = Field(
+        default=None,
+        description="Model that generated `entry` or `translation`; unset for cached data",
+    )
+    result: Optional[DictionaryWorkflowResult] = Field(
+        default=None, description="Complete workflow result, emitted last"
+    )
+
+
 class AiDictionaryEntry(BaseModel):
     """Complete dictionary entry with multiple meanings and metadata."""
 
@@ -0,0 +1,34 @@
+"""
+Term normalization for cache lookups.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+from pydantic import BaseModel, Field
+
+# Combining stress marks left after NFC composition (e.g. Russian "сыро́й")
+_STRESS_MARKS = re.compile("[\\u0300\\u0301]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class NormalizedTerm(BaseModel):
+    """A term in its user-facing form together with its canonical lookup key."""
+
+    surface: str = Field(description="Original term in NFC with collapsed whitespace")
+    key: str = Field(description="Canonical key: case-folded, without stress marks and ё")
+
+
+def normalize_term(term: str) -> NormalizedTerm:
+    """
+    Normalize a term so equivalent spellings resolve to the same lookup key.
+
+    Only stress marks without a precomposed form are dropped, so accented letters
+    that change meaning (e.g. French "é") are preserved.
+    """
+    surface = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", term)).strip()
+    key = unicodedata.normalize("NFC", surface.casefold())
+    key = _STRESS_MARKS.sub("", key).replace("ё", "е")
+    return NormalizedTerm(surface=surface, key=key)
@@ -4,12 +4,17 @@ Prompt templates for AI functions using LangChain.
 
 from __future__ import annotations
 
+import hashlib
 import json
-from typing import cast
+from typing import TypeVar, cast
 
+from langchain_anthropic import ChatAnthropic
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel
 
 from .models import (
     AiDictionaryEntry,
@@ -17,8 +22,12 @@ from .models import (
     DictionaryEntryParams,
     MeaningTranslationList,
     TranslationParams,
+    UsageStage,
 )
 
+# Bump when the base dictionary prompt or schema changes, so cached entries are not reused
+BASE_DICTIONARY_PROMPT_VERSION = "1"
+
 
 def create_dictionary_entry_chain(
     model: BaseChatModel, params: DictionaryEntryParams
@@ -82,33 +91,7 @@ Think deeply about the best structure of meanings.
     return cast(Runnable[dict[str, str], AiDictionaryEntry], prompt | model_with_structured_output)
 
 
-def create_base_dictionary_chain(
-    model: BaseChatModel, params: BaseDictionaryParams
-) -> Runnable[dict[str, str], AiDictionaryEntry]:
-    """Create a LangChain chain for base dictionary entry generation (step 1 of workflow)."""
-
-    # Create parameter definitions
-    parameter_definitions = [
-        {
-            "name": "translatingTerm",
-            "description": "The word or phrase to define",
-            "value": params.translating_term,
-        },
-        {
-            "name": "userLearningLanguages",
-            "description": (
-                "User's language preferences in format 'lang:priority' "
-                "to guide source language detection"
-            ),
-            "value": params.user_learning_languages,
-        },
-    ]
-
-    prompt_template = ChatPromptTemplate.from_messages(  # type: ignore[misc]
-        [
-            (
-                "system",
-                """
+_BASE_DICTIONARY_SYSTEM_PROMPT = """
 You are a computational linguist and lexicographer tasked with generating a comprehensive \
 dictionary entry in the original language only. All fields including classification categories \
 should be in original language.\
@@ -123,48 +106,9 @@ Focus on:
 - Detailed definitions, pronunciations, morphology, etymology
 - Example sentences in the original language
 - Synonyms, antonyms, collocations in the original language
-                """.strip(),
-            ),
-            ("user", "{parameters_json}"),
-        ]
-    )
-
-    # Partial the prompt template with our values first
-    parameters_json = json.dumps(parameter_definitions, indent=2, ensure_ascii=False)
+""".strip()
 
-    prompt = prompt_template.partial(parameters_json=parameters_json)
-
-    model_with_structured_output = model.with_structured_output(  # type: ignore[misc]
-        schema=AiDictionaryEntry, method="function_calling"
-    )
-
-    return cast(Runnable[dict[str, str], AiDictionaryEntry], prompt | model_with_structured_output)
-
-
-def create_meaning_translations_chain(
-    model: BaseChatModel, params: TranslationParams
-) -> Runnable[dict[str, str], MeaningTranslationList]:
-    """Create a LangChain chain for meaning translations generation (step 2 of workflow)."""
-
-    # Create parameter definitions
-    parameter_definitions = [
-        {
-            "name": "dictionaryEntry",
-            "description": "Base dictionary entry with meanings to translate",
-            "value": params.entry.model_dump(),
-        },
-        {
-            "name": "translationLanguage",
-            "description": "Target language for translations in BCP 47 format",
-            "value": params.translation_language,
-        },
-    ]
-
-    prompt_template = ChatPromptTemplate.from_messages(  # type: ignore[misc]
-        [
-            (
-                "system",
-                """
+_MEANING_TRANSLATIONS_SYSTEM_PROMPT = """
 You are a computational linguist and lexicographer tasked with translating a dictionary entry from
 a language foreign to the user.
 
@@ -182,21 +126,199 @@ dictionary entry. For each meaning, provide:
 All the related data should be about the original word in original language, not about translations.
 Ensure translations are contextually appropriate and consider register, formality, and usage \
 patterns in the target language.
-                """.strip(),
-            ),
-            ("user", "{parameters_json}"),
-        ]
+""".strip()
+
+
+def _static_prefix_prompt(system_prompt: str, cache_control: bool) -> ChatPromptTemplate:
+    """
+    Build a prompt whose static system prompt precedes the per-call parameters.
+
+    Providers cache the longest repeated request prefix (tool schema, then system
+    prompt), so nothing call-specific may come before the user message. OpenAI caches
+    such prefixes automatically; Anthropic needs a `cache_control` breakpoint, which
+    also covers the tool schema sent ahead of the system prompt.
+    """
+    if not cache_control:
+        return ChatPromptTemplate.from_messages(  # type: ignore[misc]
+            [("system", system_prompt), ("user", "{parameters_json}")]
+        )
+    system_message = SystemMessage(
+        content=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+    )
+    return ChatPromptTemplate.from_messages(  # type: ignore[misc]
+        [system_message, ("user", "{parameters_json}")]
     )
 
-    # Partial the prompt template with our values first
-    parameters_json = json.dumps(parameter_definitions, indent=2, ensure_ascii=False)
 
-    prompt = prompt_template.partial(parameters_json=parameters_json)
+# Prompt templates, compiled once at import; only `parameters_json` varies per call
+_BASE_DICTIONARY_PROMPT = _static_prefix_prompt(_BASE_DICTIONARY_SYSTEM_PROMPT, False)
+_BASE_DICTIONARY_CACHED_PROMPT = _static_prefix_prompt(_BASE_DICTIONARY_SYSTEM_PROMPT, True)
+_MEANING_TRANSLATIONS_PROMPT = _static_prefix_prompt(_MEANING_TRANSLATIONS_SYSTEM_PROMPT, False)
+_MEANING_TRANSLATIONS_CACHED_PROMPT = _static_prefix_prompt(
+    _MEANING_TRANSLATIONS_SYSTEM_PROMPT, True
+)
 
-    model_with_structured_output = model.with_structured_output(  # type: ignore[misc]
-        schema=MeaningTranslationList, method="function_calling"
-    )
 
+def prompt_template_version(stage: UsageStage) -> str:
+    """Fingerprint of a stage's prompt template, changing whenever the template is edited."""
+    system_prompt = (
+        f"{BASE_DICTIONARY_PROMPT_VERSION}:{_BASE_DICTIONARY_SYSTEM_PROMPT}"
+        if stage == "base"
+        else _MEANING_TRANSLATIONS_SYSTEM_PROMPT
+    )
+    return hashlib.sha256(system_prompt.encode()).hexdigest()[:16]
+
+
+def _prompt_for(
+    model: BaseChatModel, prompt: ChatPromptTemplate, cached_prompt: ChatPromptTemplate
+) -> ChatPromptTemplate:
+    """Pick the prompt with an explicit cache breakpoint for Anthropic models."""
+    return cached_prompt if isinstance(model, ChatAnthropic) else prompt
+
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# Structured-output chains keyed by (model instance id, prompt id, schema, partial); the model is
+# kept alongside the chain so a reused id of a collected model is never mistaken for a cache hit
+_structured_chains: dict[
+    tuple[int, int, type[BaseModel], bool],
+    tuple[BaseChatModel, Runnable[dict[str, str], object]],
+] = {}
+
+
+def _cached_chain(
+    model: BaseChatModel, prompt: ChatPromptTemplate, schema: type[BaseModel], partial: bool
+) -> Runnable[dict[str, str], object]:
+    """Return the cached `prompt | model.with_structured_output(...)` chain."""
+    key = (id(model), id(prompt), schema, partial)
+    cached = _structured_chains.get(key)
+    if cached is None or cached[0] is not model:
+        # A plain tool definition makes the output parser stream partial dicts instead of
+        # waiting for a complete pydantic object
+        output_schema = convert_to_openai_tool(schema) if partial else schema
+        model_with_structured_output = model.with_structured_output(  # type: ignore[misc]
+            schema=output_schema, method="function_calling"
+        )
+        chain = cast(Runnable[dict[str, str], object], prompt | model_with_structured_output)
+        cached = (model, chain)
+        _structured_chains[key] = cached
+    return cached[1]
+
+
+def _structured_chain(
+    model: BaseChatModel, prompt: ChatPromptTemplate, schema: type[SchemaT]
+) -> Runnable[dict[str, str], SchemaT]:
+    return cast(Runnable[dict[str, str], SchemaT], _cached_chain(model, prompt, schema, False))
+
+
+def _partial_structured_chain(
+    model: BaseChatModel, prompt: ChatPromptTemplate, schema: type[BaseModel]
+) -> Runnable[dict[str, str], dict[str, object]]:
     return cast(
-        Runnable[dict[str, str], MeaningTranslationList], prompt | model_with_structured_output
+        Runnable[dict[str, str], dict[str, object]], _cached_chain(model, prompt, schema, True)
+    )
+
+
+def create_base_dictionary_chain(
+    model: BaseChatModel,
+) -> Runnable[dict[str, str], AiDictionaryEntry]:
+    """Return the cached chain for base dictionary entry generation (step 1 of workflow)."""
+    prompt = _prompt_for(model, _BASE_DICTIONARY_PROMPT, _BASE_DICTIONARY_CACHED_PROMPT)
+    return _structured_chain(model, prompt, AiDictionaryEntry)
+
+
+def create_base_dictionary_stream_chain(
+    model: BaseChatModel,
+) -> Runnable[dict[str, str], dict[str, object]]:
+    """Return the cached base dictionary chain whose `astream` yields partial entry dicts."""
+    prompt = _prompt_for(model, _BASE_DICTIONARY_PROMPT, _BASE_DICTIONARY_CACHED_PROMPT)
+    return _partial_structured_chain(model, prompt, AiDictionaryEntry)
+
+
+def base_dictionary_inputs(params: BaseDictionaryParams) -> dict[str, str]:
+    """Build the per-call inputs of the base dictionary chain."""
+    parameter_definitions = [
+        {
+            "name": "translatingTerm",
+            "description": "The word or phrase to define",
+            "value": params.translating_term,
+        },
+        {
+            "name": "userLearningLanguages",
+            "description": (
+                "User's language preferences in format 'lang:priority' "
+                "to guide source language detection"
+            ),
+            "value": params.user_learning_languages,
+        },
+    ]
+    return {"parameters_json": json.dumps(parameter_definitions, indent=2, ensure_ascii=False)}
+
+
+def create_meaning_translations_chain(
+    model: BaseChatModel,
+) -> Runnable[dict[str, str], MeaningTranslationList]:
+    """Return the cached chain for meaning translations generation (step 2 of workflow)."""
+    prompt = _prompt_for(model, _MEANING_TRANSLATIONS_PROMPT, _MEANING_TRANSLATIONS_CACHED_PROMPT)
+    return _structured_chain(model, prompt, MeaningTranslationList)
+
+
+def create_meaning_translations_stream_chain(
+    model: BaseChatModel,
+) -> Runnable[dict[str, str], dict[str, object]]:
+    """Return the cached translations chain whose `astream` yields partial translation dicts."""
+    prompt = _prompt_for(model, _MEANING_TRANSLATIONS_PROMPT, _MEANING_TRANSLATIONS_CACHED_PROMPT)
+    return _partial_structured_chain(model, prompt, MeaningTranslationList)
+
+
+# Meaning fields the translation step works from or translates; the rest of the base entry
+# (alternate spellings, mnemonics, pronunciation variants, ...) would only add input tokens
+_TRANSLATION_MEANING_FIELDS = {
+    "local_id",
+    "headword",
+    "canonical_form",
+    "definition",
+    "part_of_speech",
+    "pronunciation",
+    "morphology",
+    "register",
+    "frequency",
+    "etymology",
+    "difficulty_level",
+    "learning_priority",
+    "example_sentences",
+    "collocations",
+}
+
+
+def translation_entry_projection(entry: AiDictionaryEntry) -> dict[str, object]:
+    """Project a base entry onto the fields the meaning translations prompt needs."""
+    return entry.model_dump(
+        include={
+            "headword": True,
+            "source_language": True,
+            "meanings": {"__all__": _TRANSLATION_MEANING_FIELDS},
+        },
+        exclude_none=True,
     )
+
+
+def meaning_translations_inputs(params: TranslationParams) -> dict[str, str]:
+    """Build the per-call inputs of the meaning translations chain as compact JSON."""
+    parameter_definitions = [
+        {
+            "name": "dictionaryEntry",
+            "description": "Base dictionary entry with meanings to translate",
+            "value": translation_entry_projection(params.entry),
+        },
+        {
+            "name": "translationLanguage",
+            "description": "Target language for translations in BCP 47 format",
+            "value": params.translation_language,
+        },
+    ]
+    return {
+        "parameters_json": json.dumps(
+            parameter_definitions, ensure_ascii=False, separators=(",", ":")
+        )
+    }
@@ -0,0 +1,189 @@
+"""
+Retries with jittered backoff and per-provider circuit breakers for LLM calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import List, Literal, Optional
+
+import anthropic
+import httpx
+import openai
+from pydantic import BaseModel, Field
+
+from .fake import FakeLLMError
+
+logger = logging.getLogger(__name__)
+
+# Consecutive transient failures that open a provider's circuit
+CIRCUIT_FAILURE_THRESHOLD = 5
+# Seconds an open circuit fails fast before letting a probe call through
+CIRCUIT_RESET_SECONDS = 30.0
+
+# Rate limits, overload (Anthropic 529) and server errors are worth retrying
+_TRANSIENT_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class LLMUnavailableError(Exception):
+    """Raised when a provider keeps failing transiently or its circuit is open."""
+
+
+class CircuitBreakerMetrics(BaseModel):
+    """State and transition counts of one provider's circuit breaker."""
+
+    provider: str
+    state: CircuitState
+    consecutive_failures: int
+    opened: int = Field(description="Transitions to open")
+    half_opened: int = Field(description="Transitions to half-open, i.e. probe calls")
+    closed: int = Field(description="Transitions back to closed after a successful probe")
+    rejected_calls: int = Field(description="Calls failed fast while the circuit was open")
+
+
+class LLMResilienceMetrics(BaseModel):
+    """Retries, failovers and circuit breakers of the current process."""
+
+    retries: int = Field(description="Attempts repeated after a transient failure")
+    failovers: int = Field(description="Calls served by the failover model")
+    circuit_breakers: List[CircuitBreakerMetrics]
+
+
+class CircuitBreaker:
+    """
+    Fails calls to a provider fast after repeated transient failures.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive failures the circuit opens and calls
+    are rejected for CIRCUIT_RESET_SECONDS. Then one probe call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, provider: str) -> None:
+        self.provider = provider
+        self._lock = threading.Lock()
+        self._state: CircuitState = "closed"
+        self._consecutive_failures = 0
+        self._changed_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._transitions: dict[CircuitState, int] = {"closed": 0, "open": 0, "half_open": 0}
+        self._rejected_calls = 0
+
+    def before_call(self) -> None:
+        """Reserve a call, raising LLMUnavailableError while the circuit is open."""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == "open" and now - self._changed_at >= CIRCUIT_RESET_SECONDS:
+                self._transition("half_open", now)
+            if self._state == "closed":
+                return
+            # Half-open lets one probe through; a probe that never reported is replaced
+            probe_stale = (
+                self._probe_started is None or now - self._probe_started >= CIRCUIT_RESET_SECONDS
+            )
+            if self._state == "half_open" and probe_stale:
+                self._probe_started = now
+                return
+            self._rejected_calls += 1
+        raise LLMUnavailableError(f"Circuit for {self.provider} is {self._state}, failing fast")
+
+    def record_success(self) -> None:
+        """Record a call that reached the provider, closing a half-open circuit."""
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._state != "closed":
+                self._transition("closed", time.monotonic())
+
+    def record_failure(self) -> None:
+        """Record a transient failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == "half_open" or (
+                self._state == "closed" and self._consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD
+            ):
+                self._transition("open", time.monotonic())
+
+    def metrics(self) -> CircuitBreakerMetrics:
+        with self._lock:
+            return CircuitBreakerMetrics(
+                provider=self.provider,
+                state=self._state,
+                consecutive_failures=self._consecutive_failures,
+                opened=self._transitions["open"],
+                half_opened=self._transitions["half_open"],
+                closed=self._transitions["closed"],
+                rejected_calls=self._rejected_calls,
+            )
+
+    def _transition(self, state: CircuitState, now: float) -> None:
+        logger.warning(f"Circuit for {self.provider}: {self._state} -> {state}")
+        self._state = state
+        self._changed_at = now
+        self._probe_started = None
+        self._transitions[state] += 1
+
+
+_registry_lock = threading.Lock()
+_breakers: dict[str, CircuitBreaker] = {}
+_retries = 0
+_failovers = 0
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker of a provider, creating it once."""
+    with _registry_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(provider)
+            _breakers[provider] = breaker
+        return breaker
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether an LLM call failed for a reason a later attempt may not hit."""
+    if isinstance(
+        error,
+        (
+            TimeoutError,
+            asyncio.TimeoutError,
+            httpx.TransportError,
+            anthropic.APIConnectionError,
+            openai.APIConnectionError,
+            FakeLLMError,
+        ),
+    ):
+        return True
+    if isinstance(error, (anthropic.APIStatusError, openai.APIStatusError)):
+        return error.status_code in _TRANSIENT_STATUS_CODES
+    return False
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff before retrying after `attempt` failed attempts."""
+    return random.uniform(0, min(max_delay, base_delay * 2.0 ** (attempt - 1)))
+
+
+def record_retry() -> None:
+    global _retries
+    _retries += 1
+
+
+def record_failover() -> None:
+    global _failovers
+    _failovers += 1
+
+
+def get_llm_resilience_metrics() -> LLMResilienceMetrics:
+    """Return retries, failovers and circuit breaker states of this process so far."""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return LLMResilienceMetrics(
+        retries=_retries,
+        failovers=_failovers,
+        circuit_breakers=[breaker.metrics() for breaker in breakers],
+    )
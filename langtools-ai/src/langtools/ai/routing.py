@@ -0,0 +1,125 @@
+"""
+Routing of LLM calls between a fast and the requested model by term complexity.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from .models import ModelType, RoutingPolicy, UsageStage
+from .normalization import NormalizedTerm
+
+logger = logging.getLogger(__name__)
+
+# Terms whose escalations are remembered; the least recently escalated are forgotten
+MAX_REMEMBERED_TERMS = 10_000
+
+RouteKind = Literal["fast", "heavy"]
+
+
+class ModelRoute(BaseModel):
+    """Model and thinking budget chosen for one call."""
+
+    kind: RouteKind
+    model: ModelType
+    thinking_budget_tokens: Optional[int] = Field(
+        description="Thinking budget of the call (the model default if unset)"
+    )
+    reason: str = Field(description="Signal that decided the route")
+
+
+class StageRoutingMetrics(BaseModel):
+    """Routing decisions of one stage in the current process."""
+
+    stage: UsageStage
+    fast_calls: int = Field(description="Calls routed to the fast model")
+    heavy_calls: int = Field(description="Calls routed straight to the requested model")
+    escalations: int = Field(description="Fast outputs regenerated by the requested model")
+
+
+_lock = threading.Lock()
+# Escalations per term key, most recently escalated last
+_escalated_terms: OrderedDict[str, int] = OrderedDict()
+_metrics: dict[UsageStage, StageRoutingMetrics] = {}
+
+
+def _stage_metrics(stage: UsageStage) -> StageRoutingMetrics:
+    metrics = _metrics.get(stage)
+    if metrics is None:
+        metrics = StageRoutingMetrics(stage=stage, fast_calls=0, heavy_calls=0, escalations=0)
+        _metrics[stage] = metrics
+    return metrics
+
+
+def route_call(
+    stage: UsageStage,
+    term: NormalizedTerm,
+    model: ModelType,
+    policy: RoutingPolicy,
+    has_sibling_entry: bool = False,
+) -> ModelRoute:
+    """
+    Choose the fast route or the requested model for a call about `term`.
+
+    Terms the fast route failed `policy.max_fast_failures` times go to the requested
+    model. Otherwise a term takes the fast route if an entry for it exists for a
+    sibling language or if it is short in characters and words.
+
+    Args:
+        stage: Workflow stage of the call
+        term: Normalized term the call is about
+        model: Requested model, used for the heavy route
+        policy: Routing thresholds and the fast model
+        has_sibling_entry: Whether an entry for the term exists for another language
+
+    Returns:
+        ModelRoute of the call
+    """
+    words = len(term.surface.split())
+    with _lock:
+        failures = _escalated_terms.get(term.key, 0)
+        if failures >= policy.max_fast_failures:
+            kind, reason = "heavy", f"escalated {failures} times before"
+        elif has_sibling_entry:
+            kind, reason = "fast", "entry exists for a sibling language"
+        elif (
+            len(term.surface) <= policy.max_fast_term_chars and words <= policy.max_fast_term_words
+        ):
+            kind, reason = "fast", f"short term ({len(term.surface)} chars, {words} words)"
+        else:
+            kind, reason = "heavy", f"long term ({len(term.surface)} chars, {words} words)"
+        metrics = _stage_metrics(stage)
+        if kind == "fast":
+            metrics.fast_calls += 1
+        else:
+            metrics.heavy_calls += 1
+
+    if kind == "heavy":
+        return ModelRoute(kind=kind, model=model, thinking_budget_tokens=None, reason=reason)
+    return ModelRoute(
+        kind=kind,
+        model=policy.fast_model or model,
+        thinking_budget_tokens=policy.fast_thinking_budget_tokens,
+        reason=reason,
+    )
+
+
+def record_escalation(stage: UsageStage, term: NormalizedTerm) -> None:
+    """Remember that the fast route's output for `term` had to be regenerated."""
+    with _lock:
+        _escalated_terms[term.key] = _escalated_terms.get(term.key, 0) + 1
+        _escalated_terms.move_to_end(term.key)
+        if len(_escalated_terms) > MAX_REMEMBERED_TERMS:
+            _ = _escalated_terms.popitem(last=False)
+        _stage_metrics(stage).escalations += 1
+
+
+def get_routing_metrics() -> List[StageRoutingMetrics]:
+    """Return fast, heavy and escalated calls per stage of this process so far."""
+    with _lock:
+        return [metrics.model_copy() for metrics in _metrics.values()]
@@ -0,0 +1,82 @@
+"""
+Single-flight coalescing of identical in-flight LLM generations.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar, cast
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlightMetrics(BaseModel):
+    """Snapshot of single-flight coalescing for the current process."""
+
+    in_flight: int
+    coalesced_requests: int
+
+
+class _Flight:
+    """A shared generation task and the number of callers awaiting it."""
+
+    def __init__(self, task: asyncio.Task[object]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+_flights: dict[Hashable, _Flight] = {}
+_coalesced_requests = 0
+
+
+async def single_flight(key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+    """
+    Run `call` once for all concurrent callers sharing `key`.
+
+    The first caller starts the call in a shared task; callers arriving while it is
+    running await the same task instead of starting another one. Errors propagate to
+    every waiter and the key is released, so the next caller retries. A cancelled
+    caller only stops waiting; the shared task is cancelled once no callers remain.
+
+    Args:
+        key: Identity of the generation, e.g. stage, model and normalized inputs
+        call: Factory for the awaitable to run when no identical call is in flight
+
+    Returns:
+        Result of the shared call
+    """
+    global _coalesced_requests
+
+    flight = _flights.get(key)
+    if flight is None or flight.task.get_loop() is not asyncio.get_running_loop():
+        flight = _Flight(asyncio.ensure_future(call()))
+        _flights[key] = flight
+        flight.task.add_done_callback(lambda _: _release(key, flight))
+    else:
+        _coalesced_requests += 1
+        logger.info(f"Coalesced request into in-flight generation: {key!r:.120}")
+
+    flight.waiters += 1
+    try:
+        return cast(T, await asyncio.shield(flight.task))
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            flight.task.cancel()
+
+
+def _release(key: Hashable, flight: _Flight) -> None:
+    """Forget a finished flight unless a newer one already took its key."""
+    if _flights.get(key) is flight:
+        del _flights[key]
+
+
+def get_single_flight_metrics() -> SingleFlightMetrics:
+    """Return the number of in-flight generations and coalesced requests so far."""
+    return SingleFlightMetrics(in_flight=len(_flights), coalesced_requests=_coalesced_requests)
@@ -0,0 +1,130 @@
+"""
+Token, cost and latency accounting for LLM calls.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import List, Optional
+
+from langchain_core.messages.ai import UsageMetadata
+from pydantic import BaseModel, Field
+
+from .models import ModelType, StageUsage, UsageStage
+
+
+class ModelPricing(BaseModel):
+    """List prices of a model in USD per million tokens."""
+
+    input: float
+    output: float
+    cache_read: float
+    cache_write: float
+
+
+# Public list prices; OpenAI caches prompts automatically without a write surcharge
+_MODEL_PRICING: dict[ModelType, ModelPricing] = {
+    ModelType.GPT4: ModelPricing(input=30, output=60, cache_read=30, cache_write=30),
+    ModelType.GPT3_5: ModelPricing(input=0.5, output=1.5, cache_read=0.5, cache_write=0.5),
+    ModelType.GTP4_1_MINI: ModelPricing(input=0.4, output=1.6, cache_read=0.1, cache_write=0.4),
+    ModelType.GTP4_O_MINI: ModelPricing(input=0.15, output=0.6, cache_read=0.075, cache_write=0.15),
+    ModelType.GTP5_MINI: ModelPricing(input=0.25, output=2, cache_read=0.025, cache_write=0.25),
+    ModelType.CLAUDE_SONNET_3_5: ModelPricing(input=0.8, output=4, cache_read=0.08, cache_write=1),
+    ModelType.CLAUDE_SONNET_4: ModelPricing(input=3, output=15, cache_read=0.3, cache_write=3.75),
+}
+
+
+class LLMUsageMetrics(BaseModel):
+    """Usage of all LLM calls made by the current process."""
+
+    usage: List[StageUsage] = Field(description="Usage per stage and model")
+    estimated_cost_usd: float = Field(description="Estimated cost of all calls")
+
+
+class UsageTracker:
+    """Collects usage of the LLM calls made on behalf of one workflow run."""
+
+    def __init__(self) -> None:
+        self._totals: dict[tuple[UsageStage, str], StageUsage] = {}
+
+    @property
+    def usage(self) -> List[StageUsage]:
+        """Usage per stage and model recorded so far."""
+        return list(self._totals.values())
+
+    def record(self, usage: StageUsage) -> None:
+        """Add the usage of finished calls."""
+        _accumulate(self._totals, usage)
+
+
+_process_totals: dict[tuple[UsageStage, str], StageUsage] = {}
+
+
+def stage_usage(
+    stage: UsageStage,
+    model_type: ModelType,
+    usage_by_model: Mapping[str, UsageMetadata],
+    wall_time_seconds: float,
+) -> StageUsage:
+    """
+    Build the usage of one LLM call from the usage metadata LangChain collected.
+
+    Input tokens include cache reads and writes. Thinking is part of the output tokens;
+    it is broken out only where the provider reports reasoning tokens separately.
+    """
+    usage = StageUsage(
+        stage=stage, model=model_type.value, calls=1, wall_time_seconds=wall_time_seconds
+    )
+    for metadata in usage_by_model.values():
+        input_details = metadata.get("input_token_details", {})
+        output_details = metadata.get("output_token_details", {})
+        usage.input_tokens += metadata["input_tokens"]
+        usage.output_tokens += metadata["output_tokens"]
+        usage.thinking_tokens += output_details.get("reasoning", 0)
+        usage.cache_read_tokens += input_details.get("cache_read", 0)
+        usage.cache_creation_tokens += input_details.get("cache_creation", 0)
+
+    pricing = _MODEL_PRICING.get(model_type)
+    if pricing is not None:
+        uncached_input = usage.input_tokens - usage.cache_read_tokens - usage.cache_creation_tokens
+        usage.estimated_cost_usd = (
+            uncached_input * pricing.input
+            + usage.cache_read_tokens * pricing.cache_read
+            + usage.cache_creation_tokens * pricing.cache_write
+            + usage.output_tokens * pricing.output
+        ) / 1_000_000
+    return usage
+
+
+def record_usage(usage: StageUsage, tracker: Optional[UsageTracker] = None) -> None:
+    """Add the usage of finished calls to the process metrics and an optional tracker."""
+    _accumulate(_process_totals, usage)
+    if tracker is not None:
+        tracker.record(usage)
+
+
+def total_cost(usage: Iterable[StageUsage]) -> float:
+    """Sum the estimated cost of usage entries."""
+    return sum(entry.estimated_cost_usd for entry in usage)
+
+
+def get_llm_usage_metrics() -> LLMUsageMetrics:
+    """Return the usage of all LLM calls made by this process so far."""
+    usage = list(_process_totals.values())
+    return LLMUsageMetrics(usage=usage, estimated_cost_usd=total_cost(usage))
+
+
+def _accumulate(totals: dict[tuple[UsageStage, str], StageUsage], usage: StageUsage) -> None:
+    key = (usage.stage, usage.model)
+    total = totals.get(key)
+    if total is None:
+        totals[key] = usage.model_copy()
+        return
+    total.calls += usage.calls
+    total.input_tokens += usage.input_tokens
+    total.output_tokens += usage.output_tokens
+    total.thinking_tokens += usage.thinking_tokens
+    total.cache_read_tokens += usage.cache_read_tokens
+    total.cache_creation_tokens += usage.cache_creation_tokens
+    total.wall_time_seconds += usage.wall_time_seconds
+    total.estimated_cost_usd += usage.estimated_cost_usd
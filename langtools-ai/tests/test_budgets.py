@@ -0,0 +1,217 @@
+"""
+Tests for token budget sizing.
+"""
+
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from langtools.ai.budgets import (
+    MIN_BUDGET_SAMPLES,
+    OutputProfile,
+    configure_token_budget_sizing,
+    get_token_budget_metrics,
+    record_output_usage,
+    size_token_budget,
+    term_class,
+)
+from langtools.ai.client import (
+    LLMClientSettings,
+    OutputTruncatedError,
+    configure_fake_llm,
+)
+from langtools.ai.fake import FakeLLMSettings
+from langtools.ai.functions import generate_base_dictionary_entry
+from langtools.ai.models import (
+    AiDictionaryEntry,
+    AiMeaning,
+    BaseDictionaryParams,
+    ModelType,
+    ServedModel,
+    StageUsage,
+)
+
+_PROFILE = OutputProfile(language="de", term_class="word", units=1)
+
+
+@pytest.fixture(autouse=True)
+def _token_budget_sizing() -> Iterator[None]:
+    """Sizing is off unless the application opts in, so these tests turn it on."""
+    configure_token_budget_sizing(True)
+    yield
+    configure_token_budget_sizing(False)
+
+
+def _record(
+    model: ModelType,
+    output_tokens: int,
+    units: int = 1,
+    thinks: bool = False,
+    thinking_tokens: int = 0,
+) -> None:
+    usage = StageUsage(
+        stage="translations",
+        model=model.value,
+        output_tokens=output_tokens,
+        thinking_tokens=thinking_tokens,
+    )
+    record_output_usage(model, thinks, _PROFILE.model_copy(update={"units": units}), usage)
+
+
+class TestSizeTokenBudget:
+    """Test cases for size_token_budget function."""
+
+    def test_defaults_until_enough_samples(self) -> None:
+        """Test that calls keep the model defaults until enough calls were observed."""
+        for _ in range(MIN_BUDGET_SAMPLES - 1):
+            _record(ModelType.GPT4, 500)
+
+        assert size_token_budget("translations", ModelType.GPT4, _PROFILE, False, 64000, 0) is None
+
+    def test_budget_scales_with_units_from_per_unit_output(self) -> None:
+        """Test that output per meaning is learned and scaled to the call's meanings."""
+        for _ in range(MIN_BUDGET_SAMPLES):
+            _record(ModelType.GPT3_5, 3000, units=3)
+
+        budget = size_token_budget(
+            "translations",
+            ModelType.GPT3_5,
+            _PROFILE.model_copy(update={"units": 6}),
+            False,
+            64000,
+            0,
+        )
+
+        # 1000 tokens per meaning for 6 meanings with headroom, rounded to a power of two
+        assert budget is not None
+        assert (budget.max_tokens, budget.thinking_budget_tokens) == (16384, None)
+
+    def test_thinking_budget_leaves_room_for_the_answer(self) -> None:
+        """Test that a thinking model gets a thinking budget below its max_tokens."""
+        for _ in range(MIN_BUDGET_SAMPLES):
+            _record(ModelType.CLAUDE_SONNET_4, 2000, thinks=True)
+
+        budget = size_token_budget(
+            "translations", ModelType.CLAUDE_SONNET_4, _PROFILE, True, 64000, 32000
+        )
+
+        assert budget is not None
+        assert (budget.thinking_budget_tokens, budget.max_tokens) == (4096, 8192)
+
+    def test_reasoning_counts_as_output_without_a_thinking_budget(self) -> None:
+        """Test that max_tokens of a reasoning model without thinking covers its reasoning."""
+        for _ in range(MIN_BUDGET_SAMPLES):
+            _record(ModelType.GTP5_MINI, 3000, thinking_tokens=2500)
+
+        budget = size_token_budget("translations", ModelType.GTP5_MINI, _PROFILE, False, 64000, 0)
+
+        # 3000 tokens of output and reasoning with headroom, rounded to a power of two
+        assert budget is not None
+        assert budget.max_tokens == 8192
+        assert (
+            size_token_budget("translations", ModelType.GTP5_MINI, _PROFILE, True, 64000, 0) is None
+        )
+
+    def test_disabled_sizing_keeps_the_defaults(self) -> None:
+        """Test that no budget is sized while sizing is turned off."""
+        for _ in range(MIN_BUDGET_SAMPLES):
+            _record(ModelType.CLAUDE_SONNET_3_5, 500)
+        configure_token_budget_sizing(False)
+
+        assert (
+            size_token_budget(
+                "translations", ModelType.CLAUDE_SONNET_3_5, _PROFILE, False, 64000, 0
+            )
+            is None
+        )
+
+    def test_term_class_by_word_count(self) -> None:
+        """Test that terms are classified as words, phrases or sentences."""
+        assert [term_class(t) for t in ("cat", "kick the bucket", "a b c d e")] == [
+            "word",
+            "phrase",
+            "sentence",
+        ]
+
+
+class TestUsageFeedback:
+    """Test cases for feeding call usage back into the estimates."""
+
+    async def test_generated_entries_feed_the_estimate(self) -> None:
+        """Test that finished calls are recorded and later calls get a sized client."""
+        params = BaseDictionaryParams(translating_term="perro", user_learning_languages="es:2")
+        configure_fake_llm(FakeLLMSettings(latency_distribution="constant", latency_seconds=0))
+        try:
+            for _ in range(MIN_BUDGET_SAMPLES):
+                _ = await generate_base_dictionary_entry(params, ModelType.GTP4_O_MINI)
+        finally:
+            configure_fake_llm(None)
+
+        budget = size_token_budget(
+            "base",
+            ModelType.GTP4_O_MINI,
+            OutputProfile(language=None, term_class="word", units=1),
+            False,
+            16384,
+            0,
+        )
+        assert budget is not None
+        assert 1024 <= budget.max_tokens < 16384
+
+    @patch("langtools.ai.functions.create_base_dictionary_chain")
+    @patch("langtools.ai.functions.get_llm_client")
+    async def test_truncated_output_is_regenerated_at_the_defaults(
+        self, mock_get_client: Mock, _mock_chain: Mock
+    ) -> None:
+        """Test that output cut short by a sized budget is retried once without it."""
+        profile = OutputProfile(language=None, term_class="word", units=1)
+        for _ in range(MIN_BUDGET_SAMPLES):
+            usage = StageUsage(stage="base", model=ModelType.GTP5_MINI.value, output_tokens=300)
+            record_output_usage(ModelType.GTP5_MINI, False, profile, usage)
+        meaning = AiMeaning(
+            headword="lobo",
+            local_id="lobo-1",
+            canonical_form="lobo",
+            alternate_spellings=[],
+            definition="Mamífero carnívoro",
+            part_of_speech="sustantivo",
+            morphology="masculino",
+            register="neutral",
+            frequency="common",
+            etymology="del latín lupus",
+            difficulty_level="beginner",
+            learning_priority="high",
+            pronunciation="ˈlo.βo",
+            example_sentences=["El lobo aúlla", "Un lobo gris"],
+        )
+        entry = AiDictionaryEntry(headword="lobo", source_language="es", meanings=[meaning])
+        sized_limits: list[int | None] = []
+
+        def client(model: ModelType, settings: LLMClientSettings | None = None) -> Mock:
+            max_tokens = settings.max_tokens if settings else None
+            sized_limits.append(max_tokens)
+            generate = (
+                AsyncMock(side_effect=OutputTruncatedError("base output stopped at max_tokens"))
+                if max_tokens is not None
+                else AsyncMock(return_value=entry)
+            )
+            return Mock(
+                served_model=ServedModel(model=model),
+                failover_client=Mock(return_value=None),
+                generate_with_parser_base=generate,
+            )
+
+        mock_get_client.side_effect = client
+        params = BaseDictionaryParams(translating_term="lobo", user_learning_languages="es:2")
+
+        result = await generate_base_dictionary_entry(params, ModelType.GTP5_MINI)
+
+        assert result == entry
+        assert sized_limits == [1024, None]
+        [metrics] = [
+            metrics
+            for metrics in get_token_budget_metrics()
+            if (metrics.stage, metrics.model) == ("base", ModelType.GTP5_MINI.value)
+        ]
+        assert metrics.fallbacks == 1
@@ -0,0 +1,147 @@
+"""
+Tests for the LLM response cache.
+"""
+
+from pathlib import Path
+
+from langtools.ai.cache import (
+    MemoryResponseCache,
+    SQLiteResponseCache,
+    configure_response_cache,
+    get_response_cache_metrics,
+    response_cache_key,
+)
+from langtools.ai.client import configure_fake_llm
+from langtools.ai.fake import FakeLLMSettings
+from langtools.ai.functions import generate_base_dictionary_entry
+from langtools.ai.models import AiDictionaryEntry, BaseDictionaryParams, ModelType, ServedModel
+from langtools.ai.prompts import base_dictionary_inputs
+from langtools.ai.usage import UsageTracker
+
+
+class TestMemoryResponseCache:
+    """Test cases for MemoryResponseCache class."""
+
+    async def test_least_recently_used_entries_are_evicted(self) -> None:
+        """Test that storing beyond max_entries drops the least recently read entry."""
+        cache = MemoryResponseCache(max_entries=2)
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        assert await cache.get("a") == "1"
+
+        await cache.set("c", "3")
+
+        assert [await cache.get(key) for key in ("a", "b", "c")] == ["1", None, "3"]
+        assert cache.metrics().evictions == 1
+
+    async def test_expired_entries_are_misses(self) -> None:
+        """Test that an entry past its TTL is dropped on lookup."""
+        cache = MemoryResponseCache(ttl_seconds=0)
+        await cache.set("a", "1")
+
+        assert await cache.get("a") is None
+        metrics = cache.metrics()
+        assert (metrics.hits, metrics.misses, metrics.expirations) == (0, 1, 1)
+
+
+class TestSQLiteResponseCache:
+    """Test cases for SQLiteResponseCache class."""
+
+    async def test_entries_survive_reopening(self, tmp_path: Path) -> None:
+        """Test that a response stored by one cache is read by another on the same file."""
+        path = str(tmp_path / "cache.db")
+        cache = SQLiteResponseCache(path)
+        await cache.set("a", "1")
+        await cache.aclose()
+
+        reopened = SQLiteResponseCache(path)
+        try:
+            assert await reopened.get("a") == "1"
+            assert await reopened.get("b") is None
+        finally:
+            await reopened.aclose()
+
+
+class TestResponseCacheKey:
+    """Test cases for response_cache_key function."""
+
+    def test_key_depends_on_serving_model_and_inputs(self) -> None:
+        """Test that a different model, thinking mode or input gives a different key."""
+        inputs = {"translating_term": "perro"}
+        sonnet = ServedModel(model=ModelType.CLAUDE_SONNET_4, thinking=True)
+        key = response_cache_key("base", sonnet, inputs, AiDictionaryEntry)
+
+        assert key == response_cache_key(
+            "base", sonnet.model_copy(), dict(inputs), AiDictionaryEntry
+        )
+        for other in (
+            ServedModel(model=ModelType.CLAUDE_SONNET_4, thinking=False),
+            ServedModel(model=ModelType.FAKE),
+        ):
+            assert key != response_cache_key("base", other, inputs, AiDictionaryEntry)
+        assert key != response_cache_key(
+            "base", sonnet, {"translating_term": "gato"}, AiDictionaryEntry
+        )
+
+
+class TestCachedGeneration:
+    """Test cases for serving workflow calls from the response cache."""
+
+    async def test_repeated_entry_is_served_from_the_cache(self) -> None:
+        """Test that a repeated base entry call does not reach the model."""
+        params = BaseDictionaryParams(translating_term="perro", user_learning_languages="es:2")
+        usage = UsageTracker()
+        configure_fake_llm(FakeLLMSettings(latency_distribution="constant", latency_seconds=0))
+        configure_response_cache(MemoryResponseCache())
+        try:
+            first = await generate_base_dictionary_entry(params, ModelType.GTP4_O_MINI, usage)
+            second = await generate_base_dictionary_entry(params, ModelType.GTP4_O_MINI, usage)
+            metrics = get_response_cache_metrics()
+        finally:
+            configure_response_cache(None)
+            configure_fake_llm(None)
+
+        assert second == first
+        assert sum(stage.calls for stage in usage.usage) == 1
+        assert metrics is not None
+        assert (metrics.hits, metrics.misses, metrics.stores) == (1, 1, 1)
+
+    async def test_refresh_calls_the_model_and_replaces_the_cached_entry(self) -> None:
+        """Test that refresh_response_cache skips the lookup but still stores the response."""
+        params = BaseDictionaryParams(translating_term="gato", user_learning_languages="es:2")
+        usage = UsageTracker()
+        configure_fake_llm(FakeLLMSettings(latency_distribution="constant", latency_seconds=0))
+        configure_response_cache(MemoryResponseCache())
+        try:
+            _ = await generate_base_dictionary_entry(params, ModelType.GTP4_O_MINI, usage)
+            _ = await generate_base_dictionary_entry(
+                params.model_copy(update={"refresh_response_cache": True}),
+                ModelType.GTP4_O_MINI,
+                usage,
+            )
+            metrics = get_response_cache_metrics()
+        finally:
+            configure_response_cache(None)
+            configure_fake_llm(None)
+
+        assert sum(stage.calls for stage in usage.usage) == 2
+        assert metrics is not None
+        assert (metrics.hits, metrics.misses, metrics.stores) == (0, 1, 2)
+
+    async def test_fake_responses_are_not_stored_as_the_requested_model(self) -> None:
+        """Test that output of the fake model is keyed by the fake model, not the requested one."""
+        params = BaseDictionaryParams(translating_term="lobo", user_learning_languages="es:2")
+        cache = MemoryResponseCache()
+        configure_fake_llm(FakeLLMSettings(latency_distribution="constant", latency_seconds=0))
+        configure_response_cache(cache)
+        try:
+            _ = await generate_base_dictionary_entry(params, ModelType.GTP4_O_MINI)
+        finally:
+            configure_response_cache(None)
+            configure_fake_llm(None)
+
+        inputs = base_dictionary_inputs(params)
+        fake = ServedModel(model=ModelType.FAKE)
+        requested = ServedModel(model=ModelType.GTP4_O_MINI)
+        assert await cache.get(response_cache_key("base", fake, inputs, AiDictionaryEntry))
+        assert not await cache.get(response_cache_key("base", requested, inputs, AiDictionaryEntry))
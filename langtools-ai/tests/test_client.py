@@ -4,7 +4,7 @@ Tests for LLM client functionality.
 
 from unittest.mock import AsyncMock, Mock, patch
 
-from langtools.ai.client import LLMClient
+from langtools.ai.client import LLMClient, LLMClientSettings, aclose_llm_clients, get_llm_client
 from langtools.ai.models import ModelType
 
 
@@ -113,3 +113,39 @@ class TestLLMClient:
         # Verify
         assert result == "test_result"
         mock_chain.ainvoke.assert_called_once_with({})  # type: ignore[misc]
+
+
+class TestLLMClientRegistry:
+    """Test cases for the shared LLMClient registry."""
+
+    @patch("langtools.ai.client.ChatOpenAI")
+    async def test_reuses_client_per_model_and_settings(self, mock_chat_openai: Mock) -> None:
+        """Test that clients are created once per model and settings variant."""
+        client = get_llm_client(ModelType.GTP4_1_MINI)
+
+        assert get_llm_client(ModelType.GTP4_1_MINI) is client
+        assert get_llm_client(ModelType.GTP4_1_MINI, LLMClientSettings()) is client
+        assert (
+            get_llm_client(ModelType.GTP4_1_MINI, LLMClientSettings(max_tokens=100)) is not client
+        )
+        assert get_llm_client(ModelType.GTP4_O_MINI) is not client
+        assert mock_chat_openai.call_count == 3
+
+        await aclose_llm_clients()
+
+    @patch("langtools.ai.client.ChatOpenAI")
+    async def test_shares_http_client_and_closes_on_shutdown(self, mock_chat_openai: Mock) -> None:
+        """Test that OpenAI clients share one pooled HTTP client closed by the shutdown hook."""
+        first = get_llm_client(ModelType.GTP4_1_MINI)
+        second = get_llm_client(ModelType.GTP5_MINI)
+        http_client = first.http_async_client
+
+        assert http_client is not None
+        assert second.http_async_client is http_client
+        assert mock_chat_openai.call_args.kwargs["http_async_client"] is http_client
+
+        await aclose_llm_clients()
+
+        assert http_client.is_closed
+        assert get_llm_client(ModelType.GTP4_1_MINI) is not first
+        await aclose_llm_clients()
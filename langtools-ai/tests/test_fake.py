@@ -0,0 +1,124 @@
+"""
+Tests for the offline fake chat model.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from langtools.ai.client import configure_fake_llm
+from langtools.ai.fake import FakeChatModel, FakeLLMError, FakeLLMSettings
+from langtools.ai.functions import generate_dictionary_workflow_stream
+from langtools.ai.models import (
+    BaseDictionaryParams,
+    DictionaryEntryParams,
+    ModelType,
+    TranslationParams,
+)
+from langtools.ai.prompts import (
+    base_dictionary_inputs,
+    create_base_dictionary_chain,
+    create_base_dictionary_stream_chain,
+    create_meaning_translations_chain,
+    meaning_translations_inputs,
+)
+
+RECORDED_ENTRIES = Path(__file__).parent / "data" / "recorded_entries.json"
+
+_BASE_PARAMS = BaseDictionaryParams(translating_term="Сырой", user_learning_languages="en:1,ru:2")
+
+
+def _model(**settings: float | str) -> FakeChatModel:
+    return FakeChatModel(
+        settings=FakeLLMSettings.model_validate(
+            {"latency_distribution": "constant", "latency_seconds": 0, **settings}
+        )
+    )
+
+
+class TestFakeChatModel:
+    """Test cases for FakeChatModel."""
+
+    async def test_generated_payloads_are_schema_valid_and_deterministic(self) -> None:
+        """Test that entries and translations parse and depend only on the prompt."""
+        chain = create_base_dictionary_chain(_model())
+
+        entry = await chain.ainvoke(base_dictionary_inputs(_BASE_PARAMS))
+        translations = await create_meaning_translations_chain(_model()).ainvoke(
+            meaning_translations_inputs(TranslationParams(entry=entry, translation_language="de"))
+        )
+
+        assert entry.source_language == "ru"
+        assert [meaning.local_id for meaning in entry.meanings] == [
+            "Сырой-1",
+            "Сырой-2",
+            "Сырой-3",
+        ]
+        assert [t.meaning_local_id for t in translations.translations] == [
+            meaning.local_id for meaning in entry.meanings
+        ]
+        assert await chain.ainvoke(base_dictionary_inputs(_BASE_PARAMS)) == entry
+
+    async def test_recorded_fixture_is_served_for_its_term(self) -> None:
+        """Test that a recorded entry is returned for a matching term."""
+        model = _model(fixtures_path=str(RECORDED_ENTRIES))
+        params = BaseDictionaryParams(translating_term="СЫРОЙ", user_learning_languages="en:1")
+
+        entry = await create_base_dictionary_chain(model).ainvoke(base_dictionary_inputs(params))
+
+        assert entry.headword == "сырой"
+        assert entry.meanings[0].definition.startswith("Не подвергшийся тепловой обработке")
+
+    async def test_stream_yields_partial_entries(self) -> None:
+        """Test that tool call arguments stream in chunks and parse as partial dicts."""
+        chain = create_base_dictionary_stream_chain(_model(stream_chunk_chars=50))
+
+        outputs = [output async for output in chain.astream(base_dictionary_inputs(_BASE_PARAMS))]
+
+        assert len(outputs) > 3
+        assert len(outputs[-1]["meanings"]) == 3  # type: ignore[arg-type]
+
+    async def test_failure_rate_raises(self) -> None:
+        """Test that calls fail with FakeLLMError at the configured rate."""
+        chain = create_base_dictionary_chain(_model(failure_rate=1))
+
+        with pytest.raises(FakeLLMError):
+            await chain.ainvoke(base_dictionary_inputs(_BASE_PARAMS))
+
+    async def test_latency_sequence_is_seeded(self) -> None:
+        """Test that equal seeds draw equal latencies from the configured distribution."""
+        first = FakeChatModel(settings=FakeLLMSettings(seed=7, latency_spread=0.8))
+        second = FakeChatModel(settings=FakeLLMSettings(seed=7, latency_spread=0.8))
+
+        latencies = [first._sample_call()[0] for _ in range(5)]  # pyright: ignore[reportPrivateUsage]
+
+        assert latencies == [second._sample_call()[0] for _ in range(5)]  # pyright: ignore[reportPrivateUsage]
+        assert len(set(latencies)) == 5
+
+
+class TestConfigureFakeLLM:
+    """Test cases for configure_fake_llm function."""
+
+    async def test_workflow_runs_offline_for_any_model(self) -> None:
+        """Test that the whole streaming workflow is served by the fake model once enabled."""
+        configure_fake_llm(FakeLLMSettings(latency_distribution="constant", latency_seconds=0))
+        try:
+            params = DictionaryEntryParams(
+                translating_term="banco",
+                user_learning_languages="es:2,en:1",
+                translation_language="en",
+            )
+            events = [
+                event
+                async for event in generate_dictionary_workflow_stream(
+                    params, ModelType.CLAUDE_SONNET_4
+                )
+            ]
+        finally:
+            configure_fake_llm(None)
+
+        result = events[-1].result
+        assert result is not None
+        assert len(result.translations) == len(result.entry.meanings) == 3
+        assert {usage.model for usage in result.metadata.usage} == {ModelType.FAKE.value}
+        assert result.metadata.estimated_cost_usd == 0
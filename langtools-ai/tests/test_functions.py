@@ -2,27 +2,90 @@
 Tests for AI functions.
 """
 
+import asyncio
+from collections.abc import AsyncIterator
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from langtools.ai.budgets import OutputProfile
 from langtools.ai.functions import (
+    LLMAPIError,
     ValidationError,
     generate_base_dictionary_entry,
     generate_dictionary_entry,
     generate_dictionary_workflow,
+    generate_dictionary_workflow_batch,
+    generate_dictionary_workflow_stream,
     generate_meaning_translations,
 )
 from langtools.ai.models import (
     AiDictionaryEntry,
     BaseDictionaryParams,
+    CachedDictionaryEntry,
+    DictionaryBatchHooks,
+    DictionaryBatchParams,
     DictionaryEntryParams,
+    DictionaryWorkflowHooks,
     DictionaryWorkflowResult,
     AiMeaning,
     AiMeaningTranslation,
     ModelType,
+    PreviousTranslations,
+    ServedModel,
     TranslationParams,
+    UsageStage,
 )
+from langtools.ai.prompts import base_dictionary_inputs
+from langtools.ai.usage import UsageTracker
+
+
+def _meaning(term: str, index: int = 1, definition: str = "Определение") -> AiMeaning:
+    return AiMeaning(
+        headword=term,
+        local_id=f"{term}-{index}",
+        canonical_form=term,
+        alternate_spellings=[],
+        definition=definition,
+        part_of_speech="существительное",
+        morphology="женский род",
+        register="нейтральный",
+        frequency="common",
+        etymology="праславянское",
+        difficulty_level="beginner",
+        learning_priority="high",
+        pronunciation="vɐˈda",
+        example_sentences=["Пример один", "Пример два"],
+    )
+
+
+def _entry(term: str, *meanings: AiMeaning) -> AiDictionaryEntry:
+    return AiDictionaryEntry(
+        headword=term, source_language="ru", meanings=list(meanings) or [_meaning(term)]
+    )
+
+
+def _translation(
+    meaning_local_id: str, language: str = "en", text: str = "translation"
+) -> AiMeaningTranslation:
+    return AiMeaningTranslation(
+        meaning_local_id=meaning_local_id,
+        headword=text,
+        canonical_form=text,
+        translation_language=language,
+        translation=text,
+        definition="Definition",
+        part_of_speech="noun",
+        morphology="feminine",
+        register="neutral",
+        frequency="common",
+        etymology="Proto-Slavic",
+        difficulty_level="beginner",
+        learning_priority="high",
+        pronunciation="vɐˈda",
+        pronunciation_tips="Stress the last syllable",
+        example_sentences_translations=["Example one", "Example two"],
+    )
 
 
 class TestGenerateBaseDictionaryEntry:
@@ -55,16 +118,12 @@ class TestGenerateBaseDictionaryEntry:
         with pytest.raises(ValidationError, match="Invalid user_learning_languages format"):
             await generate_base_dictionary_entry(params, ModelType.CLAUDE_SONNET_4)
 
-    @patch("langtools.ai.functions.LLMClient")
+    @patch("langtools.ai.functions.get_llm_client")
     @patch("langtools.ai.functions.create_base_dictionary_chain")
     async def test_successful_generation(
-        self, mock_create_chain: Mock, mock_client_class: Mock
+        self, mock_create_chain: Mock, mock_get_client: Mock
     ) -> None:
         """Test successful base dictionary entry generation."""
-        # Setup mocks
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
         # Create expected result with proper model structure
         expected_result = AiDictionaryEntry(
             headword="сырой",
@@ -72,7 +131,7 @@ class TestGenerateBaseDictionaryEntry:
             meanings=[
                 AiMeaning(
                     headword="сырой",
-                    local_id="сырой-0",
+                    local_id="сырой-1",
                     canonical_form="сырой",
                     alternate_spellings=[],
                     definition="Не подвергшийся тепловой обработке",
@@ -89,7 +148,12 @@ class TestGenerateBaseDictionaryEntry:
             ],
         )
 
-        mock_client.generate_with_parser_base = AsyncMock(return_value=expected_result)
+        # Setup mocks
+        mock_model = Mock()
+        mock_generate = AsyncMock(return_value=expected_result)
+        mock_get_client.return_value = Mock(
+            model=mock_model, generate_with_parser_base=mock_generate
+        )
         mock_chain = Mock()
         mock_create_chain.return_value = mock_chain
 
@@ -103,12 +167,18 @@ class TestGenerateBaseDictionaryEntry:
         assert result == expected_result
         assert result.source_language == "ru"
         assert len(result.meanings) == 1
-        assert result.meanings[0].local_id == "сырой-0"
+        assert result.meanings[0].local_id == "сырой-1"
 
         # Verify mocks were called correctly
-        mock_client_class.assert_called_once_with(ModelType.CLAUDE_SONNET_4)
-        mock_create_chain.assert_called_once_with(model=mock_client.model, params=params)  # type: ignore[misc]
-        mock_client.generate_with_parser_base.assert_called_once_with(mock_chain)  # type: ignore[misc]
+        # Without routing or sized budgets, the call runs on the model's shared default client
+        mock_get_client.assert_called_once_with(ModelType.CLAUDE_SONNET_4, None)
+        mock_create_chain.assert_called_once_with(mock_model)
+        mock_generate.assert_called_once_with(
+            mock_chain,
+            base_dictionary_inputs(params),
+            None,
+            OutputProfile(language=None, term_class="word", units=1),
+        )
 
 
 class TestGenerateMeaningTranslations:
@@ -153,12 +223,116 @@ class TestGenerateMeaningTranslations:
         with pytest.raises(ValidationError, match="Invalid translation_language format"):
             await generate_meaning_translations(params, ModelType.CLAUDE_SONNET_4)
 
+    @patch("langtools.ai.functions.MAX_CONCURRENT_TRANSLATION_CALLS", 2)
+    @patch("langtools.ai.functions.get_llm_client")
+    @patch("langtools.ai.functions.create_meaning_translations_chain")
+    async def test_translates_meaning_groups_concurrently(
+        self, mock_create_chain: Mock, mock_get_client: Mock
+    ) -> None:
+        """Test that meaning groups are translated under the bound and merged in order."""
+        meanings = [_meaning("сырой", index, f"Значение {index}") for index in range(1, 6)]
+        running = 0
+        max_running = 0
+
+        async def translate(
+            _chain: Mock,
+            inputs: dict[str, str],
+            _usage: UsageTracker | None,
+            _profile: OutputProfile | None,
+        ) -> list[AiMeaningTranslation]:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            group = [
+                meaning for meaning in meanings if meaning.local_id in inputs["parameters_json"]
+            ]
+            # Finish later groups first and return each group reversed
+            await asyncio.sleep(0.01 * (len(meanings) - meanings.index(group[0])))
+            running -= 1
+            return [_translation(meaning.local_id, text="raw") for meaning in reversed(group)]
+
+        mock_model = Mock()
+        mock_get_client.return_value = Mock(
+            model=mock_model, generate_with_parser_translations=translate
+        )
+
+        entry = _entry("сырой", *meanings)
+        params = TranslationParams(entry=entry, translation_language="en", meanings_per_call=2)
+
+        result = await generate_meaning_translations(params, ModelType.CLAUDE_SONNET_4)
+
+        assert [translation.meaning_local_id for translation in result] == [
+            meaning.local_id for meaning in meanings
+        ]
+        assert max_running == 2
+        mock_create_chain.assert_called_once_with(mock_model)
+
+    @patch("langtools.ai.functions.get_llm_client")
+    @patch("langtools.ai.functions.create_meaning_translations_chain")
+    async def test_reuses_translations_of_unchanged_meanings(
+        self, _mock_create_chain: Mock, mock_get_client: Mock
+    ) -> None:
+        """Test that only new or changed meanings are translated and results merge in order."""
+
+        previous_entry = _entry(
+            "сырой", _meaning("сырой", 1, "Не варёный"), _meaning("сырой", 2, "Влажный")
+        )
+        entry = _entry(
+            "сырой",
+            _meaning("сырой", 1, "Не варёный"),
+            _meaning("сырой", 2, "Влажный, мокрый"),
+            _meaning("сырой", 3, "Необработанный"),
+        )
+        translated_ids: list[list[str]] = []
+
+        async def translate(
+            _chain: Mock,
+            inputs: dict[str, str],
+            _usage: UsageTracker | None,
+            _profile: OutputProfile | None,
+        ) -> list[AiMeaningTranslation]:
+            ids = [m.local_id for m in entry.meanings if m.local_id in inputs["parameters_json"]]
+            translated_ids.append(ids)
+            return [_translation(local_id, text="new") for local_id in reversed(ids)]
+
+        mock_client = Mock()
+        mock_client.generate_with_parser_translations = translate
+        mock_get_client.return_value = mock_client
+
+        params = TranslationParams(
+            entry=entry,
+            translation_language="en",
+            previous_translations=PreviousTranslations(
+                entry=previous_entry,
+                translations=[
+                    _translation("сырой-1", text="old"),
+                    _translation("сырой-2", text="old"),
+                ],
+            ),
+        )
+
+        result = await generate_meaning_translations(params, ModelType.CLAUDE_SONNET_4)
+
+        assert translated_ids == [["сырой-2", "сырой-3"]]
+        assert [(t.meaning_local_id, t.translation) for t in result] == [
+            ("сырой-1", "old"),
+            ("сырой-2", "new"),
+            ("сырой-3", "new"),
+        ]
+
+        # Nothing changed: every translation is reused without an LLM call
+        unchanged = params.model_copy(
+            update={"previous_translations": PreviousTranslations(entry=entry, translations=result)}
+        )
+        assert await generate_meaning_translations(unchanged, ModelType.CLAUDE_SONNET_4) == result
+        assert len(translated_ids) == 1
+
 
 class TestGenerateDictionaryWorkflow:
     """Test cases for generate_dictionary_workflow function."""
 
-    @patch("langtools.ai.functions.generate_meaning_translations")
-    @patch("langtools.ai.functions.generate_base_dictionary_entry")
+    @patch("langtools.ai.functions._generate_meaning_translations")
+    @patch("langtools.ai.functions._generate_base_dictionary_entry")
     async def test_successful_workflow(
         self, mock_base_entry: Mock, mock_translations: Mock
     ) -> None:
@@ -208,8 +382,9 @@ class TestGenerateDictionaryWorkflow:
             )
         ]
 
-        mock_base_entry.return_value = base_entry
-        mock_translations.return_value = translations
+        served = ServedModel(model=ModelType.CLAUDE_SONNET_4, thinking=True)
+        mock_base_entry.return_value = (base_entry, served)
+        mock_translations.return_value = (translations, served)
 
         # Test parameters
         params = DictionaryEntryParams(
@@ -225,11 +400,49 @@ class TestGenerateDictionaryWorkflow:
         assert isinstance(result, DictionaryWorkflowResult)
         assert result.entry == base_entry
         assert result.translations == translations
+        assert result.metadata.base_served_by == served
+        assert result.metadata.translations_served_by == {"en": served}
 
         # Verify calls
         mock_base_entry.assert_called_once()
         mock_translations.assert_called_once()
 
+    @patch("langtools.ai.functions._generate_meaning_translations")
+    @patch("langtools.ai.functions._generate_base_dictionary_entry")
+    async def test_workflow_translates_all_languages(
+        self, mock_base_entry: Mock, mock_translations: Mock
+    ) -> None:
+        """Test that one base entry is translated into every requested language."""
+        base_entry = _entry("сырой")
+
+        served = ServedModel(model=ModelType.CLAUDE_SONNET_4, thinking=True)
+        fast = ServedModel(model=ModelType.GTP4_O_MINI)
+
+        def translate(
+            params: TranslationParams, _model: ModelType, _usage: UsageTracker | None
+        ) -> tuple[list[AiMeaningTranslation], ServedModel]:
+            translation = _translation("сырой-1", params.translation_language, "raw")
+            return [translation], fast if params.translation_language == "fr" else served
+
+        mock_base_entry.return_value = (base_entry, served)
+        mock_translations.side_effect = translate
+
+        params = DictionaryEntryParams(
+            translating_term="сырой",
+            user_learning_languages="en:1,ru:2",
+            translation_language="en",
+            translation_languages=["de", "en", "fr"],
+        )
+
+        result = await generate_dictionary_workflow(params, ModelType.CLAUDE_SONNET_4)
+
+        assert list(result.translations_by_language) == ["en", "de", "fr"]
+        assert result.translations == result.translations_by_language["en"]
+        assert result.translations_by_language["fr"][0].translation_language == "fr"
+        assert result.metadata.translations_served_by == {"en": served, "de": served, "fr": fast}
+        mock_base_entry.assert_called_once()
+        assert mock_translations.call_count == 3
+
 
 class TestLegacyGenerateDictionaryEntry:
     """Test cases for legacy generate_dictionary_entry function."""
@@ -250,3 +463,245 @@ class TestLegacyGenerateDictionaryEntry:
 
         assert result == base_entry
         mock_base_entry.assert_called_once()
+
+
+class TestGenerateDictionaryWorkflowBatch:
+    """Test cases for generate_dictionary_workflow_batch function."""
+
+    @patch("langtools.ai.functions.generate_dictionary_workflow")
+    async def test_batch_dedupes_uses_bulk_cache_and_reports_errors(
+        self, mock_workflow: Mock
+    ) -> None:
+        """Test that only cache misses are generated and failures do not stop the batch."""
+        cached_terms: list[list[str]] = []
+
+        async def retrieve_cached_entries(terms: list[str]) -> dict[str, CachedDictionaryEntry]:
+            cached_terms.append(terms)
+            return {
+                "вода": CachedDictionaryEntry(
+                    entry=_entry("вода"),
+                    translations_by_language={"en": [_translation("вода-1")]},
+                ),
+                "сырой": CachedDictionaryEntry(entry=_entry("сырой")),
+            }
+
+        async def workflow(
+            params: DictionaryEntryParams, _model: ModelType, hooks: DictionaryWorkflowHooks | None
+        ) -> DictionaryWorkflowResult:
+            if params.translating_term == "ошибка":
+                raise LLMAPIError("LLM API call failed")
+            # Partially cached terms reuse the bulk-loaded base entry
+            assert hooks is not None and hooks.retrieve_base_entry is not None
+            entry = await hooks.retrieve_base_entry(
+                BaseDictionaryParams(
+                    translating_term=params.translating_term, user_learning_languages=""
+                )
+            )
+            assert entry is not None
+            translations = [_translation(f"{params.translating_term}-1")]
+            return DictionaryWorkflowResult(
+                entry=entry,
+                translations=translations,
+                translations_by_language={"en": translations},
+            )
+
+        mock_workflow.side_effect = workflow
+        params = DictionaryBatchParams(
+            translating_terms=["сырой", " СЫРОЙ ", "вода", "ошибка"],
+            user_learning_languages="en:1,ru:2",
+            translation_language="en",
+            max_concurrency=2,
+        )
+
+        results = [
+            item
+            async for item in generate_dictionary_workflow_batch(
+                params,
+                ModelType.CLAUDE_SONNET_4,
+                DictionaryBatchHooks(retrieve_cached_entries=retrieve_cached_entries),
+            )
+        ]
+
+        assert cached_terms == [["сырой", "вода", "ошибка"]]
+        by_term = {item.term: item for item in results}
+        assert len(results) == 3
+        assert results[0].term == "вода" and results[0].cached
+        assert by_term["сырой"].result is not None and not by_term["сырой"].cached
+        assert by_term["ошибка"].result is None
+        assert by_term["ошибка"].error == "LLM API call failed"
+        assert mock_workflow.call_count == 2
+
+    @patch("langtools.ai.functions.generate_dictionary_workflow")
+    async def test_incomplete_cached_translations_are_generated(self, mock_workflow: Mock) -> None:
+        """Test that a term whose cached translations miss a meaning is not reported cached."""
+        entry = _entry("вода", _meaning("вода"), _meaning("вода", 2))
+
+        async def retrieve_cached_entries(_terms: list[str]) -> dict[str, CachedDictionaryEntry]:
+            return {
+                "вода": CachedDictionaryEntry(
+                    entry=entry, translations_by_language={"en": [_translation("вода-1")]}
+                )
+            }
+
+        translations = [
+            _translation("вода-1"),
+            _translation("вода-2"),
+        ]
+        mock_workflow.return_value = DictionaryWorkflowResult(
+            entry=entry, translations=translations, translations_by_language={"en": translations}
+        )
+        params = DictionaryBatchParams(
+            translating_terms=["вода"], user_learning_languages="en:1", translation_language="en"
+        )
+
+        [item] = [
+            item
+            async for item in generate_dictionary_workflow_batch(
+                params,
+                ModelType.CLAUDE_SONNET_4,
+                DictionaryBatchHooks(retrieve_cached_entries=retrieve_cached_entries),
+            )
+        ]
+
+        assert not item.cached
+        assert item.result is not None and len(item.result.translations) == 2
+        mock_workflow.assert_called_once()
+
+
+class TestGenerateDictionaryWorkflowStream:
+    """Test cases for generate_dictionary_workflow_stream function."""
+
+    @patch("langtools.ai.functions.get_llm_client")
+    @patch("langtools.ai.functions.create_meaning_translations_chain")
+    @patch("langtools.ai.functions.create_base_dictionary_stream_chain")
+    async def test_meanings_are_translated_while_entry_streams(
+        self, _mock_base_chain: Mock, _mock_translations_chain: Mock, mock_get_client: Mock
+    ) -> None:
+        """Test that meanings are emitted and translated before the entry completes."""
+        entry = _entry("вода")
+        first = entry.meanings[0].model_dump()
+        second = {**first, "local_id": "wrong", "definition": "Второе определение"}
+        first_translated = asyncio.Event()
+
+        async def stream_base(_inputs: dict[str, str]) -> AsyncIterator[dict[str, object]]:
+            yield {"headword": "вода", "meanings": [{"headword": "во"}]}
+            yield {"headword": "вода", "meanings": [first, {"headword": "во"}]}
+            # The first meaning is translated while the second is still being generated
+            await asyncio.wait_for(first_translated.wait(), timeout=1)
+            yield {"headword": "вода", "source_language": "ru", "meanings": [first, second]}
+
+        async def translate(
+            _chain: Mock,
+            inputs: dict[str, str],
+            _usage: UsageTracker | None,
+            _profile: OutputProfile | None,
+        ) -> list[AiMeaningTranslation]:
+            language = "de" if '"de"' in inputs["parameters_json"] else "en"
+            local_id = "вода-2" if "Второе" in inputs["parameters_json"] else "вода-1"
+            if local_id == "вода-1":
+                first_translated.set()
+            else:
+                # Finish later meanings first so the result has to be reordered
+                await asyncio.sleep(0)
+            return [_translation(local_id, language)]
+
+        def stream_with_parser(
+            _chain: Mock,
+            inputs: dict[str, str],
+            _stage: UsageStage,
+            _usage: UsageTracker | None,
+            _profile: OutputProfile | None,
+        ) -> AsyncIterator[dict[str, object]]:
+            return stream_base(inputs)
+
+        served = ServedModel(model=ModelType.CLAUDE_SONNET_4, thinking=True)
+        mock_get_client.return_value = Mock(
+            supports_streaming_tool_calls=True,
+            served_model=served,
+            stream_with_parser=stream_with_parser,
+            generate_with_parser_translations=AsyncMock(side_effect=translate),
+        )
+        params = DictionaryEntryParams(
+            translating_term="вода",
+            user_learning_languages="en:1,ru:2",
+            translation_language="en",
+            translation_languages=["de"],
+        )
+
+        events = [
+            event
+            async for event in generate_dictionary_workflow_stream(
+                params, ModelType.CLAUDE_SONNET_4
+            )
+        ]
+
+        names = [event.event for event in events]
+        assert names[0] == "meaning" and names[-1] == "result"
+        assert names.index("translation") < names.index("entry")
+        assert names.count("translation") == 4
+        meanings = [event.meaning for event in events if event.meaning]
+        assert [meaning.local_id for meaning in meanings] == ["вода-1", "вода-2"]
+        result = events[-1].result
+        assert result is not None and len(result.entry.meanings) == 2
+        assert set(result.translations_by_language) == {"en", "de"}
+        for translations in result.translations_by_language.values():
+            assert [t.meaning_local_id for t in translations] == ["вода-1", "вода-2"]
+        assert result.metadata.base_served_by == served
+        assert result.metadata.translations_served_by == {"en": served, "de": served}
+
+    @patch("langtools.ai.functions.get_llm_client")
+    @patch("langtools.ai.functions._generate_meaning_translations")
+    @patch("langtools.ai.functions._generate_base_dictionary_entry")
+    async def test_falls_back_to_sequential_without_streaming_tool_calls(
+        self, mock_base_entry: Mock, mock_translations: Mock, mock_get_client: Mock
+    ) -> None:
+        """Test that models without streaming tool calls translate after the entry."""
+        served = ServedModel(model=ModelType.GTP4_O_MINI)
+        mock_get_client.return_value = Mock(
+            supports_streaming_tool_calls=False, served_model=served
+        )
+        mock_base_entry.return_value = (_entry("вода"), served)
+        mock_translations.return_value = ([_translation("вода-1")], served)
+        params = DictionaryEntryParams(
+            translating_term="вода", user_learning_languages="en:1,ru:2", translation_language="en"
+        )
+
+        events = [
+            event
+            async for event in generate_dictionary_workflow_stream(
+                params, ModelType.CLAUDE_SONNET_4
+            )
+        ]
+
+        assert [event.event for event in events] == ["meaning", "entry", "translation", "result"]
+        mock_base_entry.assert_called_once()
+        mock_translations.assert_called_once()
+
+    @patch("langtools.ai.functions.create_base_dictionary_stream_chain")
+    async def test_cached_entry_and_translations_are_emitted_without_llm(
+        self, mock_base_chain: Mock
+    ) -> None:
+        """Test that cached data from hooks is streamed without calling the model."""
+
+        async def retrieve_base_entry(_: BaseDictionaryParams) -> AiDictionaryEntry:
+            return _entry("вода")
+
+        async def retrieve_translations(params: TranslationParams) -> list[AiMeaningTranslation]:
+            return [_translation("вода-1", params.translation_language)]
+
+        params = DictionaryEntryParams(
+            translating_term="вода", user_learning_languages="en:1,ru:2", translation_language="en"
+        )
+        hooks = DictionaryWorkflowHooks(
+            retrieve_base_entry=retrieve_base_entry, retrieve_translations=retrieve_translations
+        )
+
+        events = [
+            event
+            async for event in generate_dictionary_workflow_stream(
+                params, ModelType.CLAUDE_SONNET_4, hooks
+            )
+        ]
+
+        assert [event.event for event in events] == ["meaning", "entry", "translation", "result"]
+        mock_base_chain.assert_not_called()
@@ -0,0 +1,81 @@
+"""
+Tests for hedged LLM calls.
+"""
+
+import asyncio
+
+import pytest
+
+from langtools.ai.hedging import get_hedging_metrics, hedged_call
+from langtools.ai.models import HedgingPolicy
+
+_POLICY = HedgingPolicy(
+    initial_delay_seconds=0.02, min_delay_seconds=0, max_hedge_ratio={"base": 1.0}
+)
+
+
+async def _answer(value: str, delay: float) -> str:
+    await asyncio.sleep(delay)
+    return value
+
+
+class TestHedgedCall:
+    """Test cases for hedged_call function."""
+
+    async def test_slow_call_is_hedged_and_loser_cancelled(self) -> None:
+        """Test that a faster hedge wins, is counted and the original call is cancelled."""
+        original = asyncio.Event()
+
+        async def slow() -> str:
+            try:
+                return await _answer("original", 1)
+            except asyncio.CancelledError:
+                original.set()
+                raise
+
+        result = await hedged_call("base", "hedge-wins", _POLICY, slow, lambda: _answer("hedge", 0))
+
+        await asyncio.sleep(0)  # let the cancelled original call unwind
+        assert result == "hedge"
+        assert original.is_set()
+        [metrics] = [m for m in get_hedging_metrics() if m.model == "hedge-wins"]
+        assert (metrics.calls, metrics.hedges, metrics.hedge_wins) == (1, 1, 1)
+
+    async def test_fast_call_is_not_hedged(self) -> None:
+        """Test that no duplicate is fired for a call that beats the hedge delay."""
+        result = await hedged_call(
+            "base", "no-hedge", _POLICY, lambda: _answer("original", 0), lambda: _answer("x", 0)
+        )
+
+        assert result == "original"
+        [metrics] = [m for m in get_hedging_metrics() if m.model == "no-hedge"]
+        assert (metrics.calls, metrics.hedges) == (1, 0)
+
+    async def test_budget_limits_hedges(self) -> None:
+        """Test that slow calls are not hedged once the stage's budget is spent."""
+        policy = _POLICY.model_copy(update={"max_hedge_ratio": {"base": 0.5}})
+        hedges = 0
+
+        async def hedge() -> str:
+            nonlocal hedges
+            hedges += 1
+            return "hedge"
+
+        for _ in range(4):
+            await hedged_call("base", "budget", policy, lambda: _answer("original", 0.05), hedge)
+
+        assert hedges == 2
+        [metrics] = [m for m in get_hedging_metrics() if m.model == "budget"]
+        assert (metrics.hedges, metrics.budget_exhausted) == (2, 2)
+
+    async def test_original_error_raised_when_both_fail(self) -> None:
+        """Test that the original call's error surfaces when the hedge fails too."""
+
+        async def fail(message: str) -> str:
+            await asyncio.sleep(0.05)
+            raise ValueError(message)
+
+        with pytest.raises(ValueError, match="original"):
+            await hedged_call(
+                "base", "both-fail", _POLICY, lambda: fail("original"), lambda: fail("hedge")
+            )
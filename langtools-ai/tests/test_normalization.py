@@ -0,0 +1,46 @@
+"""
+Tests for term normalization.
+"""
+
+import unicodedata
+
+from langtools.ai.normalization import normalize_term
+
+
+class TestNormalizeTerm:
+    """Test cases for normalize_term function."""
+
+    def test_nfc_and_nfd_share_key(self) -> None:
+        """Test that composed and decomposed spellings resolve to the same key."""
+        composed = normalize_term(unicodedata.normalize("NFC", "café"))
+        decomposed = normalize_term(unicodedata.normalize("NFD", "café"))
+
+        assert composed.key == decomposed.key
+        assert composed.surface == decomposed.surface == unicodedata.normalize("NFC", "café")
+
+    def test_case_and_whitespace(self) -> None:
+        """Test that case and surrounding or repeated whitespace are ignored in the key."""
+        result = normalize_term("  New \t  York ")
+
+        assert result.surface == "New York"
+        assert result.key == "new york"
+
+    def test_stress_marks_removed_from_key(self) -> None:
+        """Test that Russian stress marks do not affect the key but stay in the surface."""
+        result = normalize_term("сыро́й")
+
+        assert result.key == "сырой"
+        assert result.surface == "сыро́й"
+
+    def test_yo_folded_to_ye(self) -> None:
+        """Test that ё and е variants share a key."""
+        assert normalize_term("Ёж").key == normalize_term("еж").key == "еж"
+
+    def test_precomposed_accents_preserved(self) -> None:
+        """Test that meaningful accented letters are kept in the key."""
+        assert normalize_term("Été").key == "été"
+        assert normalize_term("été").key != normalize_term("ete").key
+
+    def test_blank_term_has_empty_key(self) -> None:
+        """Test that whitespace-only input yields an empty key."""
+        assert normalize_term(" \n ").key == ""
@@ -0,0 +1,146 @@
+"""
+Tests for prompt chain construction.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import cast
+
+from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+from pydantic import SecretStr
+
+from langtools.ai.models import AiDictionaryEntry, BaseDictionaryParams, TranslationParams
+from langtools.ai.prompts import (
+    _BASE_DICTIONARY_CACHED_PROMPT,  # pyright: ignore[reportPrivateUsage]
+    _BASE_DICTIONARY_PROMPT,  # pyright: ignore[reportPrivateUsage]
+    _BASE_DICTIONARY_SYSTEM_PROMPT,  # pyright: ignore[reportPrivateUsage]
+    base_dictionary_inputs,
+    create_base_dictionary_chain,
+    create_meaning_translations_chain,
+    meaning_translations_inputs,
+    translation_entry_projection,
+)
+
+RECORDED_ENTRIES = Path(__file__).parent / "data" / "recorded_entries.json"
+
+
+def _model() -> BaseChatModel:
+    return ChatOpenAI(model="gpt-4.1-mini", api_key=SecretStr("test-key"))
+
+
+class TestPromptChains:
+    """Test cases for cached prompt chains."""
+
+    def test_chain_is_built_once_per_model_and_schema(self) -> None:
+        """Test that chains are reused for the same model and rebuilt for another."""
+        model = _model()
+
+        base_chain = create_base_dictionary_chain(model)
+
+        assert create_base_dictionary_chain(model) is base_chain
+        assert create_meaning_translations_chain(model) is not base_chain
+        assert create_base_dictionary_chain(_model()) is not base_chain
+
+    def test_inputs_carry_parameters_json(self) -> None:
+        """Test that per-call inputs only contain the serialized parameters."""
+        params = BaseDictionaryParams(translating_term="сырой", user_learning_languages="ru:1")
+
+        inputs = base_dictionary_inputs(params)
+
+        assert list(inputs) == ["parameters_json"]
+        parameters = cast(list[dict[str, str]], json.loads(inputs["parameters_json"]))
+        assert parameters[0]["value"] == "сырой"
+        assert parameters[1]["value"] == "ru:1"
+
+
+class TestPromptCaching:
+    """Test cases for provider prompt caching of the static prompt prefix."""
+
+    def test_anthropic_system_prompt_has_cache_breakpoint(self) -> None:
+        """Test that Anthropic requests mark the system prompt and preceding tools cacheable."""
+        model = ChatAnthropic(model_name="claude-sonnet-4-0", api_key=SecretStr("test-key"))  # type: ignore[call-arg]
+        messages = _BASE_DICTIONARY_CACHED_PROMPT.format_messages(parameters_json="{}")
+
+        payload = model._get_request_payload(messages)  # pyright: ignore[reportPrivateUsage]
+
+        assert payload["system"][-1]["cache_control"] == {"type": "ephemeral"}
+
+    def test_openai_prompt_starts_with_static_system_prompt(self) -> None:
+        """Test that per-call parameters come last so OpenAI prefix caching applies."""
+        messages = _BASE_DICTIONARY_PROMPT.format_messages(parameters_json="{}")
+
+        assert [message.type for message in messages] == ["system", "human"]
+        assert messages[0].content == _BASE_DICTIONARY_SYSTEM_PROMPT
+        assert messages[1].content == "{}"
+
+
+def _recorded_translation_params() -> list[TranslationParams]:
+    entries = cast(list[object], json.loads(RECORDED_ENTRIES.read_text()))
+    return [
+        TranslationParams(entry=AiDictionaryEntry.model_validate(entry), translation_language="en")
+        for entry in entries
+    ]
+
+
+def _full_entry_parameters_json(params: TranslationParams) -> str:
+    """Translation parameters as sent before the projection: the whole entry, indented."""
+    parameter_definitions = [
+        {
+            "name": "dictionaryEntry",
+            "description": "Base dictionary entry with meanings to translate",
+            "value": params.entry.model_dump(),
+        },
+        {
+            "name": "translationLanguage",
+            "description": "Target language for translations in BCP 47 format",
+            "value": params.translation_language,
+        },
+    ]
+    return json.dumps(parameter_definitions, indent=2, ensure_ascii=False)
+
+
+def _count_tokens(text: str) -> int:
+    """Approximate a tokenizer offline by counting words and punctuation marks."""
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
+class TestTranslationPromptProjection:
+    """Test cases for the compact translation prompt parameters."""
+
+    def test_projection_keeps_fields_translation_needs(self) -> None:
+        """Test that the fields the translation step works from are kept and the rest dropped."""
+        entry = _recorded_translation_params()[0].entry
+
+        projection = translation_entry_projection(entry)
+
+        assert projection["headword"] == entry.headword
+        assert projection["source_language"] == entry.source_language
+        meaning = cast(list[dict[str, object]], projection["meanings"])[0]
+        assert set(meaning) == {
+            "local_id",
+            "headword",
+            "canonical_form",
+            "definition",
+            "part_of_speech",
+            "pronunciation",
+            "morphology",
+            "register",
+            "frequency",
+            "etymology",
+            "difficulty_level",
+            "learning_priority",
+            "example_sentences",
+            "collocations",
+        }
+        assert meaning["local_id"] == entry.meanings[0].local_id
+
+    def test_compact_inputs_use_fewer_tokens_on_recorded_entries(self) -> None:
+        """Test that recorded entries need fewer input tokens than the full entry."""
+        for params in _recorded_translation_params():
+            before = _count_tokens(_full_entry_parameters_json(params))
+            after = _count_tokens(meaning_translations_inputs(params)["parameters_json"])
+
+            assert after < before * 0.8
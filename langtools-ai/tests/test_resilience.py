@@ -0,0 +1,195 @@
+"""
+Tests for LLM retries, circuit breakers and failover.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from langtools.ai.client import (
+    LLMClient,
+    LLMClientSettings,
+    configure_fake_llm,
+    default_llm_client_settings,
+)
+from langtools.ai.fake import FakeLLMError, FakeLLMSettings
+from langtools.ai.functions import LLMAPIError, generate_base_dictionary_entry
+from langtools.ai.models import BaseDictionaryParams, ModelType
+from langtools.ai.prompts import base_dictionary_inputs, create_base_dictionary_chain
+from langtools.ai.resilience import (
+    CircuitBreaker,
+    LLMUnavailableError,
+    get_llm_resilience_metrics,
+    is_transient_error,
+)
+
+_PARAMS = BaseDictionaryParams(translating_term="banco", user_learning_languages="es:2,en:1")
+
+
+def _fake_client(failure_rate: float, **settings: object) -> LLMClient:
+    return LLMClient(
+        ModelType.CLAUDE_SONNET_4,
+        LLMClientSettings.model_validate({"retry_base_delay": 0, **settings}),
+        fake_settings=FakeLLMSettings(
+            latency_distribution="constant", latency_seconds=0, failure_rate=failure_rate
+        ),
+    )
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker class."""
+
+    @patch("langtools.ai.resilience.CIRCUIT_FAILURE_THRESHOLD", 2)
+    @patch("langtools.ai.resilience.CIRCUIT_RESET_SECONDS", 0.05)
+    def test_opens_probes_and_closes(self) -> None:
+        """Test the closed -> open -> half-open -> closed cycle and its metrics."""
+        breaker = CircuitBreaker("test")
+        breaker.record_failure()
+        assert breaker.metrics().state == "closed"
+        breaker.record_failure()
+        assert breaker.metrics().state == "open"
+
+        # After the reset delay one probe goes through; a concurrent one is rejected
+        with pytest.raises(LLMUnavailableError):
+            breaker.before_call()
+        time.sleep(0.06)
+        breaker.before_call()
+        assert breaker.metrics().state == "half_open"
+        with pytest.raises(LLMUnavailableError):
+            breaker.before_call()
+
+        breaker.record_success()
+        metrics = breaker.metrics()
+        assert (metrics.state, metrics.opened, metrics.half_opened, metrics.closed) == (
+            "closed",
+            1,
+            1,
+            1,
+        )
+        assert metrics.rejected_calls == 2
+
+    @patch("langtools.ai.resilience.CIRCUIT_FAILURE_THRESHOLD", 1)
+    def test_open_circuit_fails_fast(self) -> None:
+        """Test that calls are rejected while the circuit is open."""
+        breaker = CircuitBreaker("test")
+        breaker.record_failure()
+
+        with pytest.raises(LLMUnavailableError, match="failing fast"):
+            breaker.before_call()
+
+    def test_transient_errors(self) -> None:
+        """Test that timeouts, connection errors and simulated failures are retried."""
+        assert is_transient_error(TimeoutError())
+        assert is_transient_error(httpx.ConnectError("refused"))
+        assert is_transient_error(FakeLLMError())
+        assert not is_transient_error(ValueError("bad schema"))
+
+
+class TestLLMClientRetries:
+    """Test cases for LLMClient retries."""
+
+    async def test_exhausted_retries_raise_unavailable(self) -> None:
+        """Test that every attempt is made and counted before giving up."""
+        client = _fake_client(failure_rate=1, max_attempts=3)
+        retries_before = get_llm_resilience_metrics().retries
+
+        with pytest.raises(LLMUnavailableError, match="after 3 attempts"):
+            await client.generate_with_parser_base(
+                create_base_dictionary_chain(client.model), base_dictionary_inputs(_PARAMS)
+            )
+
+        assert get_llm_resilience_metrics().retries == retries_before + 2
+
+    @patch("langtools.ai.client.get_circuit_breaker", return_value=CircuitBreaker("hung"))
+    async def test_hung_provider_is_abandoned_at_the_call_deadline(
+        self, _mock_breaker: Mock
+    ) -> None:
+        """Test that attempts stop at the overall deadline instead of timing out in turn."""
+        client = LLMClient(
+            ModelType.CLAUDE_SONNET_4,
+            LLMClientSettings(timeout=10, max_attempts=3, deadline=0.1, retry_base_delay=0),
+            fake_settings=FakeLLMSettings(latency_distribution="constant", latency_seconds=10),
+        )
+        started = time.monotonic()
+
+        with pytest.raises(LLMUnavailableError, match="after 1 attempts within the 0.1s deadline"):
+            await client.generate_with_parser_base(
+                create_base_dictionary_chain(client.model), base_dictionary_inputs(_PARAMS)
+            )
+
+        assert time.monotonic() - started < 1
+
+    @patch("langtools.ai.client.get_circuit_breaker", return_value=CircuitBreaker("stream"))
+    async def test_abandoned_streams_are_closed(self, _mock_breaker: Mock) -> None:
+        """Test that timed out stream attempts and streams left unfinished are closed."""
+        started: list[int] = []
+        closed: list[int] = []
+
+        async def astream(_inputs: dict[str, str], _config: object) -> AsyncIterator[object]:
+            attempt = len(started)
+            started.append(attempt)
+            try:
+                if attempt == 0:
+                    await asyncio.sleep(10)
+                yield {"headword": "ban"}
+                yield {"headword": "banco"}
+            finally:
+                closed.append(attempt)
+
+        client = LLMClient(
+            ModelType.CLAUDE_SONNET_4,
+            LLMClientSettings(timeout=0.05, max_attempts=2, retry_base_delay=0),
+            fake_settings=FakeLLMSettings(latency_distribution="constant", latency_seconds=0),
+        )
+        stream = client.stream_with_parser(Mock(astream=astream), {}, "base")
+
+        assert await anext(stream) == {"headword": "ban"}
+        assert closed == [0]
+        await stream.aclose()
+        assert closed == [0, 1]
+
+    @patch("langtools.ai.functions.get_llm_client")
+    async def test_fails_over_to_configured_model(self, mock_get_client: Mock) -> None:
+        """Test that an unavailable model is replaced by the failover model."""
+        mock_get_client.return_value = _fake_client(
+            failure_rate=1, max_attempts=1, failover_model=ModelType.FAKE
+        )
+        configure_fake_llm(FakeLLMSettings(latency_distribution="constant", latency_seconds=0))
+        failovers_before = get_llm_resilience_metrics().failovers
+        try:
+            entry = await generate_base_dictionary_entry(_PARAMS, ModelType.CLAUDE_SONNET_4)
+        finally:
+            configure_fake_llm(None)
+
+        assert entry.headword == "banco"
+        assert get_llm_resilience_metrics().failovers == failovers_before + 1
+
+    def test_failover_client_runs_at_default_limits(self) -> None:
+        """Test that limits sized for the primary model are not applied to the failover model."""
+        client = _fake_client(
+            failure_rate=0,
+            max_tokens=1024,
+            thinking_budget_tokens=2048,
+            timeout=30,
+            failover_model=ModelType.FAKE,
+        )
+
+        failover = client.failover_client()
+
+        defaults = default_llm_client_settings()
+        assert failover is not None and failover.model_type == ModelType.FAKE
+        assert failover.settings.max_tokens == defaults.max_tokens
+        assert failover.settings.thinking_budget_tokens == defaults.thinking_budget_tokens
+        assert (failover.settings.timeout, failover.settings.failover_model) == (30, None)
+
+    @patch("langtools.ai.functions.get_llm_client")
+    async def test_unavailable_without_failover_is_api_error(self, mock_get_client: Mock) -> None:
+        """Test that an unavailable model surfaces as LLMAPIError."""
+        mock_get_client.return_value = _fake_client(failure_rate=1, max_attempts=1)
+
+        with pytest.raises(LLMAPIError, match="LLM API call failed"):
+            await generate_base_dictionary_entry(_PARAMS, ModelType.CLAUDE_SONNET_4)
@@ -0,0 +1,161 @@
+"""
+Tests for model routing by term complexity.
+"""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+from langtools.ai.cache import MemoryResponseCache, configure_response_cache
+from langtools.ai.client import LLMClientSettings, configure_fake_llm, thinks
+from langtools.ai.fake import FakeLLMSettings
+from langtools.ai.functions import generate_base_dictionary_entry, generate_dictionary_workflow
+from langtools.ai.models import (
+    AiDictionaryEntry,
+    AiMeaning,
+    AiMeaningTranslation,
+    BaseDictionaryParams,
+    DictionaryEntryParams,
+    ModelType,
+    RoutingPolicy,
+    ServedModel,
+)
+from langtools.ai.normalization import normalize_term
+from langtools.ai.routing import get_routing_metrics, route_call
+from langtools.ai.usage import UsageTracker
+
+_POLICY = RoutingPolicy(fast_model=ModelType.CLAUDE_SONNET_3_5)
+
+
+class TestRouteCall:
+    """Test cases for route_call function."""
+
+    def test_short_terms_take_the_fast_route(self) -> None:
+        """Test that a short term goes to the fast model without thinking."""
+        route = route_call("base", normalize_term("cat"), ModelType.CLAUDE_SONNET_4, _POLICY)
+
+        assert (route.kind, route.model, route.thinking_budget_tokens) == (
+            "fast",
+            ModelType.CLAUDE_SONNET_3_5,
+            0,
+        )
+
+    def test_long_terms_take_the_requested_model(self) -> None:
+        """Test that a long phrase goes to the requested model with its default budget."""
+        term = normalize_term("to kick the bucket at long last")
+
+        route = route_call("base", term, ModelType.CLAUDE_SONNET_4, _POLICY)
+
+        assert (route.kind, route.model, route.thinking_budget_tokens) == (
+            "heavy",
+            ModelType.CLAUDE_SONNET_4,
+            None,
+        )
+
+    def test_sibling_entry_takes_the_fast_route(self) -> None:
+        """Test that a long term with an entry for a sibling language goes fast."""
+        term = normalize_term("to kick the bucket at long last")
+
+        route = route_call("base", term, ModelType.CLAUDE_SONNET_4, _POLICY, has_sibling_entry=True)
+
+        assert route.kind == "fast"
+
+
+class TestEscalation:
+    """Test cases for escalating fast output that falls short."""
+
+    async def test_too_few_meanings_escalate_and_are_remembered(self) -> None:
+        """Test that a short fast entry is regenerated and the term then skips the fast route."""
+        policy = _POLICY.model_copy(update={"min_meanings": 4})
+        params = BaseDictionaryParams(
+            translating_term="gato", user_learning_languages="es:2,en:1", routing=policy
+        )
+        usage = UsageTracker()
+        configure_fake_llm(FakeLLMSettings(latency_distribution="constant", latency_seconds=0))
+        try:
+            entry = await generate_base_dictionary_entry(params, ModelType.CLAUDE_SONNET_4, usage)
+        finally:
+            configure_fake_llm(None)
+
+        assert len(entry.meanings) == 3
+        assert sum(stage.calls for stage in usage.usage) == 2
+        [base] = [metrics for metrics in get_routing_metrics() if metrics.stage == "base"]
+        assert base.escalations >= 1
+        route = route_call("base", normalize_term("GATO"), ModelType.CLAUDE_SONNET_4, policy)
+        assert route.kind == "heavy"
+
+
+class TestServedModel:
+    """Test cases for reporting the model that served routed calls."""
+
+    @patch("langtools.ai.functions.create_meaning_translations_chain")
+    @patch("langtools.ai.functions.create_base_dictionary_chain")
+    @patch("langtools.ai.functions.get_llm_client")
+    async def test_fast_route_output_is_attributed_to_the_fast_model(
+        self, mock_get_client: Mock, _mock_base_chain: Mock, _mock_translations_chain: Mock
+    ) -> None:
+        """Test that fast output reports the fast model and stays out of the response cache."""
+        meaning = AiMeaning(
+            headword="lobo",
+            local_id="lobo-1",
+            canonical_form="lobo",
+            alternate_spellings=[],
+            definition="Mamífero carnívoro",
+            part_of_speech="sustantivo",
+            morphology="masculino",
+            register="neutral",
+            frequency="common",
+            etymology="del latín lupus",
+            difficulty_level="beginner",
+            learning_priority="high",
+            pronunciation="ˈlo.βo",
+            example_sentences=["El lobo aúlla", "Un lobo gris"],
+        )
+        translation = AiMeaningTranslation(
+            meaning_local_id="lobo-1",
+            headword="wolf",
+            canonical_form="wolf",
+            translation_language="en",
+            translation="wolf",
+            definition="Carnivorous mammal",
+            part_of_speech="noun",
+            morphology="countable",
+            register="neutral",
+            frequency="common",
+            etymology="from Latin lupus",
+            difficulty_level="beginner",
+            learning_priority="high",
+            pronunciation="wʊlf",
+            pronunciation_tips="Rhymes with 'full'",
+            example_sentences_translations=["The wolf howls", "A grey wolf"],
+        )
+
+        def client(model: ModelType, settings: LLMClientSettings | None = None) -> Mock:
+            budget = settings.thinking_budget_tokens if settings else None
+            return Mock(
+                served_model=ServedModel(model=model, thinking=thinks(model, budget)),
+                failover_client=Mock(return_value=None),
+                generate_with_parser_base=AsyncMock(
+                    return_value=AiDictionaryEntry(
+                        headword="lobo", source_language="es", meanings=[meaning]
+                    )
+                ),
+                generate_with_parser_translations=AsyncMock(return_value=[translation]),
+            )
+
+        mock_get_client.side_effect = client
+        params = DictionaryEntryParams(
+            translating_term="lobo",
+            user_learning_languages="es:2,en:1",
+            translation_language="en",
+            routing=_POLICY,
+        )
+        cache = MemoryResponseCache()
+        configure_response_cache(cache)
+        try:
+            result = await generate_dictionary_workflow(params, ModelType.CLAUDE_SONNET_4)
+        finally:
+            configure_response_cache(None)
+
+        fast = ServedModel(model=ModelType.CLAUDE_SONNET_3_5, thinking=False)
+        assert result.metadata.base_served_by == fast
+        assert result.metadata.translations_served_by == {"en": fast}
+        assert cache.metrics().stores == 0
@@ -0,0 +1,142 @@
+"""
+Tests for single-flight request coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from langtools.ai.client import configure_fake_llm
+from langtools.ai.fake import FakeLLMSettings
+from langtools.ai.functions import generate_dictionary_workflow
+from langtools.ai.models import DictionaryEntryParams, ModelType
+from langtools.ai.singleflight import get_single_flight_metrics, single_flight
+
+
+class TestSingleFlight:
+    """Test cases for single_flight function."""
+
+    async def test_concurrent_callers_share_one_call(self) -> None:
+        """Test that identical concurrent calls run once and count coalesced callers."""
+        calls = 0
+        release = asyncio.Event()
+
+        async def generate() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "entry"
+
+        coalesced_before = get_single_flight_metrics().coalesced_requests
+        tasks = [asyncio.create_task(single_flight("shared", generate)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert get_single_flight_metrics().in_flight == 1
+        release.set()
+
+        assert await asyncio.gather(*tasks) == ["entry"] * 3
+        assert calls == 1
+        assert get_single_flight_metrics().coalesced_requests == coalesced_before + 2
+        assert get_single_flight_metrics().in_flight == 0
+
+    async def test_different_keys_run_separately(self) -> None:
+        """Test that calls with different keys are not coalesced."""
+        calls: list[str] = []
+
+        async def generate(key: str) -> str:
+            calls.append(key)
+            await asyncio.sleep(0)
+            return key
+
+        results = await asyncio.gather(
+            single_flight("a", lambda: generate("a")), single_flight("b", lambda: generate("b"))
+        )
+
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    async def test_error_propagates_and_key_is_released(self) -> None:
+        """Test that a failure reaches every waiter and the next call retries."""
+        release = asyncio.Event()
+
+        async def fail() -> str:
+            await release.wait()
+            raise ValueError("LLM failed")
+
+        tasks = [asyncio.create_task(single_flight("failing", fail)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert await single_flight("failing", lambda: asyncio.sleep(0, "retried")) == "retried"
+
+    async def test_cancelled_waiter_does_not_cancel_others(self) -> None:
+        """Test that cancelling one caller leaves the shared call running for the rest."""
+        release = asyncio.Event()
+
+        async def generate() -> str:
+            await release.wait()
+            return "entry"
+
+        first = asyncio.create_task(single_flight("cancel-one", generate))
+        second = asyncio.create_task(single_flight("cancel-one", generate))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "entry"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_last_cancelled_waiter_cancels_call(self) -> None:
+        """Test that the shared call is cancelled once every caller has gone."""
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def generate() -> str:
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "unreachable"
+
+        waiter = asyncio.create_task(single_flight("cancel-all", generate))
+        await started.wait()
+        waiter.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert get_single_flight_metrics().in_flight == 0
+
+
+class TestWorkflowCoalescing:
+    """Test cases for coalescing identical dictionary workflow generations."""
+
+    async def test_refresh_does_not_join_a_normal_generation(self) -> None:
+        """Test that a regeneration starts its own calls instead of sharing in-flight ones."""
+        params = DictionaryEntryParams(
+            translating_term="coalesce",
+            user_learning_languages="en:1",
+            translation_language="es",
+        )
+        refresh = params.model_copy(update={"refresh_response_cache": True})
+        configure_fake_llm(FakeLLMSettings(latency_distribution="constant", latency_seconds=0.05))
+        try:
+            before = get_single_flight_metrics().coalesced_requests
+            _ = await asyncio.gather(
+                generate_dictionary_workflow(params, ModelType.GTP4_O_MINI),
+                generate_dictionary_workflow(params, ModelType.GTP4_O_MINI),
+            )
+            shared = get_single_flight_metrics().coalesced_requests
+            _ = await asyncio.gather(
+                generate_dictionary_workflow(params, ModelType.GTP4_O_MINI),
+                generate_dictionary_workflow(refresh, ModelType.GTP4_O_MINI),
+            )
+        finally:
+            configure_fake_llm(None)
+
+        assert shared > before
+        assert get_single_flight_metrics().coalesced_requests == shared
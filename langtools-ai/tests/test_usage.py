@@ -0,0 +1,75 @@
+"""
+Tests for LLM usage accounting.
+"""
+
+import pytest
+from langchain_core.messages.ai import UsageMetadata
+
+from langtools.ai.models import ModelType
+from langtools.ai.usage import UsageTracker, get_llm_usage_metrics, record_usage, stage_usage
+
+
+def _metadata(
+    input_tokens: int, output_tokens: int, cache_read: int = 0, reasoning: int = 0
+) -> UsageMetadata:
+    return UsageMetadata(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=input_tokens + output_tokens,
+        input_token_details={"cache_read": cache_read, "cache_creation": 0},
+        output_token_details={"reasoning": reasoning},
+    )
+
+
+class TestStageUsage:
+    """Test cases for stage_usage function."""
+
+    def test_cost_discounts_cache_reads(self) -> None:
+        """Test that cached input tokens are priced at the cache read rate."""
+        usage = stage_usage(
+            "base",
+            ModelType.CLAUDE_SONNET_4,
+            {"claude-sonnet-4-0": _metadata(1_000_000, 100_000, cache_read=800_000)},
+            2.5,
+        )
+
+        assert usage.calls == 1
+        assert usage.cache_read_tokens == 800_000
+        # 200k uncached * $3 + 800k cached * $0.30 + 100k output * $15 per million
+        assert usage.estimated_cost_usd == pytest.approx(0.6 + 0.24 + 1.5)
+        assert usage.wall_time_seconds == 2.5
+
+    def test_reasoning_tokens_reported_as_thinking(self) -> None:
+        """Test that reasoning tokens are broken out of the output tokens."""
+        usage = stage_usage(
+            "translations",
+            ModelType.GTP5_MINI,
+            {"gpt-5-mini": _metadata(1000, 500, reasoning=300)},
+            1.0,
+        )
+
+        assert usage.output_tokens == 500
+        assert usage.thinking_tokens == 300
+
+
+class TestUsageTracker:
+    """Test cases for usage recording."""
+
+    def test_calls_accumulate_per_stage_and_model(self) -> None:
+        """Test that calls of one stage add up in the tracker and the process metrics."""
+        tracker = UsageTracker()
+        metrics_before = get_llm_usage_metrics()
+        call = stage_usage("translations", ModelType.GTP4_1_MINI, {"m": _metadata(100, 10)}, 1.0)
+        other = stage_usage("base", ModelType.GTP4_1_MINI, {"m": _metadata(50, 5)}, 1.0)
+
+        record_usage(call, tracker)
+        record_usage(call, tracker)
+        record_usage(other)
+
+        assert [(usage.stage, usage.calls) for usage in tracker.usage] == [("translations", 2)]
+        assert tracker.usage[0].input_tokens == 200
+        assert tracker.usage[0].wall_time_seconds == 2.0
+        expected_cost = 2 * call.estimated_cost_usd + other.estimated_cost_usd
+        assert get_llm_usage_metrics().estimated_cost_usd == pytest.approx(
+            metrics_before.estimated_cost_usd + expected_cost
+        )
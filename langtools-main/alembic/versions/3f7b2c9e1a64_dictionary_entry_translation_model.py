@@ -0,0 +1,37 @@
+"""dictionary_entry_translation_model
+
+Revision ID: 3f7b2c9e1a64
+Revises: 54bd1983792f
+Create Date: 2026-10-18 16:05:12.418230
+
+"""
+
+# for `sqlmodel.sql` access
+# pyright: reportAttributeAccessIssue=false
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f7b2c9e1a64"
+down_revision: Union[str, Sequence[str], None] = "54bd1983792f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Model that generated the translations, so fast-route output is not shared as the
+    # requested model's; existing rows stay NULL and count as the entry's model
+    op.add_column(
+        "dictionary_entry_translation",
+        sa.Column("model", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("dictionary_entry_translation", "model")
@@ -0,0 +1,88 @@
+"""dictionary_entry_headword_key
+
+Revision ID: 54bd1983792f
+Revises: 8d5ef5cc3998
+Create Date: 2026-10-18 14:18:32.613994
+
+"""
+
+# for `sqlmodel.sql` access
+# pyright: reportAttributeAccessIssue=false
+import re
+import unicodedata
+from typing import Sequence, Union, cast
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "54bd1983792f"
+down_revision: Union[str, Sequence[str], None] = "8d5ef5cc3998"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of langtools.ai.normalize_term as of this revision, so later changes to
+# the application's normalization do not change what this backfill computes
+_STRESS_MARKS = re.compile("[\\u0300\\u0301]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _headword_key(term: str) -> str:
+    """Case-folded NFC term without stress marks and ё, with collapsed whitespace."""
+    surface = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", term)).strip()
+    key = unicodedata.normalize("NFC", surface.casefold())
+    return _STRESS_MARKS.sub("", key).replace("ё", "е")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("dictionary_entry", sa.Column("headword_key", sa.Text(), nullable=True))
+
+    # Backfill with the normalization the application used for lookups at this revision
+    connection = op.get_bind()
+    rows = cast(
+        list[tuple[str, str]],
+        connection.execute(
+            sa.text("SELECT id, headword FROM dictionary_entry WHERE headword IS NOT NULL")
+        ).all(),
+    )
+    if rows:
+        connection.execute(
+            sa.text("UPDATE dictionary_entry SET headword_key = :key WHERE id = :id"),
+            [{"id": row_id, "key": _headword_key(term)} for row_id, term in rows],
+        )
+
+    op.drop_index("ix_dictionary_entry_shared_cache", table_name="dictionary_entry")
+    op.drop_index("ix_dictionary_entry_headword_source_language", table_name="dictionary_entry")
+    op.create_index(
+        "ix_dictionary_entry_headword_key_source_language",
+        "dictionary_entry",
+        ["headword_key", "source_language"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_dictionary_entry_shared_cache",
+        "dictionary_entry",
+        ["headword_key", "model", "prompt_version", sa.literal_column("updated_at DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_dictionary_entry_shared_cache", table_name="dictionary_entry")
+    op.drop_index("ix_dictionary_entry_headword_key_source_language", table_name="dictionary_entry")
+    op.create_index(
+        "ix_dictionary_entry_headword_source_language",
+        "dictionary_entry",
+        ["headword", "source_language"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_dictionary_entry_shared_cache",
+        "dictionary_entry",
+        ["headword", "model", "prompt_version", sa.literal_column("updated_at DESC")],
+        unique=False,
+    )
+    op.drop_column("dictionary_entry", "headword_key")
@@ -0,0 +1,48 @@
+"""dictionary_entry_shared_cache
+
+Revision ID: 8d5ef5cc3998
+Revises: abbcae4bba63
+Create Date: 2026-10-18 14:15:44.065111
+
+"""
+
+# for `sqlmodel.sql` access
+# pyright: reportAttributeAccessIssue=false
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d5ef5cc3998"
+down_revision: Union[str, Sequence[str], None] = "abbcae4bba63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Generation identity of an entry, so any user's lookup can reuse it
+    op.add_column(
+        "dictionary_entry",
+        sa.Column("model", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.add_column(
+        "dictionary_entry",
+        sa.Column("prompt_version", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.create_index(
+        "ix_dictionary_entry_shared_cache",
+        "dictionary_entry",
+        ["headword", "model", "prompt_version", sa.literal_column("updated_at DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_dictionary_entry_shared_cache", table_name="dictionary_entry")
+    op.drop_column("dictionary_entry", "prompt_version")
+    op.drop_column("dictionary_entry", "model")
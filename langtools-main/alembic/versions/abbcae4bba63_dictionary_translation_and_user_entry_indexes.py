@@ -0,0 +1,82 @@
+"""dictionary_translation_and_user_entry_indexes
+
+Revision ID: abbcae4bba63
+Revises: c2a669973d8f
+Create Date: 2026-10-18 14:13:14.896513
+
+"""
+
+# for `sqlmodel.sql` access
+# pyright: reportAttributeAccessIssue=false
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "abbcae4bba63"
+down_revision: Union[str, Sequence[str], None] = "c2a669973d8f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Latest translation lookup by entry and language, covered by a single index
+    op.drop_index(
+        op.f("ix_dictionary_entry_translation_dictionary_entry_id"),
+        table_name="dictionary_entry_translation",
+    )
+    op.create_index(
+        "ix_dictionary_entry_translation_entry_language_updated_at",
+        "dictionary_entry_translation",
+        ["dictionary_entry_id", "translation_language", sa.literal_column("updated_at DESC")],
+        unique=False,
+    )
+
+    # Keep only the most recent association per user and entry before enforcing uniqueness
+    op.execute(
+        """
+        DELETE FROM r_user_dictionary_entry AS duplicate
+        USING r_user_dictionary_entry AS kept
+        WHERE duplicate.auth_user_id = kept.auth_user_id
+          AND duplicate.dictionary_entry_id = kept.dictionary_entry_id
+          AND (duplicate.updated_at, duplicate.id) < (kept.updated_at, kept.id)
+        """
+    )
+    # The unique constraint index also serves lookups by auth_user_id
+    op.drop_index(
+        op.f("ix_r_user_dictionary_entry_auth_user_id"), table_name="r_user_dictionary_entry"
+    )
+    op.create_unique_constraint(
+        "uq_r_user_dictionary_entry_auth_user_id_dictionary_entry_id",
+        "r_user_dictionary_entry",
+        ["auth_user_id", "dictionary_entry_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "uq_r_user_dictionary_entry_auth_user_id_dictionary_entry_id",
+        "r_user_dictionary_entry",
+        type_="unique",
+    )
+    op.create_index(
+        op.f("ix_r_user_dictionary_entry_auth_user_id"),
+        "r_user_dictionary_entry",
+        ["auth_user_id"],
+        unique=False,
+    )
+
+    op.drop_index(
+        "ix_dictionary_entry_translation_entry_language_updated_at",
+        table_name="dictionary_entry_translation",
+    )
+    op.create_index(
+        op.f("ix_dictionary_entry_translation_dictionary_entry_id"),
+        "dictionary_entry_translation",
+        ["dictionary_entry_id"],
+        unique=False,
+    )
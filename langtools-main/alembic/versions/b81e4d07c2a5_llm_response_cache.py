@@ -0,0 +1,41 @@
+"""llm_response_cache
+
+Revision ID: b81e4d07c2a5
+Revises: 3f7b2c9e1a64
+Create Date: 2026-10-18 16:40:27.903114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b81e4d07c2a5"
+down_revision: Union[str, Sequence[str], None] = "3f7b2c9e1a64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backing table of langtools-ai's PostgresResponseCache (LLM_RESPONSE_CACHE)
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("key", sa.Text(), nullable=False),
+        sa.Column("value", sa.Text(), nullable=False),
+        sa.Column("expires_at", sa.Double(), nullable=True),
+        sa.Column("accessed_at", sa.Double(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        "ix_llm_response_cache_accessed_at", "llm_response_cache", ["accessed_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_llm_response_cache_accessed_at", table_name="llm_response_cache")
+    op.drop_table("llm_response_cache")
@@ -0,0 +1,73 @@
+"""dictionary_entry_jsonb_lookup_columns
+
+Revision ID: c2a669973d8f
+Revises: 909454950d14
+Create Date: 2026-10-18 14:11:16.657990
+
+"""
+
+# for `sqlmodel.sql` access
+# pyright: reportAttributeAccessIssue=false
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2a669973d8f"
+down_revision: Union[str, Sequence[str], None] = "909454950d14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Store JSON payloads as JSONB
+    for table in ("dictionary_entry", "dictionary_entry_translation"):
+        op.alter_column(
+            table,
+            "json_data",
+            existing_type=postgresql.JSON(),
+            type_=postgresql.JSONB(),
+            existing_nullable=False,
+            postgresql_using="json_data::jsonb",
+        )
+
+    # Generated lookup columns for cache checks by term and source language
+    op.add_column(
+        "dictionary_entry",
+        sa.Column("headword", sa.Text(), sa.Computed("json_data ->> 'headword'", persisted=True)),
+    )
+    op.add_column(
+        "dictionary_entry",
+        sa.Column(
+            "source_language",
+            sa.Text(),
+            sa.Computed("json_data ->> 'source_language'", persisted=True),
+        ),
+    )
+    op.create_index(
+        "ix_dictionary_entry_headword_source_language",
+        "dictionary_entry",
+        ["headword", "source_language"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_dictionary_entry_headword_source_language", table_name="dictionary_entry")
+    op.drop_column("dictionary_entry", "source_language")
+    op.drop_column("dictionary_entry", "headword")
+
+    for table in ("dictionary_entry", "dictionary_entry_translation"):
+        op.alter_column(
+            table,
+            "json_data",
+            existing_type=postgresql.JSONB(),
+            type_=postgresql.JSON(),
+            existing_nullable=False,
+            postgresql_using="json_data::json",
+        )
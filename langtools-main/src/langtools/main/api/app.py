@@ -1,19 +1,64 @@
 """Main FastAPI application."""
 
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from langtools.ai import (
+    LLMClientSettings,
+    aclose_llm_clients,
+    aclose_response_cache,
+    configure_fake_llm,
+    configure_llm_client_defaults,
+    configure_response_cache,
+    configure_token_budget_sizing,
+    response_cache_from_url,
+)
 
 from .config import settings
-from .routers import auth, dictionary
+from .database import async_engine, engine
+from .routers import auth, dictionary, metrics
 
 # Database tables are managed by Alembic migrations
 # Run: uv run alembic upgrade head
 
+configure_llm_client_defaults(
+    LLMClientSettings(
+        timeout=settings.llm_attempt_timeout,
+        max_attempts=settings.llm_max_attempts,
+        deadline=settings.llm_call_deadline,
+        failover_model=settings.llm_failover_model,
+    )
+)
+configure_token_budget_sizing(settings.llm_token_budget_sizing)
+if settings.llm_response_cache is not None:
+    configure_response_cache(
+        response_cache_from_url(
+            settings.llm_response_cache,
+            settings.llm_response_cache_ttl_seconds,
+            settings.llm_response_cache_max_entries,
+        )
+    )
+if settings.fake_llm is not None:
+    configure_fake_llm(settings.fake_llm)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
+    """Release process-wide resources on shutdown."""
+    yield
+    await aclose_llm_clients()
+    await aclose_response_cache()
+    await async_engine.dispose()
+    engine.dispose()
+
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.api_title,
     version=settings.api_version,
+    lifespan=lifespan,
 )
 
 
@@ -30,6 +75,7 @@ app.add_middleware(
 # Include routers
 app.include_router(auth.router)
 app.include_router(dictionary.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -1,23 +1,157 @@
 """Database configuration and connection management."""
 
 import json
-from sqlmodel import create_engine, Session
+import threading
+import time
+from typing import ClassVar
+
+from pydantic import BaseModel
+from sqlalchemy import event, make_url
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .config import settings
 
 
-def get_engine() -> Engine:
-    """Create and return SQLModel engine for PostgreSQL."""
-    return create_engine(
-        settings.database_url, json_serializer=lambda obj: json.dumps(obj, ensure_ascii=False)
+class DatabasePoolMetrics(BaseModel):
+    """Snapshot of a process-wide connection pool usage."""
+
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    overflow: int
+    connections_created: int
+    checkouts: int
+    checkout_wait_seconds_total: float
+    checkout_wait_seconds_max: float
+
+
+def _new_metrics() -> DatabasePoolMetrics:
+    return DatabasePoolMetrics(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        checked_out=0,
+        overflow=0,
+        connections_created=0,
+        checkouts=0,
+        checkout_wait_seconds_total=0.0,
+        checkout_wait_seconds_max=0.0,
+    )
+
+
+_metrics_lock = threading.Lock()
+_sync_metrics = _new_metrics()
+_async_metrics = _new_metrics()
+
+
+class _MeasuredQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection checkout."""
+
+    metrics: ClassVar[DatabasePoolMetrics] = _sync_metrics
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        connection = super().connect()
+        waited = time.perf_counter() - started
+        with _metrics_lock:
+            self.metrics.checkouts += 1
+            self.metrics.checkout_wait_seconds_total += waited
+            self.metrics.checkout_wait_seconds_max = max(
+                self.metrics.checkout_wait_seconds_max, waited
+            )
+        return connection
+
+
+class _MeasuredAsyncQueuePool(_MeasuredQueuePool, AsyncAdaptedQueuePool):
+    """Measured pool for the asyncpg-backed engine."""
+
+    metrics: ClassVar[DatabasePoolMetrics] = _async_metrics
+
+
+def _count_new_connection(metrics: DatabasePoolMetrics) -> None:
+    """Count physical connections opened by a pool."""
+    with _metrics_lock:
+        metrics.connections_created += 1
+
+
+def _json_serializer(obj: object) -> str:
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _create_engine() -> Engine:
+    """Create the SQLModel engine with a pooled PostgreSQL connection."""
+    created = create_engine(
+        settings.database_url,
+        json_serializer=_json_serializer,
+        poolclass=_MeasuredQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
     )
+    event.listen(created, "connect", lambda *_: _count_new_connection(_sync_metrics))
+    return created
+
+
+def _create_async_engine() -> AsyncEngine:
+    """Create the asyncpg-backed engine sharing the same pool settings."""
+    created = create_async_engine(
+        make_url(settings.database_url).set(drivername="postgresql+asyncpg"),
+        json_serializer=_json_serializer,
+        poolclass=_MeasuredAsyncQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    event.listen(created.sync_engine, "connect", lambda *_: _count_new_connection(_async_metrics))
+    return created
+
+
+# Process-wide engines and session factories shared by all query modules
+engine = _create_engine()
+session_factory = sessionmaker(bind=engine, class_=Session)
+
+async_engine = _create_async_engine()
+async_session_factory = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+def get_engine() -> Engine:
+    """Return the process-wide SQLModel engine."""
+    return engine
 
 
 def get_session() -> Session:
-    """Create and return a new database session."""
-    return Session(get_engine())
+    """Create a new database session bound to the shared connection pool."""
+    return session_factory()
+
+
+def get_async_session() -> AsyncSession:
+    """Create a new async database session that does not block the event loop."""
+    return async_session_factory()
+
+
+def _pool_snapshot(pool_engine: Engine, metrics: DatabasePoolMetrics) -> DatabasePoolMetrics:
+    pool = pool_engine.pool
+    with _metrics_lock:
+        snapshot = metrics.model_copy()
+    if isinstance(pool, QueuePool):
+        snapshot.checked_out = pool.checkedout()
+        snapshot.overflow = max(pool.overflow(), 0)
+    return snapshot
 
 
-# Create engine instance
-engine = get_engine()
+def get_pool_metrics() -> dict[str, DatabasePoolMetrics]:
+    """Return current usage of the sync and async connection pools for pool sizing."""
+    return {
+        "sync": _pool_snapshot(engine, _sync_metrics),
+        "async": _pool_snapshot(async_engine.sync_engine, _async_metrics),
+    }
@@ -1,11 +1,12 @@
 """Dictionary entry SQLModel definitions."""
 
 from datetime import datetime
-from typing import Any, cast
+from typing import Any, Optional, cast
 
 from langtools.ai import AiDictionaryEntry, AiMeaningTranslation
 import sqlalchemy as sa
-from sqlalchemy import JSON, func
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declared_attr
 from sqlmodel import Field, SQLModel
 
@@ -14,12 +15,40 @@ class DictionaryEntry(SQLModel, table=True):
     """Database model for dictionary_entry table.
 
     Stores the AI-generated dictionary entry data.
+    `headword` and `source_language` are generated from `json_data`; lookups go through
+    `headword_key`, the normalized headword, so equivalent spellings hit the same entry.
+    `model` and `prompt_version` identify the generation, so entries can be shared across users.
     """
 
     __tablename__ = cast(declared_attr[str], "dictionary_entry")
+    __table_args__ = (
+        sa.Index(
+            "ix_dictionary_entry_headword_key_source_language", "headword_key", "source_language"
+        ),
+        sa.Index(
+            "ix_dictionary_entry_shared_cache",
+            "headword_key",
+            "model",
+            "prompt_version",
+            sa.text("updated_at DESC"),
+        ),
+    )
 
     id: str = Field(primary_key=True, index=True)
-    json_data: dict[str, Any] = Field(sa_column=sa.Column(JSON, nullable=False))  # type: ignore[valid-type]
+    json_data: dict[str, Any] = Field(sa_column=sa.Column(JSONB, nullable=False))  # type: ignore[valid-type]
+    headword: Optional[str] = Field(
+        default=None,
+        sa_column=sa.Column(sa.Text, sa.Computed("json_data ->> 'headword'", persisted=True)),
+    )
+    source_language: Optional[str] = Field(
+        default=None,
+        sa_column=sa.Column(
+            sa.Text, sa.Computed("json_data ->> 'source_language'", persisted=True)
+        ),
+    )
+    headword_key: Optional[str] = Field(default=None, sa_column=sa.Column(sa.Text))
+    model: Optional[str] = Field(default=None)
+    prompt_version: Optional[str] = Field(default=None)
     created_at: datetime = Field(default_factory=lambda: datetime.now(), nullable=False)
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(),
@@ -39,9 +68,16 @@ class RUserDictionaryEntry(SQLModel, table=True):
     """
 
     __tablename__ = cast(declared_attr[str], "r_user_dictionary_entry")
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "auth_user_id",
+            "dictionary_entry_id",
+            name="uq_r_user_dictionary_entry_auth_user_id_dictionary_entry_id",
+        ),
+    )
 
     id: str = Field(primary_key=True, index=True)
-    auth_user_id: str = Field(index=True, nullable=False)
+    auth_user_id: str = Field(nullable=False)
     dictionary_entry_id: str = Field(index=True, nullable=False)
     created_at: datetime = Field(default_factory=lambda: datetime.now(), nullable=False)
     updated_at: datetime = Field(
@@ -58,11 +94,20 @@ class DictionaryEntryTranslation(SQLModel, table=True):
     """
 
     __tablename__ = cast(declared_attr[str], "dictionary_entry_translation")
+    __table_args__ = (
+        sa.Index(
+            "ix_dictionary_entry_translation_entry_language_updated_at",
+            "dictionary_entry_id",
+            "translation_language",
+            sa.text("updated_at DESC"),
+        ),
+    )
 
     id: str = Field(primary_key=True, index=True)
-    dictionary_entry_id: str = Field(index=True, nullable=False)
+    dictionary_entry_id: str = Field(nullable=False)
     translation_language: str = Field(index=True, nullable=False)
-    json_data: list[dict[str, Any]] = Field(sa_column=sa.Column(JSON, nullable=False))  # type: ignore[valid-type]
+    model: Optional[str] = Field(default=None)
+    json_data: list[dict[str, Any]] = Field(sa_column=sa.Column(JSONB, nullable=False))  # type: ignore[valid-type]
     created_at: datetime = Field(default_factory=lambda: datetime.now(), nullable=False)
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(),
@@ -0,0 +1,23 @@
+"""LLM response cache SQLModel definition."""
+
+from typing import Optional, cast
+
+import sqlalchemy as sa
+from sqlalchemy.orm import declared_attr
+from sqlmodel import Field, SQLModel
+
+
+class LLMResponseCache(SQLModel, table=True):
+    """Database model for llm_response_cache table.
+
+    Backs langtools-ai's PostgresResponseCache: LLM responses by content hash, with
+    expiry and last access as epoch seconds for TTL and least recently used eviction.
+    """
+
+    __tablename__ = cast(declared_attr[str], "llm_response_cache")
+    __table_args__ = (sa.Index("ix_llm_response_cache_accessed_at", "accessed_at"),)
+
+    key: str = Field(sa_column=sa.Column(sa.Text, primary_key=True))
+    value: str = Field(sa_column=sa.Column(sa.Text, nullable=False))
+    expires_at: Optional[float] = Field(default=None, sa_column=sa.Column(sa.Double))
+    accessed_at: float = Field(sa_column=sa.Column(sa.Double, nullable=False))
@@ -4,9 +4,12 @@ import json
 from datetime import datetime
 from typing import Any, Optional
 
-from langtools.ai import AiDictionaryEntry, AiMeaningTranslation
-from sqlalchemy import func, select
-from sqlmodel import Session
+from langtools.ai import AiDictionaryEntry, AiMeaningTranslation, normalize_term
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.orm import aliased
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..models import DictionaryEntry, DictionaryEntryTranslation, RUserDictionaryEntry
 from langtools.main.api.utils.id_generation import generate_pg_uuid
@@ -19,113 +22,314 @@ def _serialize_with_unicode(obj: dict[str, Any]) -> dict[str, Any]:  # type: ign
     return json.loads(json_str)  # type: ignore[no-any-return]
 
 
-def find_latest_dictionary_entry_for_user(
-    session: Session, auth_user_id: str, term: str, source_language: Optional[str] = None
+async def find_latest_dictionary_entry_for_user(
+    session: AsyncSession, auth_user_id: str, term: str, source_language: Optional[str] = None
 ) -> Optional[DictionaryEntry]:
     """Find the latest dictionary entry for a user's term and optionally source language."""
     # Build where clause step by step
     stmt = (
         select(DictionaryEntry)
-        .join(RUserDictionaryEntry, DictionaryEntry.id == RUserDictionaryEntry.dictionary_entry_id)  # type: ignore[arg-type]
-        .where(RUserDictionaryEntry.auth_user_id == auth_user_id)  # type: ignore[arg-type]
-        .where(func.json_extract_path_text(DictionaryEntry.json_data, "headword") == term)  # type: ignore[arg-type]
+        .join(
+            RUserDictionaryEntry,
+            col(DictionaryEntry.id) == col(RUserDictionaryEntry.dictionary_entry_id),
+        )
+        .where(RUserDictionaryEntry.auth_user_id == auth_user_id)
+        .where(DictionaryEntry.headword_key == normalize_term(term).key)
     )
 
     # Add source_language condition if provided
     if source_language:
-        stmt = stmt.where(
-            func.json_extract_path_text(DictionaryEntry.json_data, "source_language")  # type: ignore[arg-type]
-            == source_language
+        stmt = stmt.where(DictionaryEntry.source_language == source_language)
+
+    stmt = stmt.order_by(col(DictionaryEntry.updated_at).desc()).limit(1)
+    result = await session.exec(stmt)
+    return result.first()
+
+
+def _shared_entry(
+    model: str, prompt_version: str, source_language: Optional[str]
+) -> sa.ColumnElement[bool]:
+    """Entries any user generated with a model and prompt version for a source language.
+
+    Without a source language only terms whose shared entries all have the same source
+    language match, so a homograph is not served in another language's sense.
+    """
+    condition = sa.and_(
+        col(DictionaryEntry.model) == model,
+        col(DictionaryEntry.prompt_version) == prompt_version,
+    )
+    if source_language:
+        return sa.and_(condition, col(DictionaryEntry.source_language) == source_language)
+
+    other = aliased(DictionaryEntry)
+    other_language = (
+        sa.exists()
+        .where(col(other.headword_key) == col(DictionaryEntry.headword_key))
+        .where(col(other.model) == model)
+        .where(col(other.prompt_version) == prompt_version)
+        .where(col(other.source_language).is_distinct_from(col(DictionaryEntry.source_language)))
+    )
+    return sa.and_(condition, ~other_language)
+
+
+async def find_latest_shared_dictionary_entry(
+    session: AsyncSession,
+    term: str,
+    model: str,
+    prompt_version: str,
+    source_language: Optional[str] = None,
+) -> Optional[DictionaryEntry]:
+    """Find the latest entry any user generated for a term with the same model and prompt."""
+    stmt = (
+        select(DictionaryEntry)
+        .where(DictionaryEntry.headword_key == normalize_term(term).key)
+        .where(_shared_entry(model, prompt_version, source_language))
+        .order_by(col(DictionaryEntry.updated_at).desc())
+        .limit(1)
+    )
+    result = await session.exec(stmt)
+    return result.first()
+
+
+async def has_dictionary_entry_for_term(session: AsyncSession, term: str) -> bool:
+    """Whether any user generated an entry for a term, with any model, prompt or language."""
+    stmt = (
+        select(DictionaryEntry.id)
+        .where(DictionaryEntry.headword_key == normalize_term(term).key)
+        .limit(1)
+    )
+    result = await session.exec(stmt)
+    return result.first() is not None
+
+
+async def find_latest_dictionary_entries_for_terms(
+    session: AsyncSession,
+    auth_user_id: str,
+    terms: list[str],
+    model: str,
+    prompt_version: str,
+    source_language: Optional[str] = None,
+) -> dict[str, DictionaryEntry]:
+    """Find the latest entry per term in one query, keyed by normalized term.
+
+    An entry linked to the user wins; otherwise an entry any user generated with the
+    same model, prompt version and source language is used. With `source_language`
+    only entries for it are found.
+    """
+    keys = list({normalize_term(term).key for term in terms})
+    linked_to_user = (
+        sa.exists()
+        .where(col(RUserDictionaryEntry.dictionary_entry_id) == col(DictionaryEntry.id))
+        .where(col(RUserDictionaryEntry.auth_user_id) == auth_user_id)
+    )
+    stmt = (
+        select(DictionaryEntry)
+        .where(col(DictionaryEntry.headword_key).in_(keys))
+        .where(sa.or_(linked_to_user, _shared_entry(model, prompt_version, source_language)))
+        .distinct(col(DictionaryEntry.headword_key))
+        .order_by(
+            col(DictionaryEntry.headword_key),
+            linked_to_user.desc(),
+            col(DictionaryEntry.updated_at).desc(),
         )
+    )
+    if source_language:
+        stmt = stmt.where(DictionaryEntry.source_language == source_language)
+    result = await session.exec(stmt)
+    return {entry.headword_key: entry for entry in result if entry.headword_key is not None}
+
 
-    stmt = stmt.order_by(DictionaryEntry.updated_at.desc()).limit(1)  # type: ignore[attr-defined]
-    result = session.exec(stmt)  # type: ignore[arg-type]
-    return result.scalar_one_or_none()
+def _translated_by(model: str) -> sa.ColumnElement[bool]:
+    """Translations generated by `model`, or stored before translations recorded one."""
+    return sa.or_(
+        col(DictionaryEntryTranslation.model).is_(None),
+        col(DictionaryEntryTranslation.model) == model,
+    )
 
 
-def find_latest_translation_for_entry(
-    session: Session, dictionary_entry_id: str, translation_language: str
+async def find_latest_translation_for_entry(
+    session: AsyncSession, dictionary_entry_id: str, translation_language: str, model: str
 ) -> Optional[DictionaryEntryTranslation]:
-    """Find the latest translation for a dictionary entry in a specific language."""
+    """Find the latest translation a model made for a dictionary entry in a specific language."""
     stmt = (
         select(DictionaryEntryTranslation)
-        .where(DictionaryEntryTranslation.dictionary_entry_id == dictionary_entry_id)  # type: ignore[arg-type]
-        .where(DictionaryEntryTranslation.translation_language == translation_language)  # type: ignore[arg-type]
-        .order_by(DictionaryEntryTranslation.updated_at.desc())  # type: ignore[attr-defined]
+        .where(DictionaryEntryTranslation.dictionary_entry_id == dictionary_entry_id)
+        .where(DictionaryEntryTranslation.translation_language == translation_language)
+        .where(_translated_by(model))
+        .order_by(col(DictionaryEntryTranslation.updated_at).desc())
         .limit(1)
     )
-    result = session.exec(stmt)  # type: ignore[arg-type]
-    return result.scalar_one_or_none()
+    result = await session.exec(stmt)
+    return result.first()
 
 
-def create_dictionary_entry(
-    session: Session, auth_user_id: str, ai_entry: AiDictionaryEntry
-) -> DictionaryEntry:
-    """Create a new dictionary entry and associate it with a user."""
-    # Create the dictionary entry with proper Unicode serialization
-    entry = DictionaryEntry(
-        id=generate_pg_uuid(),
-        json_data=_serialize_with_unicode(ai_entry.model_dump()),
+async def find_latest_user_translation_for_term(
+    session: AsyncSession,
+    auth_user_id: str,
+    term: str,
+    source_language: str,
+    translation_language: str,
+    model: str,
+) -> Optional[tuple[DictionaryEntry, DictionaryEntryTranslation]]:
+    """Find the user's latest translation of a term in a language by a model, with its entry.
+
+    Unlike `find_latest_translation_for_entry`, the translation may belong to any of the
+    user's entries for the term, so it can be reused for an updated entry.
+    """
+    stmt = (
+        select(DictionaryEntry, DictionaryEntryTranslation)
+        .join(
+            DictionaryEntryTranslation,
+            col(DictionaryEntry.id) == col(DictionaryEntryTranslation.dictionary_entry_id),
+        )
+        .join(
+            RUserDictionaryEntry,
+            col(DictionaryEntry.id) == col(RUserDictionaryEntry.dictionary_entry_id),
+        )
+        .where(RUserDictionaryEntry.auth_user_id == auth_user_id)
+        .where(DictionaryEntry.headword_key == normalize_term(term).key)
+        .where(DictionaryEntry.source_language == source_language)
+        .where(DictionaryEntryTranslation.translation_language == translation_language)
+        .where(_translated_by(model))
+        .order_by(col(DictionaryEntryTranslation.updated_at).desc())
+        .limit(1)
+    )
+    result = await session.exec(stmt)
+    return result.first()
+
+
+async def find_latest_translations_for_entries(
+    session: AsyncSession,
+    dictionary_entry_ids: list[str],
+    translation_languages: list[str],
+    model: str,
+) -> dict[tuple[str, str], DictionaryEntryTranslation]:
+    """Find the latest translation a model made per entry and language in one query.
+
+    Returns:
+        Translations keyed by (dictionary_entry_id, translation_language)
+    """
+    stmt = (
+        select(DictionaryEntryTranslation)
+        .where(col(DictionaryEntryTranslation.dictionary_entry_id).in_(dictionary_entry_ids))
+        .where(col(DictionaryEntryTranslation.translation_language).in_(translation_languages))
+        .where(_translated_by(model))
+        .distinct(
+            col(DictionaryEntryTranslation.dictionary_entry_id),
+            col(DictionaryEntryTranslation.translation_language),
+        )
+        .order_by(
+            col(DictionaryEntryTranslation.dictionary_entry_id),
+            col(DictionaryEntryTranslation.translation_language),
+            col(DictionaryEntryTranslation.updated_at).desc(),
+        )
     )
-    session.add(entry)
+    result = await session.exec(stmt)
+    return {
+        (translation.dictionary_entry_id, translation.translation_language): translation
+        for translation in result
+    }
+
 
-    # Create the user association
-    user_entry = RUserDictionaryEntry(
-        id=generate_pg_uuid(),
-        auth_user_id=auth_user_id,
-        dictionary_entry_id=entry.id,
+def _insert_entry(
+    entry_id: str, ai_entry: AiDictionaryEntry, model: str, prompt_version: str, now: datetime
+) -> Insert:
+    return insert(DictionaryEntry).values(
+        id=entry_id,
+        json_data=_serialize_with_unicode(ai_entry.model_dump()),
+        headword_key=normalize_term(ai_entry.headword).key,
+        model=model,
+        prompt_version=prompt_version,
+        created_at=now,
+        updated_at=now,
     )
-    session.add(user_entry)
 
-    session.flush()
-    return entry
+
+def _upsert_user_link(auth_user_id: str, dictionary_entry_id: str, now: datetime) -> Insert:
+    return (
+        insert(RUserDictionaryEntry)
+        .values(
+            id=generate_pg_uuid(),
+            auth_user_id=auth_user_id,
+            dictionary_entry_id=dictionary_entry_id,
+            created_at=now,
+            updated_at=now,
+        )
+        .on_conflict_do_update(
+            index_elements=["auth_user_id", "dictionary_entry_id"],
+            set_={"updated_at": now},
+        )
+    )
 
 
-def create_dictionary_translation(
-    session: Session,
+def _insert_translations(
     dictionary_entry_id: str,
-    translation_language: str,
-    translations: list[AiMeaningTranslation],
-) -> DictionaryEntryTranslation:
-    """Create a new translation for a dictionary entry."""
-    # Serialize translations with proper Unicode handling
-    translation_data = [_serialize_with_unicode(t.model_dump()) for t in translations]
-
-    translation = DictionaryEntryTranslation(
-        id=generate_pg_uuid(),
-        dictionary_entry_id=dictionary_entry_id,
-        translation_language=translation_language,
-        json_data=translation_data,
+    translations: dict[str, list[AiMeaningTranslation]],
+    models: dict[str, str],
+    now: datetime,
+) -> Insert:
+    return insert(DictionaryEntryTranslation).values(
+        [
+            {
+                "id": generate_pg_uuid(),
+                "dictionary_entry_id": dictionary_entry_id,
+                "translation_language": translation_language,
+                "model": models[translation_language],
+                "json_data": [
+                    _serialize_with_unicode(t.model_dump()) for t in language_translations
+                ],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for translation_language, language_translations in translations.items()
+        ]
     )
-    session.add(translation)
-    session.flush()
-    return translation
 
 
-def associate_user_with_dictionary_entry(
-    session: Session, auth_user_id: str, dictionary_entry_id: str
-) -> RUserDictionaryEntry:
-    """Associate a user with an existing dictionary entry."""
-    # Check if association already exists
-    stmt = (
-        select(RUserDictionaryEntry)
-        .where(RUserDictionaryEntry.auth_user_id == auth_user_id)  # type: ignore[arg-type]
-        .where(RUserDictionaryEntry.dictionary_entry_id == dictionary_entry_id)  # type: ignore[arg-type]
-    )
-    result = session.exec(stmt)  # type: ignore[arg-type]
-    existing = result.scalar_one_or_none()
-
-    if existing:
-        # Update the updated_at timestamp
-        existing.updated_at = datetime.now()
-        return existing
-
-    # Create new association
-    user_entry = RUserDictionaryEntry(
-        id=generate_pg_uuid(),
-        auth_user_id=auth_user_id,
-        dictionary_entry_id=dictionary_entry_id,
+async def associate_user_with_dictionary_entry(
+    session: AsyncSession, auth_user_id: str, dictionary_entry_id: str
+) -> None:
+    """Associate a user with an existing dictionary entry, refreshing updated_at if linked."""
+    connection = await session.connection()
+    await connection.execute(_upsert_user_link(auth_user_id, dictionary_entry_id, datetime.now()))
+
+
+async def save_dictionary_workflow_result(
+    session: AsyncSession,
+    auth_user_id: str,
+    ai_entry: AiDictionaryEntry,
+    model: str,
+    prompt_version: str,
+    translations: dict[str, list[AiMeaningTranslation]],
+    translation_models: dict[str, str],
+    existing_entry_id: Optional[str] = None,
+) -> str:
+    """Persist a workflow result in a single statement and return the dictionary entry id.
+
+    Args:
+        session: Database session
+        auth_user_id: User to link the entry to
+        ai_entry: Base entry, inserted only when `existing_entry_id` is not given
+        model: Model that generated `ai_entry`
+        prompt_version: Prompt version that generated `ai_entry`
+        translations: New translations to insert by language, omitting already stored ones
+        translation_models: Model that generated the translations of each language
+        existing_entry_id: Id of an already stored entry to link instead of inserting
+    """
+    now = datetime.now()
+    entry_id = existing_entry_id or generate_pg_uuid()
+
+    statements: list[Insert] = []
+    if existing_entry_id is None:
+        statements.append(_insert_entry(entry_id, ai_entry, model, prompt_version, now))
+    statements.append(_upsert_user_link(auth_user_id, entry_id, now))
+    if translations:
+        statements.append(_insert_translations(entry_id, translations, translation_models, now))
+
+    # Data-modifying CTEs run together in one round trip
+    stmt = sa.select(sa.literal(entry_id)).add_cte(
+        *(statement.cte(f"write_{index}") for index, statement in enumerate(statements))
     )
-    session.add(user_entry)
-    session.flush()
-    return user_entry
+    connection = await session.connection()
+    await connection.execute(stmt)
+    return entry_id
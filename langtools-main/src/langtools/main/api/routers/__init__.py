@@ -1,5 +1,5 @@
 """API routers."""
 
-from . import auth, dictionary
+from . import auth, dictionary, metrics
 
-__all__ = ["auth", "dictionary"]
+__all__ = ["auth", "dictionary", "metrics"]
@@ -1,25 +1,41 @@
 """Dictionary endpoints router."""
 
+import json
 import traceback
+from collections.abc import AsyncIterator
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from langtools.ai import (
+    BASE_DICTIONARY_PROMPT_VERSION,
     AiDictionaryEntry,
     AiMeaningTranslation,
     BaseDictionaryParams,
+    CachedDictionaryEntry,
+    DictionaryBatchHooks,
+    DictionaryBatchItemResult,
+    DictionaryBatchParams,
     DictionaryEntryParams,
     DictionaryWorkflowHooks,
     DictionaryWorkflowResult,
+    HedgingPolicy,
     LLMAPIError,
     ModelType,
+    PreviousTranslations,
+    RoutingPolicy,
     TranslationParams,
     ValidationError,
     generate_dictionary_workflow,
+    generate_dictionary_workflow_batch,
+    generate_dictionary_workflow_stream,
+    normalize_term,
+    primary_served_model,
 )
 from pydantic import BaseModel, Field
 from ..auth.dependencies import get_current_auth_user
-from ..database import get_session
+from ..config import settings
+from ..database import get_async_session
 from ..models import AuthUser
 from ..pg_queries import dictionary as dictionary_queries
 
@@ -31,6 +47,18 @@ class GenerateDictionaryRequest(BaseModel):
     translation_language: str = Field(
         description="Target language for translations in BCP 47 format (e.g., 'en', 'es', 'fr')"
     )
+    translation_languages: list[str] = Field(
+        default_factory=list,
+        description="Further target languages translated in the same request",
+    )
+    source_language: Optional[str] = Field(
+        default=None,
+        description=(
+            "Source language of the term in BCP 47 format, if known. Entries generated "
+            "for other users are reused only in this language, or when unset only for "
+            "terms they all give the same source language"
+        ),
+    )
     model: ModelType = Field(
         default=ModelType.CLAUDE_SONNET_4,
         description="LLM model to use for generation",
@@ -43,6 +71,240 @@ class GenerateDictionaryRequest(BaseModel):
         default=False,
         description="Force regeneration of translations only",
     )
+    meanings_per_translation_call: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Translate meanings concurrently in groups of this size (one call if unset)",
+    )
+    pipeline_translations: bool = Field(
+        default=False,
+        description="Translate each meaning as soon as it is generated instead of after the entry",
+    )
+    hedging: Optional[HedgingPolicy] = Field(
+        default=None,
+        description="Duplicate LLM calls slower than usual and keep the first result",
+    )
+    routing: Optional[RoutingPolicy] = Field(
+        default=None,
+        description="Route simple terms to a fast model (the server default if unset)",
+    )
+
+
+class GenerateDictionaryBatchRequest(BaseModel):
+    """Request model for batch dictionary generation endpoint."""
+
+    terms: list[str] = Field(
+        min_length=1, max_length=1000, description="Words or phrases to define and translate"
+    )
+    translation_language: str = Field(
+        description="Target language for translations in BCP 47 format (e.g., 'en', 'es', 'fr')"
+    )
+    translation_languages: list[str] = Field(
+        default_factory=list,
+        description="Further target languages translated in the same request",
+    )
+    source_language: Optional[str] = Field(
+        default=None,
+        description=(
+            "Source language of the terms in BCP 47 format, if known. Entries generated "
+            "for other users are reused only in this language, or when unset only for "
+            "terms they all give the same source language"
+        ),
+    )
+    model: ModelType = Field(
+        default=ModelType.CLAUDE_SONNET_4,
+        description="LLM model to use for generation",
+    )
+    regenerate_full: bool = Field(
+        default=False,
+        description="Force regeneration of the complete dictionary entries",
+    )
+    regenerate_translations: bool = Field(
+        default=False,
+        description="Force regeneration of translations only",
+    )
+    meanings_per_translation_call: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Translate meanings concurrently in groups of this size (one call if unset)",
+    )
+    max_concurrency: int = Field(
+        default=4, ge=1, le=16, description="Maximum number of terms generated at the same time"
+    )
+    hedging: Optional[HedgingPolicy] = Field(
+        default=None,
+        description="Duplicate LLM calls slower than usual and keep the first result",
+    )
+    routing: Optional[RoutingPolicy] = Field(
+        default=None,
+        description="Route simple terms to a fast model (the server default if unset)",
+    )
+
+
+class _WorkflowCacheState:
+    """Entry id and cached languages resolved by the workflow hooks, reused when saving."""
+
+    def __init__(self) -> None:
+        self.entry_id: Optional[str] = None
+        self.cached_languages: set[str] = set()
+
+
+def _create_workflow_hooks(
+    request: GenerateDictionaryRequest, auth_user_id: str
+) -> tuple[DictionaryWorkflowHooks, _WorkflowCacheState]:
+    """Create hooks that serve the workflow from the database unless regeneration is forced."""
+    state = _WorkflowCacheState()
+
+    async def retrieve_base_entry(
+        base_params: BaseDictionaryParams,
+    ) -> Optional[AiDictionaryEntry]:
+        """Retrieve cached base entry from database if not forced to regenerate."""
+        if request.regenerate_full:
+            return None
+
+        async with get_async_session() as session:
+            # Search for any entry with this term, in any source language unless given
+            entry = await dictionary_queries.find_latest_dictionary_entry_for_user(
+                session, auth_user_id, base_params.translating_term, request.source_language
+            )
+            if entry is None:
+                # Fall back to an entry generated for another user
+                entry = await dictionary_queries.find_latest_shared_dictionary_entry(
+                    session,
+                    base_params.translating_term,
+                    primary_served_model(request.model).label,
+                    BASE_DICTIONARY_PROMPT_VERSION,
+                    request.source_language,
+                )
+
+            if entry:
+                state.entry_id = entry.id
+                return entry.get_ai_dictionary_entry()
+            return None
+
+    async def retrieve_translations(
+        trans_params: TranslationParams,
+    ) -> Optional[list[AiMeaningTranslation]]:
+        """Retrieve cached translations from database if not forced to regenerate."""
+        if request.regenerate_full or request.regenerate_translations:
+            return None
+
+        async with get_async_session() as session:
+            if state.entry_id is None:
+                # Find the dictionary entry by term and exact source language
+                entry = await dictionary_queries.find_latest_dictionary_entry_for_user(
+                    session,
+                    auth_user_id,
+                    trans_params.entry.headword,
+                    trans_params.entry.source_language,
+                )
+                if entry is None:
+                    return None
+                state.entry_id = entry.id
+
+            # Then find translations for this entry
+            translation = await dictionary_queries.find_latest_translation_for_entry(
+                session,
+                state.entry_id,
+                trans_params.translation_language,
+                primary_served_model(request.model).label,
+            )
+            if translation is None:
+                return None
+            translations = translation.get_ai_meaning_translations()
+            # Incomplete translations are only reused, so the completed ones get saved
+            translated = {t.meaning_local_id for t in translations}
+            if all(meaning.local_id in translated for meaning in trans_params.entry.meanings):
+                state.cached_languages.add(trans_params.translation_language)
+            return translations
+
+    async def retrieve_previous_translations(
+        trans_params: TranslationParams,
+    ) -> Optional[PreviousTranslations]:
+        """Retrieve the user's latest translations of the term to update incrementally."""
+        if request.regenerate_full or request.regenerate_translations:
+            return None
+
+        async with get_async_session() as session:
+            found = await dictionary_queries.find_latest_user_translation_for_term(
+                session,
+                auth_user_id,
+                trans_params.entry.headword,
+                trans_params.entry.source_language,
+                trans_params.translation_language,
+                primary_served_model(request.model).label,
+            )
+            if found is None:
+                return None
+            entry, translation = found
+            return PreviousTranslations(
+                entry=entry.get_ai_dictionary_entry(),
+                translations=translation.get_ai_meaning_translations(),
+            )
+
+    async def has_sibling_entry(base_params: BaseDictionaryParams) -> bool:
+        """Whether the term was generated before for another language, model or prompt."""
+        async with get_async_session() as session:
+            return await dictionary_queries.has_dictionary_entry_for_term(
+                session, base_params.translating_term
+            )
+
+    hooks = DictionaryWorkflowHooks(
+        retrieve_base_entry=retrieve_base_entry,
+        retrieve_translations=retrieve_translations,
+        retrieve_previous_translations=retrieve_previous_translations,
+        has_sibling_entry=has_sibling_entry,
+    )
+    return hooks, state
+
+
+def _served_labels(
+    model: ModelType, result: DictionaryWorkflowResult
+) -> tuple[str, dict[str, str]]:
+    """
+    Model labels to store the entry and each language's translations under.
+
+    Generated output is labelled with the model and thinking mode that served it, so
+    fast-route or failover output is not shared as the requested model's; cached or
+    reused output keeps the requested model's label it was looked up with.
+    """
+    primary = primary_served_model(model).label
+    served = result.metadata
+    entry_model = served.base_served_by.label if served.base_served_by else primary
+    translation_models = {
+        language: served.translations_served_by[language].label
+        if language in served.translations_served_by
+        else primary
+        for language in result.translations_by_language
+    }
+    return entry_model, translation_models
+
+
+async def _save_workflow_result(
+    request: GenerateDictionaryRequest,
+    auth_user_id: str,
+    result: DictionaryWorkflowResult,
+    state: _WorkflowCacheState,
+) -> None:
+    """Save entry, user association and new translations in one round trip."""
+    new_translations = {
+        language: translations
+        for language, translations in result.translations_by_language.items()
+        if language not in state.cached_languages
+    }
+    entry_model, translation_models = _served_labels(request.model, result)
+    async with get_async_session() as session:
+        await dictionary_queries.save_dictionary_workflow_result(
+            session,
+            auth_user_id,
+            result.entry,
+            entry_model,
+            BASE_DICTIONARY_PROMPT_VERSION,
+            new_translations,
+            translation_models,
+            existing_entry_id=state.entry_id,
+        )
+        await session.commit()
 
 
 router = APIRouter(prefix="/dictionary_entry", tags=["dictionary"])
@@ -72,98 +334,21 @@ async def generate_dictionary_entry(
         params = DictionaryEntryParams(
             translating_term=request.term,
             translation_language=request.translation_language,
+            translation_languages=request.translation_languages,
             user_learning_languages="",  # TODO: Get from user profile
+            meanings_per_translation_call=request.meanings_per_translation_call,
+            pipeline_translations=request.pipeline_translations,
+            hedging=request.hedging,
+            refresh_response_cache=request.regenerate_full or request.regenerate_translations,
+            routing=request.routing or settings.llm_routing,
         )
 
-        # Create hooks for database retrieval
-        async def retrieve_base_entry(
-            base_params: BaseDictionaryParams,
-        ) -> Optional[AiDictionaryEntry]:
-            """Retrieve cached base entry from database if not forced to regenerate."""
-            if request.regenerate_full:
-                return None
-
-            # Use synchronous database session
-            with get_session() as session:
-                # Search for any entry with this term, regardless of source language
-                entry = dictionary_queries.find_latest_dictionary_entry_for_user(
-                    session, current_user.id, base_params.translating_term
-                )
-
-                if entry:
-                    return entry.get_ai_dictionary_entry()
-                return None
-
-        async def retrieve_translations(
-            trans_params: TranslationParams,
-        ) -> Optional[list[AiMeaningTranslation]]:
-            """Retrieve cached translations from database if not forced to regenerate."""
-            if request.regenerate_full or request.regenerate_translations:
-                return None
-
-            with get_session() as session:
-                # First, find the dictionary entry by term and exact source language
-                entry = dictionary_queries.find_latest_dictionary_entry_for_user(
-                    session,
-                    current_user.id,
-                    trans_params.entry.headword,
-                    trans_params.entry.source_language,
-                )
-
-                if entry:
-                    # Then find translations for this entry
-                    translation = dictionary_queries.find_latest_translation_for_entry(
-                        session, entry.id, request.translation_language
-                    )
-                    if translation:
-                        return translation.get_ai_meaning_translations()
-                return None
-
-        # Create hooks object
-        hooks = DictionaryWorkflowHooks(
-            retrieve_base_entry=retrieve_base_entry,
-            retrieve_translations=retrieve_translations,
-        )
+        hooks, cache_state = _create_workflow_hooks(request, current_user.id)
 
         # Execute the workflow with hooks
         result = await generate_dictionary_workflow(params, request.model, hooks)
 
-        # Save results to database
-        with get_session() as session:
-            # Check if we already have this entry (search by term and exact source language)
-            existing_entry = dictionary_queries.find_latest_dictionary_entry_for_user(
-                session, current_user.id, result.entry.headword, result.entry.source_language
-            )
-
-            if existing_entry and not request.regenerate_full:
-                # Use existing entry, just ensure user association
-                dictionary_queries.associate_user_with_dictionary_entry(
-                    session, current_user.id, existing_entry.id
-                )
-                entry_id = existing_entry.id
-            else:
-                # Create new entry
-                new_entry = dictionary_queries.create_dictionary_entry(
-                    session, current_user.id, result.entry
-                )
-                entry_id = new_entry.id
-
-            # Check if we need to save translations
-            existing_translation = dictionary_queries.find_latest_translation_for_entry(
-                session, entry_id, request.translation_language
-            )
-
-            if (
-                not existing_translation
-                or request.regenerate_translations
-                or request.regenerate_full
-            ):
-                # Create new translation
-                dictionary_queries.create_dictionary_translation(
-                    session, entry_id, request.translation_language, result.translations
-                )
-
-            session.commit()
+        await _save_workflow_result(request, current_user.id, result, cache_state)
 
         return result
 
@@ -185,3 +370,186 @@ async def generate_dictionary_entry(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}",
         )
+
+
+@router.post(
+    "/generate_batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def generate_dictionary_entry_batch(
+    request: GenerateDictionaryBatchRequest,
+    current_user: AuthUser = Depends(get_current_auth_user),
+) -> StreamingResponse:
+    """
+    Generate dictionary entries for a list of terms, streaming results as they complete.
+
+    Each line of the response is a JSON `DictionaryBatchItemResult`. Cached terms come
+    first; a term that fails carries an `error` instead of a `result`.
+
+    Args:
+        request: Request containing terms, translation languages, and optional parameters
+        current_user: Current authenticated user
+
+    Returns:
+        Newline-delimited JSON stream with one result per unique term
+    """
+    params = DictionaryBatchParams(
+        translating_terms=request.terms,
+        user_learning_languages="",  # TODO: Get from user profile
+        translation_language=request.translation_language,
+        translation_languages=request.translation_languages,
+        meanings_per_translation_call=request.meanings_per_translation_call,
+        max_concurrency=request.max_concurrency,
+        hedging=request.hedging,
+        refresh_response_cache=request.regenerate_full or request.regenerate_translations,
+        routing=request.routing or settings.llm_routing,
+    )
+    languages = list(dict.fromkeys([request.translation_language, *request.translation_languages]))
+
+    # Entry id and cached languages per term from the bulk lookup, reused when saving
+    stored_entries: dict[str, tuple[str, set[str]]] = {}
+
+    async def retrieve_cached_entries(terms: list[str]) -> dict[str, CachedDictionaryEntry]:
+        """Retrieve cached entries and translations for all terms with one query per table."""
+        if request.regenerate_full:
+            return {}
+
+        async with get_async_session() as session:
+            entries = await dictionary_queries.find_latest_dictionary_entries_for_terms(
+                session,
+                current_user.id,
+                terms,
+                primary_served_model(request.model).label,
+                BASE_DICTIONARY_PROMPT_VERSION,
+                request.source_language,
+            )
+            translations = (
+                {}
+                if request.regenerate_translations
+                else await dictionary_queries.find_latest_translations_for_entries(
+                    session,
+                    [entry.id for entry in entries.values()],
+                    languages,
+                    primary_served_model(request.model).label,
+                )
+            )
+
+        cached: dict[str, CachedDictionaryEntry] = {}
+        for term in terms:
+            entry = entries.get(normalize_term(term).key)
+            if entry is None:
+                continue
+            ai_entry = entry.get_ai_dictionary_entry()
+            translations_by_language = {
+                language: translation.get_ai_meaning_translations()
+                for language in languages
+                if (translation := translations.get((entry.id, language)))
+            }
+            # Incomplete translations are only reused, so the completed ones get saved
+            meaning_ids = {meaning.local_id for meaning in ai_entry.meanings}
+            complete_languages = {
+                language
+                for language, language_translations in translations_by_language.items()
+                if meaning_ids <= {t.meaning_local_id for t in language_translations}
+            }
+            stored_entries[term] = (entry.id, complete_languages)
+            cached[term] = CachedDictionaryEntry(
+                entry=ai_entry, translations_by_language=translations_by_language
+            )
+        return cached
+
+    async def save(item: DictionaryBatchItemResult) -> DictionaryBatchItemResult:
+        """Persist a generated or cached term for the user, reporting failures in the item."""
+        if item.result is None:
+            return item
+        entry_id, cached_languages = stored_entries.get(item.term, (None, set[str]()))
+        entry_model, translation_models = _served_labels(request.model, item.result)
+        try:
+            async with get_async_session() as session:
+                await dictionary_queries.save_dictionary_workflow_result(
+                    session,
+                    current_user.id,
+                    item.result.entry,
+                    entry_model,
+                    BASE_DICTIONARY_PROMPT_VERSION,
+                    {
+                        language: translations
+                        for language, translations in item.result.translations_by_language.items()
+                        if language not in cached_languages
+                    },
+                    translation_models,
+                    existing_entry_id=entry_id,
+                )
+                await session.commit()
+        except Exception as e:
+            traceback.print_exc()  # Print full stack trace to console
+            return DictionaryBatchItemResult(term=item.term, error=f"Failed to save result: {e}")
+        return item
+
+    async def stream_results() -> AsyncIterator[str]:
+        hooks = DictionaryBatchHooks(retrieve_cached_entries=retrieve_cached_entries)
+        async for item in generate_dictionary_workflow_batch(params, request.model, hooks):
+            saved = await save(item)
+            yield saved.model_dump_json() + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/generate_stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def generate_dictionary_entry_stream(
+    request: GenerateDictionaryRequest,
+    current_user: AuthUser = Depends(get_current_auth_user),
+) -> StreamingResponse:
+    """
+    Generate a dictionary entry with translations, streaming it as Server-Sent Events.
+
+    Emits a `meaning` event for every base meaning as soon as it is parsed, an `entry`
+    event with the complete base entry, a `translation` event per meaning and
+    language, and finally a `result` event with the same body `/generate` returns,
+    sent once the result is saved. Failures end the stream with an `error` event.
+
+    Args:
+        request: Request containing term, translation language, and optional parameters
+        current_user: Current authenticated user
+
+    Returns:
+        Server-Sent Events stream of `DictionaryStreamEvent` payloads
+    """
+    params = DictionaryEntryParams(
+        translating_term=request.term,
+        translation_language=request.translation_language,
+        translation_languages=request.translation_languages,
+        user_learning_languages="",  # TODO: Get from user profile
+        meanings_per_translation_call=request.meanings_per_translation_call,
+        hedging=request.hedging,
+        refresh_response_cache=request.regenerate_full or request.regenerate_translations,
+        routing=request.routing or settings.llm_routing,
+    )
+    hooks, cache_state = _create_workflow_hooks(request, current_user.id)
+
+    async def stream_events() -> AsyncIterator[str]:
+        try:
+            async for event in generate_dictionary_workflow_stream(params, request.model, hooks):
+                if event.result:
+                    await _save_workflow_result(request, current_user.id, event.result, cache_state)
+                yield f"event: {event.event}\ndata: {event.model_dump_json(exclude_none=True)}\n\n"
+        except ValidationError as e:
+            yield _sse_error(f"Validation error: {str(e)}")
+        except LLMAPIError as e:
+            traceback.print_exc()  # Print full stack trace to console
+            yield _sse_error(f"LLM service error: {str(e)}")
+        except Exception as e:
+            traceback.print_exc()  # Print full stack trace to console
+            yield _sse_error(f"Internal server error: {str(e)}")
+
+    return StreamingResponse(stream_events(), media_type="text/event-stream")
+
+
+def _sse_error(detail: str) -> str:
+    """Format an error as a terminal Server-Sent Event."""
+    return f"event: error\ndata: {json.dumps({'detail': detail})}\n\n"
@@ -0,0 +1,78 @@
+"""Operational metrics router."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from langtools.ai import (
+    LLMResilienceMetrics,
+    LLMUsageMetrics,
+    ResponseCacheMetrics,
+    SingleFlightMetrics,
+    StageHedgingMetrics,
+    StageRoutingMetrics,
+    TokenBudgetMetrics,
+    get_hedging_metrics,
+    get_llm_resilience_metrics,
+    get_llm_usage_metrics,
+    get_response_cache_metrics,
+    get_routing_metrics,
+    get_token_budget_metrics,
+    get_single_flight_metrics,
+)
+
+from ..auth.dependencies import get_current_auth_user
+from ..database import DatabasePoolMetrics, get_pool_metrics
+
+
+# Metrics expose pool state, LLM spend and cache contents, so they require a login
+router = APIRouter(
+    prefix="/metrics", tags=["metrics"], dependencies=[Depends(get_current_auth_user)]
+)
+
+
+@router.get("/db_pool", response_model=dict[str, DatabasePoolMetrics])
+def db_pool_metrics() -> dict[str, DatabasePoolMetrics]:
+    """Return sync and async connection pool usage of this API process."""
+    return get_pool_metrics()
+
+
+@router.get("/single_flight", response_model=SingleFlightMetrics)
+def single_flight_metrics() -> SingleFlightMetrics:
+    """Return in-flight LLM generations and requests coalesced into them."""
+    return get_single_flight_metrics()
+
+
+@router.get("/llm_usage", response_model=LLMUsageMetrics)
+def llm_usage_metrics() -> LLMUsageMetrics:
+    """Return tokens, wall time and estimated cost of LLM calls per stage and model."""
+    return get_llm_usage_metrics()
+
+
+@router.get("/llm_resilience", response_model=LLMResilienceMetrics)
+def llm_resilience_metrics() -> LLMResilienceMetrics:
+    """Return LLM retries, failovers and circuit breaker states per provider."""
+    return get_llm_resilience_metrics()
+
+
+@router.get("/hedging", response_model=list[StageHedgingMetrics])
+def hedging_metrics() -> list[StageHedgingMetrics]:
+    """Return hedged LLM calls, hedge wins and current hedge delays per stage and model."""
+    return get_hedging_metrics()
+
+
+@router.get("/routing", response_model=list[StageRoutingMetrics])
+def routing_metrics() -> list[StageRoutingMetrics]:
+    """Return LLM calls routed to the fast or requested model and escalations per stage."""
+    return get_routing_metrics()
+
+
+@router.get("/token_budgets", response_model=list[TokenBudgetMetrics])
+def token_budget_metrics() -> list[TokenBudgetMetrics]:
+    """Return recent LLM output per stage, model, thinking mode, language and term class."""
+    return get_token_budget_metrics()
+
+
+@router.get("/response_cache", response_model=Optional[ResponseCacheMetrics])
+def response_cache_metrics() -> Optional[ResponseCacheMetrics]:
+    """Return LLM response cache hits, misses and evictions, or null without a cache."""
+    return get_response_cache_metrics()
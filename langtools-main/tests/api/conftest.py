@@ -1,7 +1,7 @@
 """Test configuration and fixtures for API tests."""
 
 import uuid
-from typing import AsyncIterator
+from typing import AsyncIterator, cast
 
 import pytest
 from httpx import AsyncClient
@@ -43,3 +43,18 @@ def test_user_data_passwordless() -> dict[str, str | bool]:
         "email": f"passwordless-{unique_id}@example.com",
         "is_e2e_test": True,
     }
+
+
+@pytest.fixture
+async def auth_headers(
+    client: AsyncClient, test_user_data: dict[str, str | bool]
+) -> dict[str, str]:
+    """Register a test user and return bearer headers for authenticated requests."""
+    _ = await client.post("/auth/register", json=test_user_data)
+    response = await client.post(
+        "/auth/login",
+        data={"username": test_user_data["email"], "password": test_user_data["password"]},
+    )
+    assert response.status_code == 200
+    token = cast(dict[str, str], response.json())["access_token"]
+    return {"Authorization": f"Bearer {token}"}
@@ -1,5 +1,7 @@
 """Integration tests for dictionary endpoints."""
 
+import json
+import uuid
 from typing import Any, TypedDict, cast
 
 import pytest
@@ -399,3 +401,138 @@ async def test_regenerate_translations_only(
 
     # All text should be properly encoded Unicode, not escape sequences
     assert "\\u" not in str(result2)
+
+
+@pytest.mark.asyncio
+async def test_shared_entry_is_reused_only_for_its_source_language(
+    client: AsyncClient, test_user_data: TestUserData
+) -> None:
+    """Test that another user's entry is served for its source language and not another."""
+    token = await get_auth_token(client, test_user_data)
+    term = f"shared{uuid.uuid4().hex[:8]}"
+    response = await client.post(
+        "/dictionary_entry/generate",
+        json={"term": term, "translation_language": "es"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    source_language = cast(str, response.json()["entry"]["source_language"])
+
+    async def generate_as_other_user(language: str) -> dict[str, Any]:
+        unique_id = uuid.uuid4().hex[:8]
+        other_user: TestUserData = {
+            "name": f"Test User {unique_id}",
+            "email": f"test-{unique_id}@example.com",
+            "password": f"testpassword{unique_id}",
+            "is_e2e_test": True,
+        }
+        other_token = await get_auth_token(client, other_user)
+        response = await client.post(
+            "/dictionary_entry/generate",
+            json={"term": term, "translation_language": "es", "source_language": language},
+            headers={"Authorization": f"Bearer {other_token}"},
+        )
+        assert response.status_code == 200
+        return cast(dict[str, Any], response.json())
+
+    # The base entry is only generated when no stored entry was reused
+    shared = await generate_as_other_user(source_language)
+    assert shared["metadata"]["base_served_by"] is None
+
+    other_language = "ja" if source_language != "ja" else "ko"
+    regenerated = await generate_as_other_user(other_language)
+    assert regenerated["metadata"]["base_served_by"] is not None
+
+
+@pytest.mark.asyncio
+async def test_generate_dictionary_entry_batch(
+    client: AsyncClient, test_user_data: TestUserData
+) -> None:
+    """Test that batch generation dedupes terms and streams one result per term."""
+    token = await get_auth_token(client, test_user_data)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    request_data = {
+        "terms": ["hello", " Hello ", "world"],
+        "translation_language": "es",
+    }
+
+    response = await client.post(
+        "/dictionary_entry/generate_batch", json=request_data, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    items = [cast(dict[str, object], json.loads(line)) for line in response.text.splitlines()]
+    assert sorted(str(item["term"]) for item in items) == ["hello", "world"]
+    for item in items:
+        assert item["error"] is None
+        result = cast(dict[str, list[object]], item["result"])
+        assert len(result["translations"]) > 0
+
+    # A repeated batch is served from cache
+    response = await client.post(
+        "/dictionary_entry/generate_batch", json=request_data, headers=headers
+    )
+    items = [cast(dict[str, bool], json.loads(line)) for line in response.text.splitlines()]
+    assert all(item["cached"] for item in items)
+
+
+@pytest.mark.asyncio
+async def test_generate_dictionary_entry_batch_unauthenticated(client: AsyncClient) -> None:
+    """Test that unauthenticated batch requests are rejected."""
+    request_data = {
+        "terms": ["test"],
+        "translation_language": "es",
+    }
+
+    response = await client.post("/dictionary_entry/generate_batch", json=request_data)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_generate_dictionary_entry_stream(
+    client: AsyncClient, test_user_data: TestUserData
+) -> None:
+    """Test that streaming generation emits the entry and its translations, then the result."""
+    token = await get_auth_token(client, test_user_data)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    request_data = {
+        "term": "hello",
+        "translation_language": "es",
+    }
+
+    response = await client.post(
+        "/dictionary_entry/generate_stream", json=request_data, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events: list[tuple[str, dict[str, object]]] = []
+    for block in response.text.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append(
+            (event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: ")))
+        )
+
+    names = [name for name, _ in events]
+    assert names[0] == "meaning"
+    # Translations are pipelined with the entry, so they may arrive before it
+    assert "entry" in names and "translation" in names
+    assert names[-1] == "result"
+
+    result = cast(dict[str, list[object]], events[-1][1]["result"])
+    assert len(result["translations"]) == names.count("translation")
+
+
+@pytest.mark.asyncio
+async def test_generate_dictionary_entry_stream_unauthenticated(client: AsyncClient) -> None:
+    """Test that unauthenticated streaming requests are rejected."""
+    request_data = {
+        "term": "test",
+        "translation_language": "es",
+    }
+
+    response = await client.post("/dictionary_entry/generate_stream", json=request_data)
+    assert response.status_code == 401
@@ -0,0 +1,159 @@
+"""Integration tests for metrics endpoints."""
+
+import asyncio
+import uuid
+from typing import Optional, cast
+
+import pytest
+from httpx import AsyncClient
+
+from langtools.ai.budgets import BUDGET_WINDOW
+
+
+def _unique_term() -> str:
+    """A single-word term no earlier request generated, so nothing is reused."""
+    return f"metrics{uuid.uuid4().hex[:8]}"
+
+
+_Metrics = dict[str, object]
+
+
+async def _get_metrics(client: AsyncClient, headers: dict[str, str], name: str) -> object:
+    response = await client.get(f"/metrics/{name}", headers=headers)
+    assert response.status_code == 200
+    return cast(object, response.json())
+
+
+async def _generate(client: AsyncClient, headers: dict[str, str], **request: object) -> None:
+    request_data = {"term": _unique_term(), "translation_language": "es", **request}
+    response = await client.post("/dictionary_entry/generate", json=request_data, headers=headers)
+    assert response.status_code == 200
+
+
+def _total(metrics: list[_Metrics], field: str, **match: object) -> int:
+    """Sum `field` over the metrics entries whose fields equal `match`."""
+    return sum(
+        cast(int, entry[field])
+        for entry in metrics
+        if all(entry[key] == value for key, value in match.items())
+    )
+
+
+@pytest.mark.asyncio
+async def test_db_pool_metrics(client: AsyncClient, auth_headers: dict[str, str]) -> None:
+    """Test that pool metrics count checkouts made by other requests."""
+    before = cast(dict[str, dict[str, float]], await _get_metrics(client, auth_headers, "db_pool"))
+
+    # A login attempt looks up the user and checks out a pooled connection
+    await client.post("/auth/login", data={"username": "nobody@example.com", "password": "x"})
+
+    after = cast(dict[str, dict[str, float]], await _get_metrics(client, auth_headers, "db_pool"))
+    assert after["sync"]["pool_size"] > 0
+    assert after["sync"]["checkouts"] > before["sync"]["checkouts"]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_metrics(client: AsyncClient, auth_headers: dict[str, str]) -> None:
+    """Test that concurrent identical generations are coalesced into one."""
+    before = cast(dict[str, int], await _get_metrics(client, auth_headers, "single_flight"))
+
+    request_data = {"term": _unique_term(), "translation_language": "es"}
+    responses = await asyncio.gather(
+        *(
+            client.post("/dictionary_entry/generate", json=request_data, headers=auth_headers)
+            for _ in range(3)
+        )
+    )
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    after = cast(dict[str, int], await _get_metrics(client, auth_headers, "single_flight"))
+    assert after["coalesced_requests"] > before["coalesced_requests"]
+
+
+@pytest.mark.asyncio
+async def test_llm_usage_metrics(client: AsyncClient, auth_headers: dict[str, str]) -> None:
+    """Test that a generation adds its base entry and translation calls to the usage."""
+    before = cast(_Metrics, await _get_metrics(client, auth_headers, "llm_usage"))
+
+    await _generate(client, auth_headers)
+
+    after = cast(_Metrics, await _get_metrics(client, auth_headers, "llm_usage"))
+    for stage in ("base", "translations"):
+        calls_before = _total(cast(list[_Metrics], before["usage"]), "calls", stage=stage)
+        assert _total(cast(list[_Metrics], after["usage"]), "calls", stage=stage) > calls_before
+
+
+@pytest.mark.asyncio
+async def test_llm_resilience_metrics(client: AsyncClient, auth_headers: dict[str, str]) -> None:
+    """Test that the provider of a successful generation has a closed circuit breaker."""
+    await _generate(client, auth_headers)
+
+    metrics = cast(_Metrics, await _get_metrics(client, auth_headers, "llm_resilience"))
+    breakers = cast(list[dict[str, str]], metrics["circuit_breakers"])
+    states = {breaker["provider"]: breaker["state"] for breaker in breakers}
+    # The default model is served by Anthropic, or by the fake model under FAKE_LLM
+    assert states.get("fake", states.get("anthropic")) == "closed"
+
+
+@pytest.mark.asyncio
+async def test_hedging_metrics(client: AsyncClient, auth_headers: dict[str, str]) -> None:
+    """Test that calls made under a hedging policy are counted and hedged."""
+    before = cast(list[_Metrics], await _get_metrics(client, auth_headers, "hedging"))
+
+    hedging = {
+        "initial_delay_seconds": 0,
+        "min_delay_seconds": 0,
+        "max_hedge_ratio": {"base": 1, "translations": 1},
+    }
+    await _generate(client, auth_headers, hedging=hedging)
+
+    after = cast(list[_Metrics], await _get_metrics(client, auth_headers, "hedging"))
+    assert _total(after, "calls", stage="base") > _total(before, "calls", stage="base")
+    assert _total(after, "hedges", stage="base") > _total(before, "hedges", stage="base")
+
+
+@pytest.mark.asyncio
+async def test_routing_metrics(client: AsyncClient, auth_headers: dict[str, str]) -> None:
+    """Test that a short term under a routing policy is counted as a fast call."""
+    before = cast(list[_Metrics], await _get_metrics(client, auth_headers, "routing"))
+
+    await _generate(client, auth_headers, routing={})
+
+    after = cast(list[_Metrics], await _get_metrics(client, auth_headers, "routing"))
+    assert _total(after, "fast_calls", stage="base") > _total(before, "fast_calls", stage="base")
+
+
+@pytest.mark.asyncio
+async def test_token_budget_metrics(client: AsyncClient, auth_headers: dict[str, str]) -> None:
+    """Test that a generation's output is recorded under its stage, model and term class."""
+    profile = {"stage": "base", "model": "claude-sonnet-4-0", "term_class": "word"}
+    before = cast(list[_Metrics], await _get_metrics(client, auth_headers, "token_budgets"))
+
+    await _generate(client, auth_headers)
+
+    after = cast(list[_Metrics], await _get_metrics(client, auth_headers, "token_budgets"))
+    samples = _total(before, "samples", **profile)
+    assert _total(after, "samples", **profile) == min(samples + 1, BUDGET_WINDOW)
+
+
+@pytest.mark.asyncio
+async def test_response_cache_metrics(client: AsyncClient, auth_headers: dict[str, str]) -> None:
+    """Test that a generation of a new term misses the response cache and stores its output."""
+    before = cast(
+        Optional[dict[str, int]], await _get_metrics(client, auth_headers, "response_cache")
+    )
+    if before is None:
+        pytest.skip("The server runs without LLM_RESPONSE_CACHE")
+
+    await _generate(client, auth_headers)
+
+    after = cast(dict[str, int], await _get_metrics(client, auth_headers, "response_cache"))
+    assert after["misses"] > before["misses"]
+    assert after["stores"] > before["stores"]
+
+
+@pytest.mark.asyncio
+async def test_metrics_unauthenticated(client: AsyncClient) -> None:
+    """Test that metrics are not served without a login."""
+    response = await client.get("/metrics/llm_usage")
+    assert response.status_code == 401